@@ -0,0 +1 @@
+"""Offline performance benchmarks for Pear Genius (run with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,146 @@
+"""Token verifications per second: per-call KeycloakAuth vs. the shared auth engine.
+
+Starts a local stub Keycloak serving a realm JWKS (no Keycloak needed), signs
+RS256 tokens for it, then verifies them through:
+
+- ``per-call``: a new ``KeycloakAuth`` per verification, as the module-level
+  ``verify_token()`` used to do — a JWKS fetch on a new HTTP client each time
+- ``shared``: the process-wide engine with unique tokens — JWKS served from
+  the kid index, RSA verification in a worker thread
+- ``shared-repeat``: the same engine with 20 customers making repeated
+  requests — verified-token LRU hits
+
+``loop lag`` is the longest the event loop was blocked during the run,
+measured by a 1 ms ticker task.
+
+Run from the pear-genius directory:
+
+    python -m benchmarks.bench_auth [--verifications 500] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import time
+
+import structlog
+import uvicorn
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from pear_genius.auth.keycloak import KeycloakAuth
+
+REALM = "pear"
+CLIENT_ID = "pear-genius"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _signing_key() -> tuple[bytes, dict]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return pem, {**jwk.construct(public_pem, "RS256").to_dict(), "kid": "bench", "use": "sig"}
+
+
+async def _start_stub(port: int, public_jwk: dict) -> tuple[uvicorn.Server, asyncio.Task]:
+    async def certs(request):
+        return JSONResponse({"keys": [public_jwk]})
+
+    app = Starlette(routes=[Route(f"/realms/{REALM}/protocol/openid-connect/certs", certs)])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def _measure(label: str, verify, tokens: list[str], concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal max_lag
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - before - 0.001)
+
+    async def one(token: str) -> None:
+        async with sem:
+            await verify(token)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in tokens))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    return {"mode": label, "per_s": len(tokens) / elapsed, "lag_ms": max_lag * 1000}
+
+
+async def main(verifications: int, concurrency: int) -> None:
+    pem, public_jwk = _signing_key()
+    port = _free_port()
+    server, server_task = await _start_stub(port, public_jwk)
+    url = f"http://127.0.0.1:{port}"
+    issuer = f"{url}/realms/{REALM}"
+
+    def sign(sub: str) -> str:
+        claims = {"sub": sub, "aud": CLIENT_ID, "iss": issuer, "exp": int(time.time()) + 600}
+        return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": "bench"})
+
+    unique = [sign(f"cust-{i}") for i in range(verifications)]
+    customers = [sign(f"cust-{i}") for i in range(20)]
+    repeated = [customers[i % 20] for i in range(verifications)]
+
+    async def per_call(token: str) -> None:
+        auth = KeycloakAuth(url, REALM, CLIENT_ID)
+        try:
+            await auth.verify_token(token)
+        finally:
+            await auth.close()
+
+    shared = KeycloakAuth(url, REALM, CLIENT_ID)
+    try:
+        results = [
+            await _measure("per-call", per_call, unique, concurrency),
+            await _measure("shared", shared.verify_token, unique, concurrency),
+            await _measure("shared-repeat", shared.verify_token, repeated, concurrency),
+        ]
+    finally:
+        await shared.close()
+        server.should_exit = True
+        await server_task
+
+    print(f"{'mode':<16}{'verifications/s':>16}{'loop lag ms':>14}")
+    for r in results:
+        print(f"{r['mode']:<16}{r['per_s']:>16.0f}{r['lag_ms']:>14.1f}")
+    print(f"\nJWKS fetches by the shared engine: {shared.stats()['jwks_fetches']}")
+    print(f"Shared engine: {results[1]['per_s'] / results[0]['per_s']:.1f}x per-call throughput")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verifications", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    opts = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    asyncio.run(main(opts.verifications, opts.concurrency))
@@ -0,0 +1,131 @@
+"""Per-call MCP overhead: fresh session per call vs. the persistent session pool.
+
+Starts a local FastMCP streamable-HTTP server (no AgentGateway needed) exposing
+a trivial ``order-management_getOrder`` tool, then measures the same tool call:
+
+- ``per-call``: the langchain-mcp-adapters default — connect, ``initialize``,
+  call, terminate session — for every invocation
+- ``pooled``: ``MCPSessionPool.call_tool`` on long-lived, keep-alive sessions
+
+Run from the pear-genius directory:
+
+    python -m benchmarks.bench_mcp_pool [--calls 200] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import time
+
+import uvicorn
+from langchain_mcp_adapters.sessions import create_session
+from mcp.server.fastmcp import FastMCP
+
+from pear_genius.tools.mcp_pool import MCPSessionPool, keepalive_http_client
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _build_server() -> FastMCP:
+    mcp = FastMCP("bench-gateway", log_level="WARNING")
+
+    @mcp.tool(name="order-management_getOrder")
+    def get_order(orderId: str) -> dict:  # noqa: N803 - the gateway's argument name
+        return {
+            "id": orderId,
+            "status": "shipped",
+            "items": [{"id": "ITEM-1", "name": "PearBook Pro"}],
+        }
+
+    return mcp
+
+
+async def _start_server(port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    app = _build_server().streamable_http_app()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def _per_call(connection: dict, args: dict) -> None:
+    async with create_session(connection) as session:
+        await session.initialize()
+        await session.call_tool("order-management_getOrder", args)
+
+
+async def _measure(label: str, call, calls: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        async with sem:
+            started = time.perf_counter()
+            await call({"orderId": f"ORD-{i}"})
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": label,
+        "calls_per_s": calls / elapsed,
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+async def main(calls: int, concurrency: int) -> None:
+    port = _free_port()
+    server, server_task = await _start_server(port)
+    connection = {
+        "transport": "streamable_http",
+        "url": f"http://127.0.0.1:{port}/mcp",
+        "httpx_client_factory": keepalive_http_client,
+    }
+
+    results = [await _measure("per-call", lambda a: _per_call(connection, a), calls, concurrency)]
+
+    pool = MCPSessionPool(connection, size=4)
+    await pool.start()
+    try:
+        results.append(
+            await _measure(
+                "pooled",
+                lambda a: pool.call_tool("order-management_getOrder", a),
+                calls,
+                concurrency,
+            )
+        )
+    finally:
+        await pool.close()
+        server.should_exit = True
+        await server_task
+
+    print(f"{'mode':<10}{'calls/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in results:
+        print(
+            f"{r['mode']:<10}{r['calls_per_s']:>10.1f}{r['mean_ms']:>10.2f}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+        )
+    speedup = results[0]["mean_ms"] / results[1]["mean_ms"]
+    print(f"\nPer-call overhead reduced {speedup:.1f}x with pooled sessions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    opts = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(opts.calls, opts.concurrency))
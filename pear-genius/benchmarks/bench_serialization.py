@@ -0,0 +1,116 @@
+"""JSON serialization micro-benchmark for SSE events and MCP tool payloads.
+
+Compares, on typical order, order-list and support-article payloads:
+
+- rendering ``structuredContent`` for the LLM: the previous ``json.dumps(indent=2)``
+  vs. the compact stdlib and orjson serializers
+- re-parsing tool output from history: ``json.loads`` vs. ``orjson.loads``
+- encoding SSE events: ``ServerSentEvent(data=json.dumps(...))`` vs. ``sse_frame``
+  vs. a pre-encoded frame
+
+Run from the pear-genius directory:
+
+    python -m benchmarks.bench_serialization [--number 20000]
+"""
+
+import argparse
+import json
+import timeit
+
+from sse_starlette.sse import ServerSentEvent
+
+from pear_genius.serialization import OrjsonSerializer, StdlibSerializer, orjson
+from pear_genius.streaming import sse_frame
+
+ORDER = {
+    "id": "ORD-2024-1001",
+    "orderNumber": "ORD-2024-1001",
+    "customerId": "cust-010",
+    "status": "delivered",
+    "orderDate": "2024-11-02T14:31:00Z",
+    "total": 2748.0,
+    "currency": "USD",
+    "shippingAddress": {
+        "street": "1 Orchard Way",
+        "city": "Cupertino",
+        "state": "CA",
+        "zip": "95014",
+        "country": "US",
+    },
+    "items": [
+        {
+            "id": "ITEM-1",
+            "name": "PearBook Pro 16″",
+            "sku": "PBP16-M3",
+            "quantity": 1,
+            "price": 2499.0,
+        },
+        {
+            "id": "ITEM-2",
+            "name": "PearCare+ (3 years)",
+            "sku": "PCARE-3Y",
+            "quantity": 1,
+            "price": 249.0,
+        },
+    ],
+    "tracking": {"carrier": "UPS", "trackingNumber": "1Z999AA10123456784", "status": "delivered"},
+}
+
+ORDER_LIST = {"orders": [dict(ORDER, id=f"ORD-2024-{1000 + i}") for i in range(20)], "total": 20}
+
+ARTICLE = {
+    "id": "KB-1042",
+    "title": "Resetting the SMC on a PearBook",
+    "category": "troubleshooting",
+    "tags": ["battery", "power", "pearbook"],
+    "body": " ".join(["Shut down the PearBook, then press and hold the power button."] * 40),
+    "updatedAt": "2024-09-18T08:00:00Z",
+}
+
+PAYLOADS = {"order": ORDER, "order list": ORDER_LIST, "article": ARTICLE}
+
+
+def _bench(fn, number: int) -> float:
+    """Best-of-3 microseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def main(number: int) -> None:
+    serializers = [StdlibSerializer()] + ([OrjsonSerializer()] if orjson is not None else [])
+    if orjson is None:
+        print("orjson not installed — only the stdlib backend is measured\n")
+
+    print(f"{'payload':<12}{'operation':<34}{'µs/op':>10}{'bytes':>9}")
+    for label, payload in PAYLOADS.items():
+        pretty = json.dumps(payload, indent=2)
+        print(
+            f"{label:<12}{'dumps indent=2 (previous)':<34}"
+            f"{_bench(lambda: json.dumps(payload, indent=2), number):>10.2f}{len(pretty):>9}"
+        )
+        for s in serializers:
+            text = s.dumps(payload)
+            print(
+                f"{'':<12}{f'dumps {s.name}':<34}"
+                f"{_bench(lambda: s.dumps(payload), number):>10.2f}{len(text):>9}"
+            )
+        for s in serializers:
+            print(
+                f"{'':<12}{f'loads {s.name}':<34}{_bench(lambda: s.loads(pretty), number):>10.2f}"
+            )
+
+    token = {"type": "token", "content": "Your PearBook Pro shipped on "}
+    error = {"type": "error", "content": "An error occurred processing your request."}
+    error_frame = sse_frame(error)
+    print(f"\n{'SSE event':<12}{'encoding':<34}{'µs/op':>10}")
+    for label, event in (("token", token), ("error", error)):
+        previous = _bench(lambda: ServerSentEvent(data=json.dumps(event)).encode(), number)
+        print(f"{label:<12}{'ServerSentEvent(json.dumps) (prev.)':<34}{previous:>10.2f}")
+        print(f"{'':<12}{'sse_frame':<34}{_bench(lambda: sse_frame(event), number):>10.2f}")
+    print(f"{'error':<12}{'pre-encoded':<34}{_bench(lambda: error_frame, number):>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    opts = parser.parse_args()
+    main(opts.number)
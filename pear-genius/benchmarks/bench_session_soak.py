@@ -0,0 +1,197 @@
+"""Session churn soak: process memory must level off as abandoned sessions are evicted.
+
+Drives the real API (``pear_genius.server.app`` over an in-process ASGI
+transport) with a fake LLM and fake order tools: each session is created,
+sends one message and is abandoned.  Every third session asks to cancel an
+order and leaves its approval interrupt unanswered.  The session store is
+capped at ``--max-sessions``, so once it fills every new session evicts an
+old one and purges its checkpointer thread.
+
+RSS and tracemalloc totals are sampled as sessions accumulate; the run fails
+(exit status 1) unless both grow by less than ``--tolerance`` over the
+second half.  ``--no-purge`` disables thread purging to show the unbounded
+growth it prevents.
+
+Run from the pear-genius directory:
+
+    python -m benchmarks.bench_session_soak [--sessions 2000] [--max-sessions 200]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import resource
+import sys
+import tracemalloc
+import uuid
+from unittest.mock import patch
+
+import httpx
+import structlog
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+
+from pear_genius import server
+from pear_genius.config import settings
+from pear_genius.tools import registry
+from pear_genius.tools.catalog import ToolCatalog
+
+CONCURRENCY = 16
+
+
+class FakeChat(BaseChatModel):
+    """Calls a tool for each customer message, then answers from the tool result."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-soak"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            name = (
+                "order-management_cancelOrder"
+                if "cancel" in last.content
+                else "order-management_getOrder"
+            )
+            message = AIMessage(
+                content="Let me look that up.",
+                tool_calls=[
+                    {"name": name, "args": {"path": {"orderId": "ORD-1"}}, "id": uuid.uuid4().hex}
+                ],
+            )
+        else:
+            message = AIMessage(content="Your order ORD-1 was delivered on Tuesday. " * 8)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _order() -> dict:
+    return {
+        "id": "ORD-1",
+        "status": "delivered",
+        "items": [{"name": "PearBook Pro", "sku": f"PBP-{i}", "quantity": 1} for i in range(5)],
+        "shipping": {"carrier": "UPS", "trackingNumber": "1Z999", "history": ["x" * 200] * 5},
+        "total": 2499.0,
+    }
+
+
+def _tools() -> list[StructuredTool]:
+    async def call(**kwargs):
+        order = _order()
+        return json.dumps(order), order
+
+    schema = {"type": "object", "properties": {"path": {"type": "object"}}}
+    return [
+        StructuredTool(
+            name=name,
+            description=name,
+            args_schema=schema,
+            coroutine=call,
+            response_format="content_and_artifact",
+        )
+        for name in ("order-management_getOrder", "order-management_cancelOrder")
+    ]
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # not Linux: peak RSS is the closest portable figure
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+async def _no_purge(session_ids: list[str]) -> None:
+    pass
+
+
+def _fake_chat(**kwargs) -> FakeChat:
+    return FakeChat()
+
+
+async def _run_session(client: httpx.AsyncClient, i: int) -> None:
+    session_id = (await client.post("/api/chat/sessions")).json()["session_id"]
+    text = "Please cancel order ORD-1" if i % 3 == 0 else "Where is my order ORD-1?"
+    response = await client.post(
+        f"/api/chat/sessions/{session_id}/messages", json={"message": text}
+    )
+    assert response.status_code == 200, response.text
+
+
+async def main(sessions: int, max_sessions: int, tolerance: float, purge: bool) -> bool:
+    registry._catalog = ToolCatalog(_tools())
+    server._session_store = None
+    if not purge:
+        server.purge_threads = _no_purge
+    settings.session_max_sessions = max_sessions
+    settings.rate_limit_enabled = False  # every session belongs to the same test customer
+    transport = httpx.ASGITransport(app=server.app)
+    samples = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://soak") as client:
+        sem = asyncio.Semaphore(CONCURRENCY)
+
+        async def one(i: int) -> None:
+            async with sem:
+                await _run_session(client, i)
+
+        # Warm-up: fill the store once so steady-state eviction is measured
+        tracemalloc.start()
+        await asyncio.gather(*(one(i) for i in range(max_sessions)))
+        step = max(1, sessions // 10)
+        for start in range(0, sessions, step):
+            await asyncio.gather(*(one(i) for i in range(start, min(start + step, sessions))))
+            gc.collect()
+            graph = await server.get_shared_graph()
+            samples.append(
+                (
+                    min(start + step, sessions),
+                    tracemalloc.get_traced_memory()[0] / 2**20,
+                    _rss_mb(),
+                    len(graph.checkpointer.storage),
+                )
+            )
+        tracemalloc.stop()
+
+    print(f"{'sessions':>9}{'traced MB':>12}{'RSS MB':>10}{'threads':>10}")
+    for done, traced, rss, threads in samples:
+        print(f"{done:>9}{traced:>12.1f}{rss:>10.1f}{threads:>10}")
+
+    half = samples[len(samples) // 2 - 1]
+    last = samples[-1]
+    traced_growth = (last[1] - half[1]) / max(half[1], 1e-9)
+    rss_growth = (last[2] - half[2]) / half[2]
+    leveled = traced_growth < tolerance and rss_growth < tolerance
+    print(
+        f"\nSecond-half growth: tracemalloc {traced_growth:+.1%}, RSS {rss_growth:+.1%} "
+        f"(tolerance {tolerance:.0%}) — {'levels off' if leveled else 'STILL GROWING'}"
+    )
+    return leveled
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--max-sessions", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--no-purge", action="store_true")
+    opts = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    with (
+        patch("pear_genius.agents.agent.ChatAnthropic", _fake_chat),
+        patch("pear_genius.agents.compaction.ChatAnthropic", _fake_chat),
+    ):
+        ok = asyncio.run(main(opts.sessions, opts.max_sessions, opts.tolerance, not opts.no_purge))
+    sys.exit(0 if ok or opts.no_purge else 1)
@@ -0,0 +1,110 @@
+"""SSE token batching: one event per LLM chunk vs. time-windowed batches.
+
+Drives ``server._stream_graph_events`` with a fake graph that streams
+``--tokens`` chunks per response at a realistic inter-token interval, for
+``--concurrency`` simultaneous responses, and encodes every yielded event
+as an SSE frame.  Reports events per second, events per response and CPU
+time per streamed response for each flush window.
+
+Run from the pear-genius directory:
+
+    python -m benchmarks.bench_sse_batching [--tokens 400] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import structlog
+from langchain_core.messages import AIMessageChunk
+
+from pear_genius import server
+
+
+class _StreamingGraph:
+    """Emits ``tokens`` chunk events, sleeping ``interval`` between bursts of 4."""
+
+    def __init__(self, tokens: int, interval: float):
+        self.tokens = tokens
+        self.interval = interval
+
+    async def astream_events(self, *args, **kwargs):
+        for i in range(self.tokens):
+            if i % 4 == 0:
+                await asyncio.sleep(self.interval)
+            yield {
+                "event": "on_chat_model_stream",
+                "tags": [],
+                "data": {"chunk": AIMessageChunk(content=f"tok{i} ")},
+            }
+
+    async def aget_state(self, config):
+        return SimpleNamespace(tasks=[])
+
+
+async def _run(flush_ms: float, tokens: int, concurrency: int, interval: float) -> dict:
+    graph = _StreamingGraph(tokens, interval)
+    counts: list[int] = []
+    sizes: list[int] = []
+
+    async def one(i: int) -> None:
+        count = size = 0
+        async for frame in server._stream_graph_events(graph, {}, {}, f"bench-{i}"):
+            count += 1
+            size += len(frame)
+        counts.append(count)
+        sizes.append(size)
+
+    with patch.object(server.settings, "sse_token_flush_ms", flush_ms):
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+
+    total_events = sum(counts)
+    return {
+        "mode": f"{flush_ms:g} ms" if flush_ms else "per-token",
+        "events_per_s": total_events / elapsed,
+        "events_per_response": total_events / concurrency,
+        "bytes_per_response": sum(sizes) / concurrency,
+        "cpu_ms_per_response": cpu * 1000 / concurrency,
+        "wall_s": elapsed,
+    }
+
+
+async def main(tokens: int, concurrency: int, interval_ms: float, windows: list[float]) -> None:
+    results = []
+    for flush_ms in [0.0, *windows]:
+        results.append(await _run(flush_ms, tokens, concurrency, interval_ms / 1000))
+
+    print(
+        f"{'mode':<12}{'events/s':>12}{'events/resp':>14}{'bytes/resp':>12}"
+        f"{'CPU ms/resp':>14}{'wall s':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<12}{r['events_per_s']:>12.0f}{r['events_per_response']:>14.1f}"
+            f"{r['bytes_per_response']:>12.0f}{r['cpu_ms_per_response']:>14.2f}{r['wall_s']:>9.2f}"
+        )
+    baseline = results[0]["cpu_ms_per_response"]
+    for r in results[1:]:
+        saving = baseline / r["cpu_ms_per_response"]
+        print(f"\n{r['mode']} window: {saving:.1f}x less CPU per response")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--interval-ms", type=float, default=10.0, help="pause between 4-token bursts"
+    )
+    parser.add_argument("--windows", type=float, nargs="+", default=[30.0, 100.0])
+    opts = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    asyncio.run(main(opts.tokens, opts.concurrency, opts.interval_ms, opts.windows))
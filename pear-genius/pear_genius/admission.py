@@ -0,0 +1,181 @@
+"""Admission control for graph runs.
+
+Every message, approve and reject request runs the graph, and each graph
+run makes one or more Anthropic calls.  Without a limit a traffic spike
+becomes a burst of provider 429s and long stalls for everyone.
+``AdmissionController`` admits at most ``settings.admission_max_concurrent``
+runs at a time and parks the rest in a bounded priority queue:
+
+1. approve/reject resumes (a customer is waiting on an action they started)
+2. ``CustomerTier.PREMIER``, then ``CustomerTier.PLUS``
+3. ``CustomerTier.STANDARD``
+
+Requests arriving to a full queue are rejected up front so the API can
+answer 503 with ``Retry-After`` instead of holding the connection.  While a
+request waits, ``wait()`` yields its queue position whenever it changes.
+"""
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+
+import structlog
+
+from .config import settings
+from .state.conversation import CustomerTier
+
+logger = structlog.get_logger()
+
+PRIORITY_RESUME = 0
+TIER_PRIORITY = {
+    CustomerTier.PREMIER: 1,
+    CustomerTier.PLUS: 2,
+    CustomerTier.STANDARD: 3,
+}
+
+
+def request_priority(tier: CustomerTier | None, *, resume: bool = False) -> int:
+    """Priority of a graph run (lower is admitted first)."""
+    if resume:
+        return PRIORITY_RESUME
+    if tier is None:
+        return TIER_PRIORITY[CustomerTier.STANDARD]
+    return TIER_PRIORITY[tier]
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Server is at capacity")
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """One request's place in the admission queue."""
+
+    __slots__ = ("priority", "seq", "admitted", "released", "updated")
+
+    def __init__(self, priority: int, seq: int):
+        self.priority = priority
+        self.seq = seq
+        self.admitted = False
+        self.released = False
+        self.updated = asyncio.Event()
+
+    def __lt__(self, other: "Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, priority-ordered wait queue."""
+
+    def __init__(
+        self,
+        max_concurrent: int | None = None,
+        max_queue: int | None = None,
+        retry_after: int | None = None,
+    ):
+        self.max_concurrent = max(1, max_concurrent or settings.admission_max_concurrent)
+        self.max_queue = settings.admission_max_queue if max_queue is None else max_queue
+        self.retry_after = settings.admission_retry_after if retry_after is None else retry_after
+        self.active = 0
+        self._queue: list[Ticket] = []
+        self._seq = itertools.count()
+        self.admitted_total = 0
+        self.queued_total = 0
+        self.rejected_total = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, priority: int) -> Ticket:
+        """
+        Take a run slot, or a place in the wait queue.
+
+        Raises:
+            AdmissionRejectedError: If every slot is busy and the queue is full
+        """
+        ticket = Ticket(priority, next(self._seq))
+        if self.active < self.max_concurrent and not self._queue:
+            self._admit(ticket)
+            return ticket
+        if len(self._queue) >= self.max_queue:
+            self.rejected_total += 1
+            logger.warning(
+                "Request rejected — admission queue full",
+                active=self.active,
+                queued=len(self._queue),
+                priority=priority,
+            )
+            raise AdmissionRejectedError(self.retry_after)
+        heapq.heappush(self._queue, ticket)
+        self.queued_total += 1
+        self._notify()
+        return ticket
+
+    def position(self, ticket: Ticket) -> int:
+        """1-based position among waiting requests (0 once admitted)."""
+        if ticket.admitted:
+            return 0
+        return 1 + sum(1 for other in self._queue if other < ticket)
+
+    async def wait(self, ticket: Ticket) -> AsyncIterator[int]:
+        """Yield the ticket's queue position each time it changes, until admitted."""
+        last = None
+        while not ticket.admitted:
+            position = self.position(ticket)
+            if position != last:
+                last = position
+                yield position
+            ticket.updated.clear()
+            if not ticket.admitted:
+                await ticket.updated.wait()
+
+    def release(self, ticket: Ticket) -> None:
+        """Give up a slot (or a place in the queue); safe to call more than once."""
+        if ticket.released:
+            return
+        ticket.released = True
+        if ticket.admitted:
+            self.active -= 1
+            while self._queue and self.active < self.max_concurrent:
+                self._admit(heapq.heappop(self._queue))
+        else:
+            # Client went away while queued
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+        self._notify()
+
+    def _admit(self, ticket: Ticket) -> None:
+        ticket.admitted = True
+        ticket.updated.set()
+        self.active += 1
+        self.admitted_total += 1
+
+    def _notify(self) -> None:
+        for waiting in self._queue:
+            waiting.updated.set()
+
+    def stats(self) -> dict[str, int]:
+        """Active runs, queue depth and cumulative counters."""
+        return {
+            "active": self.active,
+            "queued": len(self._queue),
+            "admitted": self.admitted_total,
+            "queued_total": self.queued_total,
+            "rejected": self.rejected_total,
+        }
+
+
+_controller: AdmissionController | None = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
@@ -1,23 +1,32 @@
 """Pear Genius agent — single LangGraph agent with MCP tools and human-in-the-loop approval."""
 
-import json as json_mod
+import time
 from typing import Literal
 
 import structlog
 from langchain_anthropic import ChatAnthropic
+from langchain_anthropic.chat_models import convert_to_anthropic_tool
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
-from langgraph.prebuilt import ToolNode
 from langgraph.types import interrupt, Command
 
 from ..config import settings
+from ..metrics import ESCALATIONS, LLM_CALL_DURATION
+from ..serialization import get_serializer
+from ..state.checkpointer import create_checkpointer
 from ..state.conversation import (
     AgentState,
     CustomerContext,
     EscalationReason,
 )
+from ..tools.concurrency import create_tool_node
 from ..tools.registry import get_all_tools
+from ..tracing import start_span, traced_node
+from .compaction import INTERNAL_LLM_TAG, HistoryCompactor
+from .intent import IntentClassifier, covering_category, tools_by_category
 
 logger = structlog.get_logger()
 
@@ -28,6 +37,9 @@ HIGH_RISK_TOOLS = {
     "product-support_scheduleRepair",
 }
 
+# Anthropic prompt-cache breakpoint marker (5-minute ephemeral cache)
+_CACHE_CONTROL = {"type": "ephemeral"}
+
 
 SYSTEM_PROMPT = """You are Pear Genius, an intelligent customer support assistant for Pear Computer.
 Your role is to help customers with their inquiries about orders, products, warranty, repairs, and account issues.
@@ -95,8 +107,12 @@ class PearGeniusAgent:
     """
     The Pear Genius customer support agent.
 
-    Uses LLM tool calls for implicit intent routing — no separate
-    classification step needed.
+    The LLM picks tools itself.  With ``settings.intent_routing_enabled``, a
+    local keyword classifier narrows which tool schemas are sent: one bound
+    model per tool category is built up front, and the full tool set is used
+    whenever the classifier is unsure.  Routing is off by default because the
+    tool schemas are the start of the cached prompt prefix, so every intent
+    switch would miss the prompt cache.
     """
 
     def __init__(self, tools: list | None = None):
@@ -109,11 +125,40 @@ class PearGeniusAgent:
             temperature=settings.temperature,
         )
 
+        self.classifier: IntentClassifier | None = None
+        self.category_llms: dict = {}
+        self.category_tool_counts: dict[str, int] = {}
         if self.tools:
-            self.llm_with_tools = self.llm.bind_tools(self.tools)
+            self.llm_with_tools = self.llm.bind_tools(_cacheable_tool_schemas(self.tools))
+            if settings.intent_routing_enabled:
+                self.classifier = IntentClassifier()
+                for category, subset in tools_by_category(self.tools).items():
+                    if subset and len(subset) < len(self.tools):
+                        self.category_llms[category] = self.llm.bind_tools(
+                            _cacheable_tool_schemas(subset)
+                        )
+                        self.category_tool_counts[category] = len(subset)
         else:
             self.llm_with_tools = self.llm
 
+    def _select_llm(self, state: AgentState) -> tuple[object, str, int]:
+        """Pick the bound model for the turn's intent.
+
+        Returns:
+            (model, intent category or "all", number of tools bound)
+        """
+        if self.classifier is not None:
+            intent = self.classifier.classify(state.messages)
+            if intent is not None:
+                category = covering_category(intent.categories, self.category_tool_counts)
+                if category is not None:
+                    return (
+                        self.category_llms[category],
+                        category,
+                        self.category_tool_counts[category],
+                    )
+        return self.llm_with_tools, "all", len(self.tools)
+
     async def process(self, state: AgentState) -> dict:
         """Process the current state and return state updates."""
         updates: dict = {"turn_count": state.turn_count + 1, "approval_rejected": False}
@@ -125,21 +170,55 @@ class PearGeniusAgent:
             updates["needs_escalation"] = True
             updates["escalation_reason"] = EscalationReason(reason)
             escalation_reason = reason.replace("_", " ")
-            logger.info("Escalation triggered", reason=reason)
+            # The agent runs again after every tool round and every later
+            # turn; count the escalation once, when it first triggers
+            if not state.needs_escalation:
+                ESCALATIONS.labels(reason).inc()
+                logger.info("Escalation triggered", reason=reason)
 
         # Build messages with system prompt + customer context
         # (escalation instructions are injected so the LLM explains the transfer)
         system_msg = self._build_system_message(state, escalation_reason=escalation_reason)
         messages = [system_msg] + state.messages
 
+        llm, intent, tools_bound = self._select_llm(state)
+
         logger.info(
             "Invoking LLM",
             agent="pear-genius",
             message_count=len(messages),
             has_tools=bool(self.tools),
+            intent=intent,
+            tools_bound=tools_bound,
         )
 
-        response = await self.llm_with_tools.ainvoke(messages)
+        started = time.monotonic()
+        with start_span(
+            f"chat {settings.model_name}",
+            {
+                "gen_ai.system": "anthropic",
+                "gen_ai.operation.name": "chat",
+                "gen_ai.request.model": settings.model_name,
+                "pear_genius.intent": intent,
+                "pear_genius.tools_bound": tools_bound,
+            },
+        ) as span:
+            response = await llm.ainvoke(messages)
+            usage = getattr(response, "usage_metadata", None) or {}
+            span.set_attributes(
+                {
+                    "gen_ai.usage.input_tokens": usage.get("input_tokens", 0),
+                    "gen_ai.usage.output_tokens": usage.get("output_tokens", 0),
+                }
+            )
+        latency = time.monotonic() - started
+        LLM_CALL_DURATION.labels("agent").observe(latency)
+        _log_usage(
+            response,
+            session_id=state.session_id,
+            intent=intent,
+            latency_ms=round(latency * 1000),
+        )
 
         if hasattr(response, "tool_calls") and response.tool_calls:
             for tc in response.tool_calls:
@@ -153,19 +232,35 @@ class PearGeniusAgent:
         return updates
 
     def _build_system_message(self, state: AgentState, *, escalation_reason: str = "") -> SystemMessage:
-        """Build the system message, optionally with customer context and escalation instructions.
+        """Build the system message as a cacheable static prefix plus per-turn context.
+
+        The first content block is the static SYSTEM_PROMPT, marked with a cache
+        breakpoint so Anthropic can reuse the tools + system prefix across
+        calls.  Customer context, the conversation summary, and escalation
+        instructions vary per session/turn and go in a second, uncached block.
 
         On the first turn (turn_count == 0) full customer context is included.
         On subsequent turns a compact one-liner reminder is used instead to
         reduce token usage — the full context is already in the message history.
         """
-        parts = [SYSTEM_PROMPT]
+        static_block: dict = {"type": "text", "text": SYSTEM_PROMPT}
+        if settings.prompt_cache_enabled:
+            static_block["cache_control"] = _CACHE_CONTROL
+
+        context = self._build_context(state, escalation_reason=escalation_reason)
+        if not context:
+            return SystemMessage(content=[static_block])
+        return SystemMessage(content=[static_block, {"type": "text", "text": context}])
+
+    def _build_context(self, state: AgentState, *, escalation_reason: str = "") -> str:
+        """Build the per-session/per-turn part of the system prompt."""
+        parts = []
 
         if state.customer:
             if state.turn_count == 0:
                 # First turn: include full customer context
                 parts.append(
-                    f"\n\nCustomer Context:\n"
+                    f"Customer Context:\n"
                     f"- Name: {state.customer.name}\n"
                     f"- Customer ID: {state.customer.customer_id}\n"
                     f"- Tier: {state.customer.tier.value}\n"
@@ -187,10 +282,17 @@ class PearGeniusAgent:
             else:
                 # Subsequent turns: compact reminder (full context already in history)
                 parts.append(
-                    f"\n\nCustomer: {state.customer.name} ({state.customer.customer_id}), "
+                    f"Customer: {state.customer.name} ({state.customer.customer_id}), "
                     f"tier: {state.customer.tier.value}"
                 )
 
+        if state.conversation_summary:
+            parts.append(
+                f"\n\n## Conversation Summary\n"
+                f"Earlier parts of this conversation were summarized:\n"
+                f"{state.conversation_summary}"
+            )
+
         if escalation_reason:
             parts.append(
                 f"\n\n## ESCALATION REQUIRED\n"
@@ -199,62 +301,95 @@ class PearGeniusAgent:
                 f"reassure them, and let them know a team member will follow up shortly."
             )
 
-        return SystemMessage(content="\n".join(parts))
+        return "\n".join(parts).strip()
 
     def _check_escalation(self, state: AgentState) -> tuple[bool, str]:
-        """Check if conversation should be escalated to human."""
-        _ESCALATION_PHRASES = [
-            "speak to a human",
-            "talk to a human",
-            "transfer to agent",
-            "speak to an agent",
-            "talk to an agent",
-            "speak to someone",
-            "talk to someone",
-            "speak to a representative",
-            "talk to a representative",
-            "speak to a manager",
-            "talk to a manager",
-            "real person",
-            "human agent",
-            "live agent",
-        ]
-        if state.messages:
-            for msg in reversed(state.messages):
-                if isinstance(msg, HumanMessage):
-                    text = msg.content.lower()
-                    if any(phrase in text for phrase in _ESCALATION_PHRASES):
-                        return True, "customer_request"
-                    break
+        """Check if conversation should be escalated to human.
+
+        Only the latest customer message is inspected; tool failures are
+        counted by the tools node as results arrive (``tool_error_count``),
+        so the cost does not grow with the conversation.
+        """
+        for msg in reversed(state.messages):
+            if isinstance(msg, HumanMessage):
+                if isinstance(msg.content, str) and _contains_any(msg.content, _ESCALATION_PHRASES):
+                    return True, "customer_request"
+                break
 
         if "refund_amount" in state.tool_results:
             amount = state.tool_results["refund_amount"]
             if amount > settings.max_refund_amount:
                 return True, "high_value_refund"
 
-        error_count = sum(
-            1
-            for msg in state.messages
-            if isinstance(msg, ToolMessage) and _has_error(msg.content)
-        )
-        if error_count >= 3:
+        if state.tool_error_count >= 3:
             return True, "repeated_failure"
 
         return False, ""
 
 
-_ERROR_INDICATORS = [
+def _cacheable_tool_schemas(tools: list) -> list[dict]:
+    """Convert tools to Anthropic schemas with a cache breakpoint after the last one.
+
+    Tools are sorted by name so the serialized prefix is byte-identical across
+    graph builds and workers, which is what the prompt cache keys on.
+    """
+    schemas = [dict(convert_to_anthropic_tool(t)) for t in sorted(tools, key=lambda t: t.name)]
+    if schemas and settings.prompt_cache_enabled:
+        schemas[-1]["cache_control"] = _CACHE_CONTROL
+    return schemas
+
+
+def _log_usage(response, *, session_id: str = "", **extra) -> None:
+    """Log token usage, including prompt-cache reads and writes, for an LLM response."""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return
+    details = usage.get("input_token_details") or {}
+    logger.info(
+        "LLM usage",
+        session_id=session_id,
+        **extra,
+        input_tokens=usage.get("input_tokens", 0),
+        output_tokens=usage.get("output_tokens", 0),
+        cache_read_tokens=details.get("cache_read") or 0,
+        cache_creation_tokens=details.get("cache_creation") or 0,
+    )
+
+
+_ESCALATION_PHRASES = (
+    "speak to a human",
+    "talk to a human",
+    "transfer to agent",
+    "speak to an agent",
+    "talk to an agent",
+    "speak to someone",
+    "talk to someone",
+    "speak to a representative",
+    "talk to a representative",
+    "speak to a manager",
+    "talk to a manager",
+    "real person",
+    "human agent",
+    "live agent",
+)
+
+_ERROR_INDICATORS = (
     '"error":', '"error" :', "error:",  # JSON error fields or prefixed messages
     "status: 4", "status: 5",  # HTTP error status codes
     "failed to", "could not", "unable to",  # Action failure phrases
-]
+)
+
+
+def _contains_any(text: str, needles: tuple[str, ...]) -> bool:
+    """Case-insensitive check for any of ``needles`` (all lowercase)."""
+    lower = text.lower()
+    return any(needle in lower for needle in needles)
 
 
 def _has_error(content) -> bool:
     """Check if tool message content indicates an actual error response."""
     if isinstance(content, str):
-        lower = content.lower()
-        return any(indicator in lower for indicator in _ERROR_INDICATORS)
+        return _contains_any(content, _ERROR_INDICATORS)
     elif isinstance(content, list):
         return any(
             isinstance(item, str) and _has_error(item)
@@ -263,6 +398,25 @@ def _has_error(content) -> bool:
     return False
 
 
+def _tool_failed(message: ToolMessage) -> bool:
+    """Whether a tool call failed, preferring structured signals over text.
+
+    MCP ``isError`` results and exceptions become ``status="error"``; a
+    structured (artifact) result is a success unless it carries an ``error``
+    field.  Only plain-text results are scanned for error phrases.
+    """
+    if message.status == "error":
+        return True
+    if isinstance(message.artifact, dict):
+        return "error" in message.artifact
+    return _has_error(message.content)
+
+
+def _count_tool_errors(messages: list) -> int:
+    """Number of failed tool calls among ``messages``."""
+    return sum(1 for m in messages if isinstance(m, ToolMessage) and _tool_failed(m))
+
+
 def _flatten_args(tool_call: dict) -> dict:
     """Flatten path/query/body args from a tool call."""
     args = tool_call.get("args", {})
@@ -284,23 +438,27 @@ def _find_order_in_history(order_id: str, messages: list) -> dict | None:
     for msg in reversed(messages):
         if not isinstance(msg, ToolMessage):
             continue
-        content = msg.content
-        if not isinstance(content, str) or order_id not in content:
-            continue
-        try:
-            data = json_mod.loads(content)
-            if isinstance(data, dict):
-                # Direct order object
-                if data.get("id") == order_id or data.get("orderNumber") == order_id:
-                    return data
-                # Nested inside {"orders": [...]} from list endpoints
-                for order in data.get("orders", []):
-                    if isinstance(order, dict) and (
-                        order.get("id") == order_id or order.get("orderNumber") == order_id
-                    ):
-                        return order
-        except (json_mod.JSONDecodeError, TypeError):
-            continue
+        # The artifact is the full parsed payload (the content may be a
+        # projection); only re-parse the text when there is no artifact
+        data = msg.artifact
+        if not isinstance(data, dict):
+            content = msg.content
+            if not isinstance(content, str) or order_id not in content:
+                continue
+            try:
+                data = get_serializer().loads(content)
+            except (ValueError, TypeError):
+                continue
+        if isinstance(data, dict):
+            # Direct order object
+            if data.get("id") == order_id or data.get("orderNumber") == order_id:
+                return data
+            # Nested inside {"orders": [...]} from list endpoints
+            for order in data.get("orders", []):
+                if isinstance(order, dict) and (
+                    order.get("id") == order_id or order.get("orderNumber") == order_id
+                ):
+                    return order
     return None
 
 
@@ -510,23 +668,32 @@ def route_after_approval(state: AgentState) -> Literal["tools", "agent"]:
     return "tools"
 
 
-async def create_agent_graph():
+async def create_agent_graph(
+    tools: list[BaseTool] | None = None,
+    checkpointer: BaseCheckpointSaver | None = None,
+):
     """
     Create the LangGraph state machine for Pear Genius.
 
     Graph structure:
-        agent → should_continue → approval_gate → route_after_approval
-              → tools → agent
-              → END
+        compact_history → agent → should_continue → approval_gate → route_after_approval
+                                                  → tools → compact_history
+                                → END
+
+    The checkpointer is selected by ``settings.checkpointer_backend``:
+    ``memory`` (MemorySaver, single worker only) or ``sqlite`` (WAL-mode
+    database shared by all workers on the host and durable across restarts).
 
-    Note: Uses MemorySaver (in-memory) for the checkpointer. This is fine
-    for single-worker development but must be replaced with a persistent
-    checkpointer (e.g. PostgresSaver) for multi-worker production deployments.
+    Args:
+        tools: Tool catalog to bind (default: the registry's cached catalog)
+        checkpointer: Existing checkpointer to reuse, e.g. when a graph is
+            rebuilt for a changed tool catalog and conversations must carry over
 
     Returns:
         Compiled graph (checkpointer is embedded inside)
     """
-    tools = await get_all_tools()
+    if tools is None:
+        tools = await get_all_tools()
     if not tools:
         logger.warning(
             "No MCP tools loaded — the agent will not be able to call backend services. "
@@ -536,13 +703,25 @@ async def create_agent_graph():
         logger.info("Loaded MCP tools", count=len(tools))
 
     agent = PearGeniusAgent(tools=tools)
-    tool_node = ToolNode(tools)
-    checkpointer = MemorySaver()
+    compactor = HistoryCompactor()
+    tool_node = create_tool_node(tools, serial_tools=HIGH_RISK_TOOLS)
+    if checkpointer is None:
+        checkpointer = await create_checkpointer()
+
+    async def run_tools(state: AgentState, config: RunnableConfig):
+        result = await tool_node.ainvoke(state, config)
+        # Count failures as results arrive so escalation never rescans the history
+        if isinstance(result, dict):
+            errors = _count_tool_errors(result.get("messages", []))
+            if errors:
+                result = {**result, "tool_error_count": state.tool_error_count + errors}
+        return result
 
     graph = StateGraph(AgentState)
-    graph.add_node("agent", agent.process)
-    graph.add_node("approval_gate", approval_gate)
-    graph.add_node("tools", tool_node)
+    graph.add_node("compact_history", traced_node("compact_history", compactor.compact))
+    graph.add_node("agent", traced_node("agent", agent.process))
+    graph.add_node("approval_gate", traced_node("approval_gate", approval_gate))
+    graph.add_node("tools", traced_node("tools", run_tools))
 
     def should_continue(state: AgentState) -> Literal["approval_gate", "end"]:
         """Route to approval gate if the LLM made tool calls, otherwise end."""
@@ -556,7 +735,8 @@ async def create_agent_graph():
 
         return "end"
 
-    graph.set_entry_point("agent")
+    graph.set_entry_point("compact_history")
+    graph.add_edge("compact_history", "agent")
     graph.add_conditional_edges(
         "agent",
         should_continue,
@@ -567,12 +747,28 @@ async def create_agent_graph():
         route_after_approval,
         {"tools": "tools", "agent": "agent"},
     )
-    graph.add_edge("tools", "agent")
+    graph.add_edge("tools", "compact_history")
 
     compiled = graph.compile(checkpointer=checkpointer)
     return compiled
 
 
+async def warm_up_llm() -> None:
+    """
+    Open the Anthropic HTTP connection with a minimal request.
+
+    ChatAnthropic instances with the same base URL and timeout share one
+    httpx client, so this leaves a warm (TLS-established) connection in the
+    pool the agent uses.
+    """
+    llm = ChatAnthropic(
+        model=settings.model_name,
+        api_key=settings.anthropic_api_key,
+        max_tokens=1,
+    )
+    await llm.with_config({"tags": [INTERNAL_LLM_TAG]}).ainvoke("ping")
+
+
 def get_last_ai_response(state: AgentState) -> str:
     """Extract the last AI response with actual text content from the state."""
     for msg in reversed(state.messages):
@@ -0,0 +1,185 @@
+"""Rolling conversation summarization to bound LLM input size per turn.
+
+Once the message history exceeds the configured token or message budget,
+older turns (including their tool calls and tool outputs) are folded into a
+running summary stored in ``AgentState.conversation_summary`` and removed
+from ``state.messages``.  The most recent turns are kept verbatim.
+
+The cut point is always placed on a HumanMessage, so an AIMessage carrying
+tool_calls is never separated from its ToolMessages — the Anthropic API
+rejects histories where a tool_use block has no matching tool_result.
+"""
+
+import time
+from typing import Any
+
+import structlog
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from pydantic import SecretStr
+
+from ..config import settings
+from ..metrics import LLM_CALL_DURATION
+from ..state.conversation import AgentState
+
+logger = structlog.get_logger()
+
+# Tag attached to internal LLM calls whose tokens must not be streamed to the customer
+INTERNAL_LLM_TAG = "pear-genius:internal"
+
+# Tool outputs are clipped to this many characters before being summarized
+_MAX_TOOL_OUTPUT_CHARS = 2000
+
+SUMMARY_PROMPT = """You maintain a running summary of a Pear Computer customer support conversation.
+Update the existing summary with the new conversation excerpt below.
+
+Keep every fact the support agent may still need: order numbers, item IDs, amounts,
+device names and serial numbers, warranty status, actions already taken (and whether
+they succeeded, failed, or were rejected by the customer), and the customer's open requests.
+Drop greetings, pleasantries, and verbose tool output. Reply with the updated summary only."""
+
+
+def find_compaction_cut(messages: list[BaseMessage], keep_recent: int) -> int:
+    """
+    Find the index at which older messages can be folded into the summary.
+
+    Messages before the returned index are summarized; messages from the index
+    onwards are kept.  The kept portion always starts with a HumanMessage so
+    tool_call/ToolMessage pairs stay intact.
+
+    Args:
+        messages: Conversation history
+        keep_recent: Minimum number of trailing messages to keep verbatim
+
+    Returns:
+        Cut index, or 0 if nothing can be compacted
+    """
+    cut = len(messages) - max(keep_recent, 1)
+    while cut > 0 and not isinstance(messages[cut], HumanMessage):
+        cut -= 1
+    return max(cut, 0)
+
+
+def _render_content(content: str | list[str | dict[str, Any]]) -> str:
+    """Flatten message content (str or content blocks) to plain text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for item in content:
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, dict) and item.get("type") == "text":
+                parts.append(item.get("text", ""))
+        return " ".join(parts)
+    return str(content)
+
+
+def render_transcript(messages: list[BaseMessage]) -> str:
+    """Render messages as a compact plain-text transcript for summarization."""
+    lines = []
+    for msg in messages:
+        text = _render_content(msg.content).strip()
+        if isinstance(msg, HumanMessage):
+            lines.append(f"Customer: {text}")
+        elif isinstance(msg, AIMessage):
+            if text:
+                lines.append(f"Agent: {text}")
+            for tc in msg.tool_calls:
+                lines.append(f"Agent called {tc.get('name')} with {tc.get('args')}")
+        elif isinstance(msg, ToolMessage):
+            if len(text) > _MAX_TOOL_OUTPUT_CHARS:
+                text = text[:_MAX_TOOL_OUTPUT_CHARS] + " …[truncated]"
+            lines.append(f"Tool result: {text}")
+    return "\n".join(lines)
+
+
+class HistoryCompactor:
+    """
+    Graph node that folds older turns into a running summary.
+
+    Runs before every agent pass; it is a no-op while the history is within
+    ``history_max_tokens`` and ``history_max_messages``.
+    """
+
+    def __init__(self, llm: BaseChatModel | None = None) -> None:
+        self.max_tokens = settings.history_max_tokens
+        self.max_messages = settings.history_max_messages
+        self.keep_recent = settings.history_keep_recent_messages
+
+        if llm is None:
+            # No pydantic mypy plugin: aliases and defaulted fields look required
+            llm = ChatAnthropic(  # type: ignore[call-arg]
+                model=settings.model_name,
+                api_key=SecretStr(settings.anthropic_api_key),
+                max_tokens=settings.history_summary_max_tokens,
+                temperature=0,
+            )
+        self.llm = llm.with_config({"tags": [INTERNAL_LLM_TAG]})
+
+    def needs_compaction(self, state: AgentState) -> bool:
+        """Check whether the history exceeds the token or message budget."""
+        if len(state.messages) > self.max_messages:
+            return True
+        return count_tokens_approximately(state.messages) > self.max_tokens
+
+    async def compact(self, state: AgentState) -> dict[str, Any]:
+        """Summarize older messages and remove them from the history."""
+        if not self.needs_compaction(state):
+            return {}
+
+        cut = find_compaction_cut(state.messages, self.keep_recent)
+        if cut == 0:
+            return {}
+
+        folded = state.messages[:cut]
+        kept = state.messages[cut:]
+        tokens_before = count_tokens_approximately(state.messages)
+
+        excerpt = render_transcript(folded)
+        if state.conversation_summary:
+            excerpt = f"Existing summary:\n{state.conversation_summary}\n\nNew excerpt:\n{excerpt}"
+
+        started = time.monotonic()
+        try:
+            response = await self.llm.ainvoke(
+                [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content=excerpt)]
+            )
+            LLM_CALL_DURATION.labels("summary").observe(time.monotonic() - started)
+        except Exception as e:
+            logger.warning("History compaction failed — keeping full history", error=str(e))
+            return {}
+
+        summary = _render_content(response.content).strip()
+        if not summary:
+            return {}
+
+        tokens_after = count_tokens_approximately(kept) + count_tokens_approximately(
+            [SystemMessage(content=summary)]
+        )
+        tokens_saved = max(tokens_before - tokens_after, 0)
+
+        logger.info(
+            "History compacted",
+            session_id=state.session_id,
+            folded_messages=len(folded),
+            kept_messages=len(kept),
+            tokens_before=tokens_before,
+            tokens_after=tokens_after,
+            tokens_saved=tokens_saved,
+        )
+
+        return {
+            "messages": [RemoveMessage(id=m.id) for m in folded if m.id],
+            "conversation_summary": summary,
+            "summary_tokens_saved": state.summary_tokens_saved + tokens_saved,
+        }
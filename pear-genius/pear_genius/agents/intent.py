@@ -0,0 +1,182 @@
+"""Local intent classification for per-category tool binding.
+
+Every LLM request carries the JSON schema of every bound tool.  Most
+customer turns only need one backend area (orders, warranty, stores…), so
+``IntentClassifier`` scores the latest customer messages against a keyword
+vocabulary per ``TOOL_CATEGORIES`` category, in-process and without a
+network call.  Terms are weighted TF-IDF style: a term listed for many
+categories (e.g. "repair") counts less than one unique to a category
+(e.g. "tracking").
+
+The agent binds one tool subset per category once, at graph build, and
+uses the full tool set whenever the classifier is not confident.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.tools import BaseTool
+
+from ..config import settings
+from ..tools.catalog import ToolCatalog
+from ..tools.mcp_client import TOOL_CATEGORIES
+
+# Keywords and two-word phrases per tool category (lowercase)
+# fmt: off
+INTENT_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "order": (
+        "order", "orders", "ord", "shipped", "shipping", "shipment", "delivery",
+        "delivered", "deliver", "track", "tracking", "package", "arrive", "arrived",
+        "carrier", "ups", "fedex", "cancel", "cancellation", "return", "returns",
+        "refund", "exchange", "purchase", "bought", "receipt", "where is",
+    ),
+    "warranty": (
+        "warranty", "pearcare", "coverage", "covered", "repair", "repairs",
+        "repaired", "broken", "cracked", "damaged", "replace", "replacement", "appointment",
+        "genius grove", "serial", "expired", "expire",
+    ),
+    "troubleshoot": (
+        "not working", "won't", "wont", "doesn't", "stopped", "crash", "crashing",
+        "freeze", "frozen", "slow", "battery", "drain", "draining", "overheating",
+        "restart", "reset", "software update", "wifi", "bluetooth", "fix", "troubleshoot",
+        "diagnostics", "diagnostic", "boot", "charging", "charge", "screen", "repair",
+    ),
+    "account": (
+        "account", "profile", "password", "email", "address", "addresses",
+        "my devices", "registered", "login", "sign in", "pear id", "payment method",
+        "preferences", "phone number",
+    ),
+    "product": (
+        "price", "prices", "cost", "specs", "specifications", "compare", "buy",
+        "model", "models", "colors", "color", "storage", "recommend", "recommendation",
+        "newest", "latest",
+    ),
+    "support": (
+        "ticket", "tickets", "complaint", "support case", "chat", "support request",
+    ),
+    "store": (
+        "store", "stores", "location", "locations", "hours", "opening", "open today", "nearby",
+        "near me", "in stock", "stock", "inventory", "pickup", "pick up", "visit",
+    ),
+}
+# fmt: on
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+@dataclass(frozen=True)
+class Intent:
+    """Classification result.
+
+    ``categories`` holds every category scoring at least half of the top
+    score, best first; ``confidence`` is their share of the total score.
+    """
+
+    categories: tuple[str, ...]
+    confidence: float
+
+
+def _terms(text: str) -> set[str]:
+    """Unigrams and bigrams of a message."""
+    words = _WORD.findall(text.lower())
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        item.get("text", "") if isinstance(item, dict) else str(item) for item in content
+    )
+
+
+class IntentClassifier:
+    """Keyword/IDF scorer over the most recent customer messages."""
+
+    def __init__(
+        self,
+        keywords: dict[str, tuple[str, ...]] | None = None,
+        *,
+        min_confidence: float | None = None,
+        min_score: float = 1.0,
+    ):
+        keywords = keywords or INTENT_KEYWORDS
+        self.min_confidence = (
+            settings.intent_min_confidence if min_confidence is None else min_confidence
+        )
+        self.min_score = min_score
+
+        # term → [(category, idf weight)]
+        doc_freq: dict[str, int] = {}
+        for terms in keywords.values():
+            for term in set(terms):
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+        n = len(keywords)
+        self._index: dict[str, list[tuple[str, float]]] = {}
+        for category, terms in keywords.items():
+            for term in set(terms):
+                weight = math.log(1 + n / doc_freq[term])
+                self._index.setdefault(term, []).append((category, weight))
+
+    def scores(self, messages: list[BaseMessage], *, lookback: int = 2) -> dict[str, float]:
+        """Score categories over the last ``lookback`` customer messages.
+
+        Older messages count half as much as the one before them, so a short
+        follow-up ("yes, the second one") inherits the topic of the turn before.
+        """
+        scores: dict[str, float] = {}
+        decay = 1.0
+        seen = 0
+        for msg in reversed(messages):
+            if not isinstance(msg, HumanMessage):
+                continue
+            for term in _terms(_text(msg)):
+                for category, weight in self._index.get(term, ()):
+                    scores[category] = scores.get(category, 0.0) + weight * decay
+            seen += 1
+            if seen >= lookback:
+                break
+            decay /= 2
+        return scores
+
+    def classify(self, messages: list[BaseMessage]) -> Intent | None:
+        """Return the leading intent(s), or None when the messages are not clear enough."""
+        scores = self.scores(messages)
+        if not scores:
+            return None
+        top = max(scores.values())
+        leading = sorted(
+            (c for c, score in scores.items() if score >= top / 2),
+            key=lambda c: -scores[c],
+        )
+        confidence = sum(scores[c] for c in leading) / sum(scores.values())
+        if top < self.min_score or confidence < self.min_confidence:
+            return None
+        return Intent(categories=tuple(leading), confidence=round(confidence, 3))
+
+
+def tools_by_category(tools: list[BaseTool]) -> dict[str, list[BaseTool]]:
+    """Group tools by ``TOOL_CATEGORIES`` category via their service prefix."""
+    return ToolCatalog(tools).by_category
+
+
+def covering_category(categories: tuple[str, ...], candidates: dict[str, int]) -> str | None:
+    """
+    Find the smallest candidate category whose services cover all ``categories``.
+
+    E.g. a turn that is both "warranty" and "troubleshoot" is served by the
+    "troubleshoot" tools, which include every product-support tool.
+
+    Args:
+        categories: Categories the turn may need
+        candidates: Category → number of tools bound for it
+
+    Returns:
+        Category name, or None if only the full tool set covers them
+    """
+    needed = {p for c in categories for p in TOOL_CATEGORIES.get(c, ())}
+    covering = [c for c in candidates if needed <= set(TOOL_CATEGORIES[c])]
+    return min(covering, key=candidates.__getitem__, default=None)
@@ -2,9 +2,16 @@
 
 from .keycloak import (
     KeycloakAuth,
+    get_keycloak_auth,
     verify_token,
     extract_customer_context,
     AuthenticationError,
 )
 
-__all__ = ["KeycloakAuth", "verify_token", "extract_customer_context", "AuthenticationError"]
+__all__ = [
+    "KeycloakAuth",
+    "get_keycloak_auth",
+    "verify_token",
+    "extract_customer_context",
+    "AuthenticationError",
+]
@@ -1,5 +1,10 @@
 """Keycloak authentication for Pear Genius agent."""
 
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+
 import httpx
 import structlog
 from jose import JWTError, jwt
@@ -22,6 +27,21 @@ class KeycloakAuth:
     Keycloak authentication handler.
 
     Handles JWT token verification and customer context extraction.
+
+    One instance is shared per process (see ``get_keycloak_auth()``) so its
+    caches survive across requests:
+
+    - signing keys from the realm's JWKS, indexed by ``kid`` and re-fetched
+      after ``settings.keycloak_jwks_ttl`` seconds.  A token signed with an
+      unknown ``kid`` (key rotation) triggers an immediate re-fetch, at most
+      once per ``settings.keycloak_jwks_min_refresh_interval``; concurrent
+      fetches are coalesced into one request on a shared HTTP client.  While
+      Keycloak is unreachable the last keys keep being used, and a failed
+      refresh is retried at most once per minimum refresh interval.
+    - already-verified tokens in a bounded LRU, each entry expiring at the
+      token's ``exp``.
+
+    RSA signature verification runs in a worker thread, off the event loop.
     """
 
     def __init__(
@@ -29,6 +49,9 @@ class KeycloakAuth:
         keycloak_url: str | None = None,
         realm: str | None = None,
         client_id: str | None = None,
+        *,
+        jwks_ttl: float | None = None,
+        token_cache_size: int | None = None,
     ):
         self.keycloak_url = keycloak_url or settings.keycloak_url
         self.realm = realm or settings.keycloak_realm
@@ -36,22 +59,114 @@ class KeycloakAuth:
 
         self.issuer = f"{self.keycloak_url}/realms/{self.realm}"
         self.jwks_uri = f"{self.issuer}/protocol/openid-connect/certs"
+        self.jwks_ttl = settings.keycloak_jwks_ttl if jwks_ttl is None else jwks_ttl
+        self.token_cache_size = (
+            settings.keycloak_token_cache_size if token_cache_size is None else token_cache_size
+        )
+
+        self._http: httpx.AsyncClient | None = None
         self._jwks_cache: dict | None = None
+        self._keys: dict[str, dict] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_retry_at = 0.0  # no refresh before this after a failed one
+        self._jwks_task: asyncio.Task | None = None
+        # sha256(token) → (claims, exp)
+        self._verified: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+
+        self.token_cache_hits = 0
+        self.token_cache_misses = 0
+        self.jwks_fetches = 0
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=settings.keycloak_timeout)
+        return self._http
 
     async def get_jwks(self, force_refresh: bool = False) -> dict:
-        """Fetch the JSON Web Key Set from Keycloak."""
-        if self._jwks_cache is not None and not force_refresh:
+        """Fetch the JSON Web Key Set from Keycloak (cached for ``jwks_ttl`` seconds)."""
+        now = time.monotonic()
+        fresh = now - self._jwks_fetched_at < self.jwks_ttl or now < self._jwks_retry_at
+        if self._jwks_cache is not None and fresh and not force_refresh:
             return self._jwks_cache
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(self.jwks_uri)
-                response.raise_for_status()
-                self._jwks_cache = response.json()
+        # Single flight: concurrent callers share one request
+        if self._jwks_task is None:
+            self._jwks_task = asyncio.ensure_future(self._fetch_jwks())
+            self._jwks_task.add_done_callback(self._jwks_fetch_done)
+        return await asyncio.shield(self._jwks_task)
+
+    def _jwks_fetch_done(self, task: asyncio.Task) -> None:
+        self._jwks_task = None
+        if not task.cancelled():
+            task.exception()  # retrieved by the waiters; avoid "never retrieved" warnings
+
+    async def _fetch_jwks(self) -> dict:
+        try:
+            response = await self._client().get(self.jwks_uri)
+            response.raise_for_status()
+            jwks = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            if self._jwks_cache is not None:
+                # Keep verifying with the last known keys while Keycloak is
+                # unreachable, without stalling every request on a new attempt
+                self._jwks_retry_at = time.monotonic() + settings.keycloak_jwks_min_refresh_interval
+                logger.warning("JWKS refresh failed — using cached keys", error=str(e))
                 return self._jwks_cache
-            except httpx.HTTPError as e:
-                logger.error("Failed to fetch JWKS", error=str(e))
-                raise AuthenticationError(f"Failed to fetch JWKS: {e}")
+            logger.error("Failed to fetch JWKS", error=str(e))
+            raise AuthenticationError(f"Failed to fetch JWKS: {e}")
+
+        self.jwks_fetches += 1
+        self._jwks_cache = jwks
+        self._keys = {k["kid"]: k for k in jwks.get("keys", []) if "kid" in k}
+        self._jwks_fetched_at = time.monotonic()
+        logger.info("JWKS fetched", keys=len(self._keys))
+        return jwks
+
+    async def get_signing_key(self, kid: str | None) -> dict:
+        """
+        Get the JWK for a token's ``kid``, re-fetching the JWKS on rotation.
+
+        Raises:
+            AuthenticationError: If no key with that ``kid`` is published
+        """
+        await self.get_jwks()
+        key = self._keys.get(kid)
+        if key is None:
+            now = time.monotonic()
+            since_fetch = now - self._jwks_fetched_at
+            if (
+                since_fetch >= settings.keycloak_jwks_min_refresh_interval
+                and now >= self._jwks_retry_at
+            ):
+                await self.get_jwks(force_refresh=True)
+                key = self._keys.get(kid)
+        if key is None:
+            raise AuthenticationError(f"Unknown signing key: {kid}")
+        return key
+
+    def _cached_claims(self, digest: bytes) -> dict | None:
+        entry = self._verified.get(digest)
+        if entry is None:
+            return None
+        claims, exp = entry
+        if time.time() >= exp:
+            del self._verified[digest]
+            return None
+        self._verified.move_to_end(digest)
+        return claims
+
+    def _remember(self, digest: bytes, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self.token_cache_size <= 0:
+            return
+        self._verified[digest] = (claims, float(exp))
+        while len(self._verified) > self.token_cache_size:
+            self._verified.popitem(last=False)
 
     async def verify_token(self, token: str) -> dict:
         """
@@ -66,23 +181,30 @@ class KeycloakAuth:
         Raises:
             AuthenticationError: If token is invalid or expired
         """
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self._cached_claims(digest)
+        if claims is not None:
+            self.token_cache_hits += 1
+            return dict(claims)
+        self.token_cache_misses += 1
+
         try:
-            # Get JWKS for signature verification
-            jwks = await self.get_jwks()
+            header = jwt.get_unverified_header(token)
+            key = await self.get_signing_key(header.get("kid"))
 
-            # Decode and verify the token
-            # In production, you'd use the JWKS to verify the signature
-            # For now, we'll do basic validation
-            claims = jwt.decode(
+            # RSA verification is CPU-bound; keep it off the event loop
+            claims = await asyncio.to_thread(
+                jwt.decode,
                 token,
-                jwks,
+                key,
                 algorithms=["RS256"],
                 audience=self.client_id,
                 issuer=self.issuer,
             )
 
             logger.info("Token verified successfully", sub=claims.get("sub"))
-            return claims
+            self._remember(digest, claims)
+            return dict(claims)
 
         except ExpiredSignatureError:
             logger.warning("Token expired")
@@ -91,6 +213,16 @@ class KeycloakAuth:
             logger.warning("Token verification failed", error=str(e))
             raise AuthenticationError(f"Invalid token: {e}")
 
+    def stats(self) -> dict[str, int]:
+        """Token-cache and JWKS counters."""
+        return {
+            "verified_tokens_cached": len(self._verified),
+            "token_cache_hits": self.token_cache_hits,
+            "token_cache_misses": self.token_cache_misses,
+            "jwks_keys": len(self._keys),
+            "jwks_fetches": self.jwks_fetches,
+        }
+
     def extract_customer_context(self, claims: dict) -> CustomerContext:
         """
         Extract customer context from JWT claims.
@@ -124,17 +256,25 @@ class KeycloakAuth:
 
 # Module-level convenience functions
 
+_auth: KeycloakAuth | None = None
+
+
+def get_keycloak_auth() -> KeycloakAuth:
+    """Get the process-wide KeycloakAuth (shared JWKS and token caches)."""
+    global _auth
+    if _auth is None:
+        _auth = KeycloakAuth()
+    return _auth
+
 
 async def verify_token(token: str) -> dict:
     """Verify a JWT token and return claims."""
-    auth = KeycloakAuth()
-    return await auth.verify_token(token)
+    return await get_keycloak_auth().verify_token(token)
 
 
 def extract_customer_context(claims: dict) -> CustomerContext:
     """Extract customer context from JWT claims."""
-    auth = KeycloakAuth()
-    return auth.extract_customer_context(claims)
+    return get_keycloak_auth().extract_customer_context(claims)
 
 
 # For development/testing without Keycloak
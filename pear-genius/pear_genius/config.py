@@ -17,20 +17,105 @@ class Settings(BaseSettings):
     model_name: str = "claude-sonnet-4-20250514"
     max_tokens: int = 4096
     temperature: float = 0.1
+    prompt_cache_enabled: bool = True  # Anthropic cache breakpoints on tools + system prompt
+
+    # Intent Routing (bind only the tools of the classified category).  Off by
+    # default: a per-category tool list changes the prompt-cache prefix, so
+    # every intent switch re-writes the cache instead of reading it.
+    intent_routing_enabled: bool = False
+    intent_min_confidence: float = 0.6  # below this share of the score, bind all tools
+
+    # History Compaction (rolling conversation summary)
+    history_max_tokens: int = 12000
+    history_max_messages: int = 40
+    history_keep_recent_messages: int = 10
+    history_summary_max_tokens: int = 1024
 
     # AgentGateway / MCP Configuration
     agent_gateway_url: str = "http://localhost:3000"
+    essential_tools: set[str] = set()  # tool allowlist override; "service_*" allows a service
+
+    # MCP Session Pool (persistent sessions to AgentGateway)
+    mcp_pool_enabled: bool = True
+    mcp_pool_size: int = 4
+    mcp_pool_connect_timeout: float = 10.0
+    mcp_pool_health_interval: float = 30.0
+    mcp_pool_call_timeout: float = 60.0  # a slower call reconnects its session
+    mcp_pool_reconnect_backoff: float = 0.5
+    mcp_pool_reconnect_max_backoff: float = 30.0
+    mcp_pool_max_keepalive: int = 8
+    mcp_pool_keepalive_expiry: float = 60.0
+
+    # Tool Result Cache (read-only tools, shared across sessions)
+    tool_cache_enabled: bool = True
+    tool_cache_max_entries: int = 1024
+    tool_cache_ttls: dict[str, float] = {}  # per-tool TTL overrides; 0 disables caching
+    tool_single_flight_enabled: bool = True  # coalesce identical in-flight read-only calls
+    tool_rendering_enabled: bool = True  # project/cap list results in the LLM context
+
+    # Tool Catalog Refresh (background tools/list; graph is rebuilt on change)
+    tool_refresh_interval: float = 300.0  # seconds between refreshes; 0 disables
+    tool_refresh_retry_backoff: float = 5.0  # first retry while the gateway is down
+    tool_refresh_max_backoff: float = 300.0
+
+    # Tool Execution Concurrency (per process, across all sessions)
+    tool_max_concurrency: int = 16
+    tool_default_service_concurrency: int = 4
+    tool_service_concurrency: dict[str, int] = {}  # e.g. {"shipping": 2}
+
+    # Session Store ("memory" per process, or "sqlite" shared by workers on the host)
+    session_backend: str = "memory"
+    session_max_sessions: int = 10000  # least recently used sessions evicted beyond this
+    session_idle_ttl: float = 3600.0  # seconds idle before a session expires; 0 disables
+    session_db_path: str = "pear_genius_sessions.db"
+
+    # Checkpointer Configuration
+    checkpointer_backend: str = "memory"  # "memory" or "sqlite"
+    checkpoint_db_path: str = "pear_genius_checkpoints.db"
+    checkpoint_max_per_thread: int = 20
+    checkpoint_durability: str = "async"  # LangGraph durability: "sync", "async" or "exit"
 
     # Keycloak Configuration
     keycloak_url: str = "http://localhost:8080"
     keycloak_realm: str = "pear"
     keycloak_client_id: str = "pear-genius"
     keycloak_client_secret: str = ""
+    keycloak_timeout: float = 5.0
+    keycloak_jwks_ttl: float = 300.0  # seconds before signing keys are re-fetched
+    keycloak_jwks_min_refresh_interval: float = 10.0  # unknown-kid re-fetch rate limit
+    keycloak_token_cache_size: int = 4096  # verified tokens kept until their exp
 
     # Server Configuration
     server_host: str = "0.0.0.0"
     server_port: int = 8000
     cors_origins: list[str] = ["http://localhost:3001"]
+    warmup_on_startup: bool = True  # build the graph and open pools before /api/ready
+    warmup_llm_request: bool = True  # 1-token request to open the Anthropic connection
+
+    # Admission Control (concurrent graph runs per process)
+    admission_max_concurrent: int = 8  # graph runs talking to Anthropic at once
+    admission_max_queue: int = 64  # waiting runs beyond this get 503 + Retry-After
+    admission_retry_after: int = 5  # seconds
+
+    # Rate Limiting (per-customer token buckets: sessions, messages, llm_tokens).
+    # Off by default: demo sessions all belong to the same test customer.
+    rate_limit_enabled: bool = False
+    rate_limit_backend: str = "memory"  # or "sqlite" to share buckets between workers on the host
+    rate_limit_db_path: str = "pear_genius_rate_limits.db"
+    # Per-tier overrides, e.g. {"plus": {"messages": [burst, per_minute]}}
+    rate_limits: dict[str, dict[str, tuple[float, float]]] = {}
+
+    # Tracing (OpenTelemetry; needs the "tracing" extra)
+    tracing_exporter: str = "none"  # "none", "console", "file" or "otlp"
+    tracing_file_path: str = "pear_genius_traces.jsonl"  # JSON span per line for "file"
+    tracing_service_name: str = "pear-genius"
+
+    # SSE Token Batching (0 ms sends one event per LLM chunk)
+    sse_token_flush_ms: float = 30.0
+    sse_token_flush_bytes: int = 512
+
+    # Serialization ("auto" uses orjson when installed)
+    json_backend: str = "auto"
 
     # Application Settings
     debug: bool = False
@@ -0,0 +1,546 @@
+"""Offline load test: the real API driven against a fake LLM and a fake MCP gateway.
+
+``pear-genius loadtest`` runs ``pear_genius.server.app`` in-process over an
+ASGI transport, with ``ChatAnthropic`` replaced by ``ScriptedChatModel`` and
+the AgentGateway MCP session replaced by ``FakeGatewaySession``, so no
+Anthropic tokens are spent and no pear-services need to be running.
+Everything above the MCP session is real: session store, admission control,
+checkpointer, compaction, SSE encoding and the whole tool path (tool
+concurrency limits, the MCP client wrapper, session pool, result cache,
+single-flight and result rendering).
+
+Each virtual customer creates a session and asks about their orders: the
+model streams a short reply and calls ``listOrders`` and
+``getOrderTracking`` in parallel, then streams an answer.  A share of
+customers (``--approval-rate``) instead ask to cancel; the model calls
+``cancelOrder``, the graph pauses for approval, and the customer alternately
+approves or rejects.
+
+Model time to first token, per-token delay and tool latency are drawn from
+log-normal distributions around configurable medians.  The report gives
+throughput, client-side turn latency (including admission queueing),
+server-side time to first token (from the ``done`` event's ``timing``),
+tool cache, single-flight and rendering counters, and process CPU and RSS.
+Server and load driver share a process, so CPU figures include the
+driver's (small) share.
+
+    pear-genius loadtest --sessions 200 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import os
+import random
+import resource
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import structlog
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.chat_models import agenerate_from_stream
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolCall,
+    ToolMessage,
+)
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_mcp_adapters.sessions import Connection
+from mcp.types import CallToolResult, ListToolsResult, Tool
+from pydantic import Field
+
+from .config import settings
+
+CANCEL_TOOL = "order-management_cancelOrder"
+LOOKUP_TOOLS = ("order-management_listOrders", "order-management_getOrderTracking")
+
+_ANSWER = (
+    "Your order ORD-1 shipped with UPS on Monday and was delivered on Tuesday "
+    "afternoon. The tracking history shows it was left at the front door. "
+    "Is there anything else I can help you with today?"
+)
+
+
+def _delay(median_ms: float, sigma: float) -> float:
+    """Log-normal delay in seconds around ``median_ms`` (long right tail, like real latency)."""
+    if median_ms <= 0:
+        return 0.0
+    return random.lognormvariate(math.log(median_ms / 1000), sigma)
+
+
+@dataclass
+class LoadProfile:
+    """Latency model for the fake LLM and MCP gateway (medians in milliseconds)."""
+
+    first_token_ms: float = 600.0
+    token_ms: float = 15.0
+    tool_ms: float = 120.0
+    sigma: float = 0.5
+    answer_tokens: int = 40
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Streams scripted replies and tool calls with sampled latency.
+
+    A customer message gets a short preamble and a tool call (``cancelOrder``
+    if the message mentions cancelling, otherwise both lookup tools); a tool
+    result gets an answer of ``answer_tokens`` words.
+    """
+
+    # Not ``profile``: BaseChatModel.profile is the model's capability profile
+    latency: LoadProfile = Field(default_factory=LoadProfile)
+
+    @property
+    def _llm_type(self) -> str:
+        return "pear-genius-loadtest"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _script(self, messages: list[BaseMessage]) -> tuple[list[str], list[ToolCall]]:
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            text = last.content if isinstance(last.content, str) else ""
+            names = [CANCEL_TOOL] if "cancel" in text.lower() else list(LOOKUP_TOOLS)
+            calls = [
+                ToolCall(name=name, args={"path": {"orderId": "ORD-1"}}, id=uuid.uuid4().hex)
+                for name in names
+            ]
+            return ["Let me ", "look that ", "up."], calls
+        if isinstance(last, ToolMessage) and "rejected" in str(last.content):
+            return ["Okay, I ", "won't do ", "that."], []
+        words = (_ANSWER.split() * self.latency.answer_tokens)[: self.latency.answer_tokens]
+        return [f"{word} " for word in words], []
+
+    @staticmethod
+    def _usage(messages: list[BaseMessage], tokens: list[str]) -> UsageMetadata:
+        input_tokens = sum(len(str(m.content)) // 4 for m in messages)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": len(tokens),
+            "total_tokens": input_tokens + len(tokens),
+        }
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tokens, calls = self._script(messages)
+        message = AIMessage(
+            content="".join(tokens),
+            tool_calls=calls,
+            usage_metadata=self._usage(messages, tokens),
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        tokens, calls = self._script(messages)
+        latency = self.latency
+        await asyncio.sleep(_delay(latency.first_token_ms, latency.sigma))
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(_delay(latency.token_ms, latency.sigma))
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {
+                        "name": c["name"],
+                        "args": json.dumps(c["args"]),
+                        "id": c["id"],
+                        "index": i,
+                    }
+                    for i, c in enumerate(calls)
+                ],
+                usage_metadata=self._usage(messages, tokens),
+            )
+        )
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await agenerate_from_stream(self._astream(messages, stop, run_manager, **kwargs))
+
+
+def _order(i: int) -> dict[str, Any]:
+    """Canned order, with the detail fields a list rendering drops."""
+    return {
+        "id": f"ORD-{i}",
+        "orderNumber": f"W{100000 + i}",
+        "type": "online",
+        "status": "delivered" if i > 1 else "shipped",
+        "createdAt": "2026-09-01T10:00:00Z",
+        "total": 2499.0,
+        "currency": "USD",
+        "billingAddress": {"line1": "1 Orchard Way", "city": "Cupertino", "zip": "95014"},
+        "payment": {"method": "card", "last4": "4242", "authorizationId": uuid.uuid4().hex},
+        "items": [
+            {
+                "id": f"ITEM-{i}-{n}",
+                "sku": f"PBP-{n}",
+                "name": "PearBook Pro",
+                "quantity": 1,
+                "status": "delivered",
+                "unitPrice": 2499.0,
+                "serialNumber": uuid.uuid4().hex[:12].upper(),
+            }
+            for n in range(2)
+        ],
+        "shipping": {
+            "carrier": "UPS",
+            "trackingNumber": "1Z999AA10123456784",
+            "estimatedDelivery": "2026-09-03",
+            "address": {"line1": "1 Orchard Way", "city": "Cupertino", "zip": "95014"},
+        },
+    }
+
+
+def _tool_result(name: str) -> dict[str, Any]:
+    """Structured content for a gateway tool call."""
+    if name == "order-management_listOrders":
+        orders = [_order(i) for i in range(1, 16)]
+        return {"orders": orders, "pagination": {"page": 1, "total": len(orders)}}
+    if name == CANCEL_TOOL:
+        return {"orderId": "ORD-1", "status": "cancelled"}
+    return {
+        "orderId": "ORD-1",
+        "carrier": "UPS",
+        "trackingNumber": "1Z999AA10123456784",
+        "status": "delivered",
+        "events": [{"at": "2026-09-03T14:10:00Z", "description": "Left at front door"}],
+    }
+
+
+class FakeGatewaySession:
+    """Stands in for the ``mcp.ClientSession`` of an AgentGateway connection.
+
+    Lists the order tools and answers calls from canned data after a sampled
+    delay, in the gateway's shape (empty ``content``, data in
+    ``structuredContent``).
+    """
+
+    def __init__(self, latency: LoadProfile):
+        self.latency = latency
+
+    async def initialize(self) -> None:
+        pass
+
+    async def send_ping(self) -> None:
+        pass
+
+    async def list_tools(self, cursor: str | None = None, **kwargs: Any) -> ListToolsResult:
+        schema = {"type": "object", "properties": {"path": {"type": "object"}}}
+        return ListToolsResult(
+            tools=[
+                Tool(name=name, description=f"Fake {name}", inputSchema=schema)
+                for name in (*LOOKUP_TOOLS, CANCEL_TOOL)
+            ]
+        )
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: dict[str, Any] | None = None,
+        read_timeout_seconds: timedelta | None = None,
+        progress_callback: Any = None,
+        *,
+        meta: dict[str, Any] | None = None,
+    ) -> CallToolResult:
+        await asyncio.sleep(_delay(self.latency.tool_ms, self.latency.sigma))
+        return CallToolResult(content=[], structuredContent=_tool_result(name))
+
+
+@contextlib.asynccontextmanager
+async def offline_backends(latency: LoadProfile) -> AsyncIterator[None]:
+    """Serve the LLM and the MCP gateway from the fakes above while the block runs.
+
+    The tool catalog, session pool and tool-layer singletons start empty so
+    they are built on this event loop through the fake gateway; the pool is
+    closed on exit.
+    """
+    from . import server
+    from .tools import concurrency, mcp_pool, registry, rendering, result_cache, single_flight
+
+    def fake_chat(**kwargs: Any) -> ScriptedChatModel:
+        return ScriptedChatModel(latency=latency)
+
+    @contextlib.asynccontextmanager
+    async def fake_create_session(
+        connection: Connection, **kwargs: Any
+    ) -> AsyncIterator[FakeGatewaySession]:
+        yield FakeGatewaySession(latency)
+
+    with (
+        patch("pear_genius.agents.agent.ChatAnthropic", fake_chat),
+        patch("pear_genius.agents.compaction.ChatAnthropic", fake_chat),
+        patch("langchain_mcp_adapters.tools.create_session", fake_create_session),
+        patch.object(mcp_pool, "create_session", fake_create_session),
+        patch.object(registry, "_catalog", None),
+        patch.object(registry, "_tools_lock", asyncio.Lock()),
+        patch.object(mcp_pool, "_pool", None),
+        patch.object(mcp_pool, "_pool_lock", asyncio.Lock()),
+        patch.object(concurrency, "_limiter", None),
+        patch.object(result_cache, "_cache", None),
+        patch.object(single_flight, "_single_flight", None),
+        patch.object(rendering, "_stats", rendering.RenderStats()),
+        patch.object(server, "_shared_graph", None),
+        patch.object(server, "_session_store", None),
+        # Every virtual customer is the same test customer
+        patch.object(settings, "rate_limit_enabled", False),
+    ):
+        try:
+            yield
+        finally:
+            await mcp_pool.close_mcp_pool()
+
+
+def tool_stats() -> dict[str, Any]:
+    """Counters of the tool layers between the agent and the MCP session."""
+    from .tools.rendering import get_render_stats
+    from .tools.result_cache import get_tool_result_cache
+    from .tools.single_flight import get_single_flight
+
+    return {
+        "cache": get_tool_result_cache().stats(),
+        "single_flight": get_single_flight().stats(),
+        "rendering": get_render_stats().stats(),
+    }
+
+
+# --- Load driver ---
+
+
+@dataclass
+class Turn:
+    """One SSE request: a message, approve or reject."""
+
+    kind: str
+    status: int
+    latency: float
+    ttft: float | None = None
+    error: bool = False
+
+
+@dataclass
+class LoadReport:
+    """Results of one load-test run."""
+
+    sessions: int
+    concurrency: int
+    elapsed: float
+    cpu: float
+    rss_mb: float
+    turns: list[Turn] = field(default_factory=list)
+    tools: dict[str, Any] = field(default_factory=dict)
+
+    def ok_turns(self, kind: str | None = None) -> list[Turn]:
+        return [
+            t
+            for t in self.turns
+            if t.status == 200 and not t.error and (kind is None or t.kind == kind)
+        ]
+
+    def format(self) -> str:
+        ok = self.ok_turns()
+        lines = [
+            f"{self.sessions} sessions, concurrency {self.concurrency}, {self.elapsed:.1f}s",
+            f"Throughput: {len(ok) / self.elapsed:.1f} turns/s, "
+            f"{self.sessions / self.elapsed:.1f} sessions/s",
+            f"Turns: {len(ok)} ok, "
+            f"{sum(t.status in (429, 503) for t in self.turns)} rejected (429/503), "
+            f"{sum(t.error or t.status not in (200, 429, 503) for t in self.turns)} failed",
+            "",
+            f"{'':<18}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}",
+        ]
+        rows = [
+            (f"turn ({kind})", [t.latency for t in self.ok_turns(kind)])
+            for kind in ("message", "approve", "reject")
+        ]
+        rows.append(("turn (all)", [t.latency for t in ok]))
+        rows.append(("time to 1st token", [t.ttft for t in ok if t.ttft is not None]))
+        for label, values in rows:
+            if values:
+                p50, p95, p99 = (percentile(values, q) * 1000 for q in (50, 95, 99))
+                lines.append(f"{label:<18}{len(values):>7}{p50:>9.0f}{p95:>9.0f}{p99:>9.0f}")
+        if self.tools:
+            cache, flights = self.tools["cache"], self.tools["single_flight"]
+            rendered = self.tools["rendering"].values()
+            lines += [
+                "",
+                f"Tool cache: {cache['hits']} hits, {cache['misses']} misses, "
+                f"{cache['invalidations']} invalidations",
+                f"Single-flight: {flights['leaders']} calls, {flights['coalesced']} coalesced",
+                f"Rendering: {sum(r['calls'] for r in rendered)} results, "
+                f"{sum(r['tokens_saved'] for r in rendered)} tokens saved",
+            ]
+        lines += [
+            "",
+            f"Process CPU: {self.cpu:.1f}s ({self.cpu / self.elapsed:.0%} of one core)",
+            f"Process RSS: {self.rss_mb:.0f} MB",
+        ]
+        return "\n".join(lines)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # not Linux: peak RSS is the closest portable figure
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+async def _sse_turn(
+    client: httpx.AsyncClient, kind: str, url: str, body: dict[str, Any] | None = None
+) -> tuple[Turn, list[dict[str, Any]]]:
+    """POST to an SSE endpoint and collect its events."""
+    started = time.monotonic()
+    response = await client.post(url, json=body)
+    events = []
+    if response.status_code == 200:
+        events = [
+            json.loads(line[6:]) for line in response.text.splitlines() if line.startswith("data: ")
+        ]
+    turn = Turn(kind, response.status_code, time.monotonic() - started)
+    for event in events:
+        if event["type"] == "error":
+            turn.error = True
+        elif event["type"] == "done":
+            ttft_ms = event.get("timing", {}).get("ttft_ms")
+            turn.ttft = None if ttft_ms is None else ttft_ms / 1000
+    return turn, events
+
+
+async def _run_customer(client: httpx.AsyncClient, i: int, cancel: bool) -> list[Turn]:
+    response = await client.post("/api/chat/sessions")
+    if response.status_code != 200:
+        return [Turn("session", response.status_code, 0.0, error=True)]
+    base = f"/api/chat/sessions/{response.json()['session_id']}"
+
+    text = "Please cancel order ORD-1" if cancel else "Where is my order ORD-1?"
+    turn, events = await _sse_turn(client, "message", f"{base}/messages", {"message": text})
+    turns = [turn]
+    if any(e["type"] == "approval_required" for e in events):
+        kind = "approve" if i % 2 == 0 else "reject"
+        turns.append((await _sse_turn(client, kind, f"{base}/{kind}"))[0])
+    return turns
+
+
+async def run_load(
+    sessions: int = 100,
+    concurrency: int = 16,
+    approval_rate: float = 0.3,
+    profile: LoadProfile | None = None,
+) -> LoadReport:
+    """Drive ``sessions`` virtual customers, ``concurrency`` at a time, against fake backends."""
+    from . import server
+
+    profile = profile or LoadProfile()
+    sem = asyncio.Semaphore(concurrency)
+    turns: list[Turn] = []
+
+    async def one(client: httpx.AsyncClient, i: int) -> None:
+        async with sem:
+            turns.extend(await _run_customer(client, i, random.random() < approval_rate))
+
+    async with offline_backends(profile):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=None
+        ) as client:
+            # Build the graph before timing starts
+            await server.get_shared_graph()  # type: ignore[no-untyped-call]
+            cpu_start, started = time.process_time(), time.monotonic()
+            await asyncio.gather(*(one(client, i) for i in range(sessions)))
+            elapsed = time.monotonic() - started
+            cpu = time.process_time() - cpu_start
+        tools = tool_stats()
+
+    return LoadReport(sessions, concurrency, elapsed, cpu, _rss_mb(), turns, tools)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """``pear-genius loadtest`` entry point."""
+    defaults = LoadProfile()
+    parser = argparse.ArgumentParser(
+        prog="pear-genius loadtest", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--approval-rate",
+        type=float,
+        default=0.3,
+        help="share of customers asking for an action that needs approval",
+    )
+    parser.add_argument("--first-token-ms", type=float, default=defaults.first_token_ms)
+    parser.add_argument("--token-ms", type=float, default=defaults.token_ms)
+    parser.add_argument("--tool-ms", type=float, default=defaults.tool_ms)
+    parser.add_argument(
+        "--sigma",
+        type=float,
+        default=defaults.sigma,
+        help="log-normal spread of every latency (0 = fixed)",
+    )
+    parser.add_argument("--answer-tokens", type=int, default=defaults.answer_tokens)
+    parser.add_argument("--seed", type=int, default=None)
+    opts = parser.parse_args(argv)
+
+    # The report is the output; per-request logs would drown it
+    logging.basicConfig(level=logging.ERROR)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    if opts.seed is not None:
+        random.seed(opts.seed)
+    profile = LoadProfile(
+        first_token_ms=opts.first_token_ms,
+        token_ms=opts.token_ms,
+        tool_ms=opts.tool_ms,
+        sigma=opts.sigma,
+        answer_tokens=opts.answer_tokens,
+    )
+    report = asyncio.run(run_load(opts.sessions, opts.concurrency, opts.approval_rate, profile))
+    print(report.format())
+    failed = [t for t in report.turns if t.error or t.status not in (200, 429, 503)]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
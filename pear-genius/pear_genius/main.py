@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import sys
 import uuid
 
 import structlog
@@ -25,6 +26,7 @@ from .agents.agent import create_agent_graph, get_last_ai_response
 from .auth.keycloak import create_test_customer_context
 from .config import settings
 from .state.conversation import AgentState, CustomerContext, CustomerTier
+from .tracing import setup_tracing, shutdown_tracing
 
 # Set root logger level so structlog's filter_by_level actually works
 logging.basicConfig(format="%(message)s", level=getattr(logging, settings.log_level.upper(), logging.INFO))
@@ -220,7 +222,12 @@ async def run_cli():
 
 
 def main():
-    """Main entry point."""
+    """Main entry point (``pear-genius loadtest ...`` runs the offline load test)."""
+    if sys.argv[1:2] == ["loadtest"]:
+        from .loadtest import main as loadtest_main
+
+        sys.exit(loadtest_main(sys.argv[2:]))
+
     print("Starting Pear Genius...")
 
     if not settings.anthropic_api_key:
@@ -228,7 +235,11 @@ def main():
         print("Please set it in your .env file or environment")
         return
 
-    asyncio.run(run_cli())
+    setup_tracing()
+    try:
+        asyncio.run(run_cli())
+    finally:
+        shutdown_tracing()
 
 
 if __name__ == "__main__":
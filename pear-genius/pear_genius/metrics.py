@@ -0,0 +1,220 @@
+"""Prometheus metrics for the Pear Genius API.
+
+Instruments are module-level and recorded from the event loop thread, so a
+recording is a dictionary lookup plus an integer/float add — no locks and
+no allocations beyond the label tuple.  Histograms keep per-bucket counts
+and are made cumulative only when ``/metrics`` is scraped.
+
+Component counters that already exist (session store, tool cache,
+admission, rate limits) are not duplicated here: the endpoint reads their
+``stats()`` at scrape time and renders them with ``render_samples``.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import Any, Generic, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+TURN_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+FIRST_TOKEN_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+TOOL_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+APPROVAL_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+_ChildT = TypeVar("_ChildT", _CounterValue, _HistogramValue)
+
+
+class _Metric(ABC, Generic[_ChildT]):
+    """Named metric with one child value per label combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], _ChildT] = {}
+        if not labelnames:
+            self.labels()  # unlabeled metrics are exported from the start
+        REGISTRY.append(self)
+
+    def labels(self, *values: str) -> _ChildT:
+        """Child for one label combination, created on first use."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> _ChildT:
+        """Create the value for a new label combination."""
+
+    @abstractmethod
+    def _lines(self, values: tuple[str, ...], child: _ChildT) -> Iterable[str]:
+        """Exposition lines for one child."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._children.items():
+            lines.extend(self._lines(values, child))
+        return "\n".join(lines)
+
+
+class Counter(_Metric[_CounterValue]):
+    """Monotonic counter, optionally labeled."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment the unlabeled counter."""
+        self.labels().inc(amount)
+
+    def _lines(self, values: tuple[str, ...], child: _CounterValue) -> Iterator[str]:
+        yield f"{self.name}{_labels(self.labelnames, values)} {_number(child.value)}"
+
+
+class Histogram(_Metric[_HistogramValue]):
+    """Fixed-bucket histogram, optionally labeled."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = TURN_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record a value in the unlabeled histogram."""
+        self.labels().observe(value)
+
+    def _lines(self, values: tuple[str, ...], child: _HistogramValue) -> Iterator[str]:
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), child.counts):
+            cumulative += count
+            le = f'le="{_number(bound)}"'
+            yield f"{self.name}_bucket{_labels(self.labelnames, values, le)} {cumulative}"
+        yield f"{self.name}_sum{_labels(self.labelnames, values)} {_number(child.sum)}"
+        yield f"{self.name}_count{_labels(self.labelnames, values)} {cumulative}"
+
+
+REGISTRY: list[_Metric[Any]] = []
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition of every instrument in the registry."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+def render_samples(samples: Iterable[tuple[str, str, str, float]]) -> str:
+    """Render ``(name, type, help, value)`` samples read from component stats."""
+    return "".join(
+        f"# HELP {name} {documentation}\n# TYPE {name} {kind}\n{name} {_number(value)}\n"
+        for name, kind, documentation, value in samples
+    )
+
+
+# --- Instruments ---
+
+TURN_DURATION = Histogram(
+    "pear_genius_turn_duration_seconds",
+    "Graph run duration for a message, approve or reject (outcome is ok, error or cancelled)",
+    ("outcome",),
+)
+TURN_PHASE_DURATION = Histogram(
+    "pear_genius_turn_phase_seconds",
+    "Time a graph run spent in LLM calls or with tool calls in flight (phase is llm or tools)",
+    ("phase",),
+)
+TOOL_OVERLAP = Histogram(
+    "pear_genius_tool_overlap_seconds",
+    "Tool time per graph run hidden by running tool calls concurrently",
+    buckets=TOOL_BUCKETS,
+)
+TIME_TO_FIRST_TOKEN = Histogram(
+    "pear_genius_time_to_first_token_seconds",
+    "Time from the start of a graph run to its first streamed token",
+    buckets=FIRST_TOKEN_BUCKETS,
+)
+LLM_CALL_DURATION = Histogram(
+    "pear_genius_llm_call_duration_seconds",
+    "Anthropic call latency (call is agent or summary)",
+    ("call",),
+)
+TOOL_DURATION = Histogram(
+    "pear_genius_tool_duration_seconds",
+    "MCP tool call latency by backend service",
+    ("service",),
+    buckets=TOOL_BUCKETS,
+)
+APPROVAL_WAIT = Histogram(
+    "pear_genius_approval_wait_seconds",
+    "Time from an approval request to the customer's approve or reject",
+    buckets=APPROVAL_BUCKETS,
+)
+ESCALATIONS = Counter(
+    "pear_genius_escalations_total",
+    "Conversations escalated to a human agent",
+    ("reason",),
+)
+TOOL_ERRORS = Counter(
+    "pear_genius_tool_errors_total",
+    "MCP tool calls that raised or returned an error",
+    ("service",),
+)
+SESSIONS_CREATED = Counter(
+    "pear_genius_sessions_created_total",
+    "Chat sessions created",
+)
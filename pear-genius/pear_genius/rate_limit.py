@@ -0,0 +1,302 @@
+"""Per-customer token-bucket rate limits for the chat API.
+
+Admission control bounds how many graph runs the process executes at once;
+these limits bound how much of that capacity one customer can take.  Each
+customer has three buckets, sized by ``CustomerTier``:
+
+- ``sessions``: one token per created session
+- ``messages``: one token per message sent
+- ``llm_tokens``: Anthropic input + output tokens consumed by graph runs
+
+A bucket holds up to ``burst`` tokens and refills at ``per_minute``.  LLM
+usage is only known once a run finishes, so it is charged afterwards and
+may push the bucket below zero; new runs are refused until it refills.
+Tier defaults can be overridden with ``settings.rate_limits``.
+
+Two backends are available, selected via ``settings.rate_limit_backend``:
+``memory`` (per process) and ``sqlite`` (shared by every worker on the
+host, so limits hold regardless of which worker serves a request).
+"""
+
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+import aiosqlite
+import structlog
+
+from .config import settings
+from .state.conversation import CustomerTier
+
+logger = structlog.get_logger()
+
+SESSIONS = "sessions"
+MESSAGES = "messages"
+LLM_TOKENS = "llm_tokens"
+
+# Full buckets are indistinguishable from missing ones, so they are dropped
+PRUNE_INTERVAL = 60.0
+
+
+class Limit(NamedTuple):
+    """Bucket capacity and refill rate."""
+
+    burst: float
+    per_minute: float
+
+
+DEFAULT_LIMITS: dict[CustomerTier, dict[str, Limit]] = {
+    CustomerTier.STANDARD: {
+        SESSIONS: Limit(5, 5),
+        MESSAGES: Limit(10, 20),
+        LLM_TOKENS: Limit(100_000, 200_000),
+    },
+    CustomerTier.PLUS: {
+        SESSIONS: Limit(10, 10),
+        MESSAGES: Limit(20, 40),
+        LLM_TOKENS: Limit(200_000, 400_000),
+    },
+    CustomerTier.PREMIER: {
+        SESSIONS: Limit(20, 20),
+        MESSAGES: Limit(40, 80),
+        LLM_TOKENS: Limit(400_000, 800_000),
+    },
+}
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a customer's bucket does not hold enough tokens."""
+
+    def __init__(self, bucket: str, retry_after: int):
+        super().__init__(f"Rate limit exceeded: {bucket}")
+        self.bucket = bucket
+        self.retry_after = retry_after
+
+
+def resolve_limits(
+    overrides: dict[str, dict[str, tuple[float, float]]] | None = None,
+) -> dict[CustomerTier, dict[str, Limit]]:
+    """Tier defaults with ``{"tier": {"bucket": [burst, per_minute]}}`` overrides applied."""
+    overrides = settings.rate_limits if overrides is None else overrides
+    limits = {tier: dict(buckets) for tier, buckets in DEFAULT_LIMITS.items()}
+    for tier, buckets in overrides.items():
+        for bucket, (burst, per_minute) in buckets.items():
+            limits[CustomerTier(tier)][bucket] = Limit(burst, per_minute)
+    return limits
+
+
+def _spend(
+    state: tuple[float, float] | None, limit: Limit, cost: float, now: float, force: bool
+) -> tuple[bool, float]:
+    """Refill a bucket to ``now`` and take ``cost`` from it; ``force`` may overdraw."""
+    if state is None:
+        tokens = limit.burst
+    else:
+        tokens, updated = state
+        tokens = min(limit.burst, tokens + (now - updated) * limit.per_minute / 60)
+    if force or tokens >= cost:
+        return True, tokens - cost
+    return False, tokens
+
+
+def _full_at(tokens: float, limit: Limit, now: float) -> float:
+    return now + (limit.burst - tokens) * 60 / limit.per_minute
+
+
+class RateLimiter(ABC):
+    """Token buckets keyed by customer ID and bucket name."""
+
+    def __init__(self, limits: dict[CustomerTier, dict[str, Limit]] | None = None):
+        self.limits = resolve_limits() if limits is None else limits
+        self.enabled = settings.rate_limit_enabled
+        self.allowed = 0
+        self.limited = 0
+        self._pruned = time.time()
+
+    def limit(self, tier: CustomerTier | None, bucket: str) -> Limit | None:
+        """Limit for a tier's bucket; None if the bucket is unlimited."""
+        limit = self.limits[tier or CustomerTier.STANDARD].get(bucket)
+        if limit is None or limit.per_minute <= 0:
+            return None
+        return limit
+
+    async def acquire(
+        self, customer_id: str, tier: CustomerTier | None, bucket: str, cost: float = 1.0
+    ) -> None:
+        """
+        Take ``cost`` tokens from a customer's bucket.
+
+        A ``cost`` of 0 only checks that the bucket is not overdrawn.
+
+        Raises:
+            RateLimitExceededError: If the bucket holds fewer than ``cost`` tokens
+        """
+        limit = self.limit(tier, bucket)
+        if not self.enabled or limit is None:
+            return
+        allowed, tokens = await self._spend(f"{customer_id}:{bucket}", limit, cost, False)
+        if allowed:
+            self.allowed += 1
+            return
+        self.limited += 1
+        retry_after = max(1, math.ceil((cost - tokens) * 60 / limit.per_minute))
+        logger.warning(
+            "Rate limit exceeded",
+            customer_id=customer_id,
+            bucket=bucket,
+            retry_after=retry_after,
+        )
+        raise RateLimitExceededError(bucket, retry_after)
+
+    async def charge(
+        self, customer_id: str, tier: CustomerTier | None, bucket: str, cost: float
+    ) -> None:
+        """Take ``cost`` tokens unconditionally (usage that has already happened)."""
+        limit = self.limit(tier, bucket)
+        if not self.enabled or limit is None or cost <= 0:
+            return
+        await self._spend(f"{customer_id}:{bucket}", limit, cost, True)
+
+    def _prune_due(self, now: float) -> bool:
+        if now - self._pruned < PRUNE_INTERVAL:
+            return False
+        self._pruned = now
+        return True
+
+    @abstractmethod
+    async def _spend(self, key: str, limit: Limit, cost: float, force: bool) -> tuple[bool, float]:
+        """Atomically refill and spend from one bucket; returns (allowed, tokens left)."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+    def stats(self) -> dict[str, int]:
+        """Allowed and limited request counters."""
+        return {"allowed": self.allowed, "limited": self.limited}
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Per-process buckets."""
+
+    def __init__(self, limits: dict[CustomerTier, dict[str, Limit]] | None = None):
+        super().__init__(limits)
+        # key -> (tokens, updated, full_at)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+
+    async def _spend(self, key: str, limit: Limit, cost: float, force: bool) -> tuple[bool, float]:
+        now = time.time()
+        state = self._buckets.get(key)
+        allowed, tokens = _spend(state[:2] if state else None, limit, cost, now, force)
+        self._buckets[key] = (tokens, now, _full_at(tokens, limit, now))
+        if self._prune_due(now):
+            full = [k for k, (_, _, full_at) in self._buckets.items() if full_at <= now]
+            for k in full:
+                del self._buckets[k]
+        return allowed, tokens
+
+    def stats(self) -> dict[str, int]:
+        return {**super().stats(), "buckets": len(self._buckets)}
+
+
+class SqliteRateLimiter(RateLimiter):
+    """Buckets shared by all workers on the host through SQLite."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS rate_buckets ("
+        "key TEXT PRIMARY KEY, "
+        "tokens REAL NOT NULL, "
+        "updated REAL NOT NULL, "
+        "full_at REAL NOT NULL)"
+    )
+
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        limits: dict[CustomerTier, dict[str, Limit]] | None = None,
+    ):
+        super().__init__(limits)
+        self.conn = conn
+        self._lock = asyncio.Lock()
+
+    async def setup(self) -> None:
+        async with self._lock:
+            await self.conn.execute("PRAGMA journal_mode=WAL")
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
+            await self.conn.execute("PRAGMA busy_timeout=5000")
+            await self.conn.execute(self._SCHEMA)
+            await self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS rate_buckets_full_at ON rate_buckets (full_at)"
+            )
+            await self.conn.commit()
+
+    async def _spend(self, key: str, limit: Limit, cost: float, force: bool) -> tuple[bool, float]:
+        now = time.time()
+        async with self._lock:
+            # Take the write lock before reading so workers cannot interleave
+            await self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                async with self.conn.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)
+                ) as cur:
+                    row = await cur.fetchone()
+                state = None if row is None else (row[0], row[1])
+                allowed, tokens = _spend(state, limit, cost, now, force)
+                await self.conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, _full_at(tokens, limit, now)),
+                )
+                if self._prune_due(now):
+                    await self.conn.execute("DELETE FROM rate_buckets WHERE full_at <= ?", (now,))
+                await self.conn.commit()
+            except BaseException:
+                await self.conn.rollback()
+                raise
+        return allowed, tokens
+
+    async def close(self) -> None:
+        await self.conn.close()
+
+
+async def create_rate_limiter() -> RateLimiter:
+    """
+    Create the rate limiter selected by ``settings.rate_limit_backend``.
+
+    Raises:
+        ValueError: If the configured backend is unknown
+    """
+    backend = settings.rate_limit_backend.lower()
+
+    if backend == "memory":
+        return InMemoryRateLimiter()
+
+    if backend == "sqlite":
+        limiter = SqliteRateLimiter(await aiosqlite.connect(settings.rate_limit_db_path))
+        await limiter.setup()
+        logger.info("Using SQLite rate limiter", path=settings.rate_limit_db_path)
+        return limiter
+
+    raise ValueError(f"Unknown rate limit backend: {settings.rate_limit_backend!r}")
+
+
+_limiter: RateLimiter | None = None
+_limiter_lock = asyncio.Lock()
+
+
+async def get_rate_limiter() -> RateLimiter:
+    """Get (or lazily create) the process-wide rate limiter."""
+    global _limiter
+    if _limiter is None:
+        async with _limiter_lock:
+            if _limiter is None:
+                _limiter = await create_rate_limiter()
+    return _limiter
+
+
+async def close_rate_limiter() -> None:
+    """Close the process-wide rate limiter, if created."""
+    global _limiter
+    if _limiter is not None:
+        limiter, _limiter = _limiter, None
+        await limiter.close()
@@ -0,0 +1,103 @@
+"""Pluggable JSON serialization for SSE events and MCP tool payloads.
+
+All hot-path JSON (SSE event payloads, ``structuredContent`` rendered into
+the LLM context, tool output re-read from history) goes through the
+serializer returned by ``get_serializer()``.  The backend is chosen by
+``settings.json_backend``:
+
+- ``auto`` (default): orjson when installed, otherwise the stdlib
+- ``orjson``: orjson (falls back to the stdlib with a warning if missing)
+- ``stdlib``: the standard library ``json`` module
+
+Install the optional fast backend with ``pip install 'pear-genius[fast]'``.
+Both backends produce compact, UTF-8 JSON, so switching backends does not
+change what the LLM or the browser sees.
+"""
+
+import json
+from typing import Any
+
+import structlog
+
+from .config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None  # type: ignore[assignment]
+
+logger = structlog.get_logger()
+
+
+class StdlibSerializer:
+    """Compact JSON via the standard library."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> str:
+        return json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys, default=str
+        )
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self.dumps(obj).encode()
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(StdlibSerializer):
+    """Compact JSON via orjson; values orjson rejects fall back to the stdlib."""
+
+    name = "orjson"
+
+    def dumps(self, obj: Any, *, sort_keys: bool = False) -> str:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode()
+        except orjson.JSONEncodeError:  # e.g. integers beyond 64 bits
+            return super().dumps(obj, sort_keys=sort_keys)
+
+    def dumpb(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().dumpb(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+
+def create_serializer(backend: str) -> StdlibSerializer:
+    """
+    Create a serializer for the named backend.
+
+    Args:
+        backend: "auto", "orjson" or "stdlib"
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "stdlib":
+        return StdlibSerializer()
+    if backend in ("auto", "orjson"):
+        if orjson is not None:
+            return OrjsonSerializer()
+        if backend == "orjson":
+            logger.warning("orjson is not installed — using stdlib json")
+        return StdlibSerializer()
+    raise ValueError(f"Unknown JSON backend: {backend!r} (expected 'auto', 'orjson' or 'stdlib')")
+
+
+_serializer: StdlibSerializer | None = None
+
+
+def get_serializer() -> StdlibSerializer:
+    """Get the process-wide serializer for ``settings.json_backend``."""
+    global _serializer
+    if _serializer is None:
+        _serializer = create_serializer(settings.json_backend)
+    return _serializer
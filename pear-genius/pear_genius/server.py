@@ -1,36 +1,171 @@
 """FastAPI server for Pear Genius with SSE streaming and human-in-the-loop approval."""
 
 import asyncio
-import json
 import logging
 import time
 import uuid
-from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import lru_cache
 
 import structlog
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.types import Command
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
+from starlette.background import BackgroundTask
 
 # Suppress spurious "Session termination failed: 202" warning from MCP client
 from .main import MCPSessionTerminationFilter
 
 logging.getLogger("mcp.client.streamable_http").addFilter(MCPSessionTerminationFilter())
 
-from .agents.agent import create_agent_graph
-from .auth.keycloak import create_test_customer_context
+from .admission import AdmissionRejectedError, get_admission_controller, request_priority
+from .agents.agent import create_agent_graph, warm_up_llm
+from .agents.compaction import INTERNAL_LLM_TAG
+from .auth.keycloak import create_test_customer_context, get_keycloak_auth
 from .config import settings
+from .metrics import (
+    APPROVAL_WAIT,
+    CONTENT_TYPE,
+    SESSIONS_CREATED,
+    TIME_TO_FIRST_TOKEN,
+    TOOL_DURATION,
+    TOOL_ERRORS,
+    render_metrics,
+    render_samples,
+)
+from .rate_limit import (
+    LLM_TOKENS,
+    MESSAGES,
+    SESSIONS,
+    RateLimitExceededError,
+    close_rate_limiter,
+    get_rate_limiter,
+)
+from .state.checkpointer import close_checkpointer
 from .state.conversation import AgentState, CustomerTier
+from .state.sessions import SessionData, SessionStore, create_session_store
+from .streaming import TokenBatcher, batch_tokens, sse_frame
+from .timing import TurnTimer
+from .tools.mcp_client import gateway_connection, get_service_prefix
+from .tools.mcp_pool import close_mcp_pool, get_mcp_pool
+from .tools.registry import ToolCatalogRefresher, get_tool_catalog, load_tool_catalog
+from .tools.rendering import get_render_stats
+from .tools.result_cache import get_tool_result_cache
+from .tools.single_flight import get_single_flight
+from .tracing import setup_tracing, shutdown_tracing, start_span
 
 logger = structlog.get_logger()
 
+# --- Startup / Warm-up ---
+
+WARMUP_RETRY_BACKOFF = 2.0  # seconds, doubled per failed attempt
+WARMUP_MAX_BACKOFF = 30.0
+
+_startup: dict = {"status": "starting", "phases": {}, "error": None}
+
+
+@asynccontextmanager
+async def _phase(name: str):
+    """Time one startup phase and record it for /api/ready."""
+    start = time.perf_counter()
+    yield
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    _startup["phases"][name] = duration_ms
+    logger.info("Startup phase completed", phase=name, duration_ms=duration_ms)
+
+
+async def warm_up() -> None:
+    """
+    Build the shared graph and open the MCP and LLM connections.
+
+    Runs in the background from the lifespan hook so the process accepts
+    liveness probes immediately; /api/ready reports ready once it finishes.
+    An unreachable gateway (no tools listed, no healthy pooled session) fails
+    warm-up and is retried with exponential backoff, so the process is never
+    ready without tools.  The LLM warm-up request is best-effort.
+    """
+    start = time.perf_counter()
+    backoff = WARMUP_RETRY_BACKOFF
+    attempt = 1
+    while True:
+        try:
+            async with _phase("tools"):
+                await load_tool_catalog()
+            async with _phase("graph"):
+                await get_shared_graph()
+            if settings.mcp_pool_enabled:
+                async with _phase("mcp_pool"):
+                    pool = await get_mcp_pool(gateway_connection())
+                    if pool.healthy_count == 0:
+                        raise ConnectionError("No healthy MCP session in the pool")
+            break
+        except Exception as e:
+            _startup["error"] = str(e)
+            logger.warning(
+                "Startup warm-up failed", attempt=attempt, retry_in=backoff, error=str(e)
+            )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, WARMUP_MAX_BACKOFF)
+            attempt += 1
+
+    if settings.warmup_llm_request and settings.anthropic_api_key:
+        try:
+            async with _phase("llm"):
+                await warm_up_llm()
+        except Exception as e:
+            logger.warning("LLM warm-up request failed", error=str(e))
+
+    _startup.update(status="ready", error=None)
+    logger.info(
+        "Startup complete",
+        total_ms=round((time.perf_counter() - start) * 1000, 1),
+        phases=_startup["phases"],
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up on startup; release pooled connections on shutdown."""
+    setup_tracing()
+    refresher = ToolCatalogRefresher(on_change=swap_shared_graph)
+    refresher.start()
+    task = None
+    if settings.warmup_on_startup:
+        task = asyncio.create_task(warm_up())
+    else:
+        # Lazy mode: the graph is built by the first session request
+        _startup["status"] = "ready"
+    try:
+        yield
+    finally:
+        await refresher.close()
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await close_mcp_pool()
+        if _session_store is not None:
+            await _session_store.close()
+        await close_rate_limiter()
+        await get_keycloak_auth().close()
+        if _shared_graph is not None:
+            await close_checkpointer(_shared_graph.checkpointer)
+        elif _pending_checkpointer is not None:
+            await close_checkpointer(_pending_checkpointer)
+        shutdown_tracing()
+
+
 # --- FastAPI App ---
 
-app = FastAPI(title="Pear Genius API", version="0.1.0")
+app = FastAPI(title="Pear Genius API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,42 +177,134 @@ app.add_middleware(
 
 # --- Session Manager ---
 
-MAX_SESSIONS = 100  # Evict oldest sessions beyond this limit
-
 _shared_graph = None
+# Checkpointer of the uncached graphs served while no tools are loaded
+_pending_checkpointer = None
 _graph_lock = asyncio.Lock()
-_sessions: OrderedDict[str, "SessionData"] = OrderedDict()
+_session_store: SessionStore | None = None
+_session_store_lock = asyncio.Lock()
+
+
+async def get_session_store() -> SessionStore:
+    """Get or create the session store selected by ``settings.session_backend``."""
+    global _session_store
+    if _session_store is None:
+        async with _session_store_lock:
+            if _session_store is None:
+                _session_store = await create_session_store(on_evict=purge_threads)
+    return _session_store
+
+
+async def purge_threads(session_ids: list[str]) -> None:
+    """
+    Delete the checkpointer threads of evicted or expired sessions.
+
+    Removes every checkpoint and pending write of each thread, including
+    approval interrupts nobody will answer.  Each thread is deleted in one
+    step (a synchronous in-memory update, or a single SQLite transaction).
+    The store calls this only after a session's running turn has finished.
+    """
+    graph = _shared_graph
+    checkpointer = graph.checkpointer if graph is not None else _pending_checkpointer
+    if checkpointer is None:
+        return
+    for session_id in session_ids:
+        await checkpointer.adelete_thread(session_id)
+    logger.info("Session threads purged", count=len(session_ids))
+
 
+async def _require_session(session_id: str) -> SessionData:
+    """Look up a session (marking it used) or raise 404."""
+    session = await (await get_session_store()).get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
 
-class SessionData:
-    """Lightweight session metadata. Graph state lives in the checkpointer."""
 
-    def __init__(self, welcome_message: str, customer_id: str, customer=None):
-        self.welcome_message = welcome_message
-        self.customer_id = customer_id
-        self.customer = customer
-        self.lock = asyncio.Lock()
-        self.is_first_message = True
+async def _observe_approval_wait(graph, config: dict) -> None:
+    """Record how long the pending approval waited (its interrupt checkpoint's age)."""
+    try:
+        snapshot = await graph.aget_state(config)
+    except Exception:
+        return
+    if snapshot and snapshot.interrupts and snapshot.created_at:
+        requested = datetime.fromisoformat(snapshot.created_at).timestamp()
+        APPROVAL_WAIT.observe(max(time.time() - requested, 0.0))
+
 
+def _session_tier(session: SessionData) -> CustomerTier | None:
+    return session.customer.tier if session.customer else None
 
-def _evict_sessions() -> None:
-    """Remove oldest sessions when over the limit."""
-    while len(_sessions) > MAX_SESSIONS:
-        evicted_id, _ = _sessions.popitem(last=False)
-        logger.info("Session evicted", session_id=evicted_id)
+
+async def _rate_limit(
+    customer_id: str, tier: CustomerTier | None, bucket: str, cost: float = 1.0
+) -> None:
+    """Take from a customer's rate-limit bucket or raise 429 with Retry-After."""
+    try:
+        await (await get_rate_limiter()).acquire(customer_id, tier, bucket, cost)
+    except RateLimitExceededError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="You're sending requests too quickly. Please wait a moment and try again.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def _charge_llm_tokens(session: SessionData | None, tokens: int) -> None:
+    """Charge a finished run's LLM usage to the customer (best effort)."""
+    if session is None or not tokens:
+        return
+    try:
+        limiter = await get_rate_limiter()
+        await limiter.charge(session.customer_id, _session_tier(session), LLM_TOKENS, tokens)
+    except Exception as e:
+        logger.warning("Failed to charge LLM tokens", customer_id=session.customer_id, error=str(e))
 
 
 async def get_shared_graph():
-    """Get or create the shared compiled graph (MCP tools loaded once)."""
-    global _shared_graph
+    """
+    Get or create the shared compiled graph (MCP tools loaded once).
+
+    A graph built on an empty tool catalog (the gateway was unreachable) is
+    returned but not cached, so the graph built once the catalog refresher
+    loads the tools replaces it.  Its checkpointer is kept for that graph,
+    so conversations carry over.
+    """
+    global _shared_graph, _pending_checkpointer
     if _shared_graph is None:
         async with _graph_lock:
             if _shared_graph is None:
-                _shared_graph = await create_agent_graph()
+                catalog = await get_tool_catalog()
+                graph = await create_agent_graph(
+                    tools=catalog.tools, checkpointer=_pending_checkpointer
+                )
+                if not catalog:
+                    _pending_checkpointer = graph.checkpointer
+                    return graph
+                _shared_graph, _pending_checkpointer = graph, None
                 logger.info("Shared agent graph created with MCP tools")
     return _shared_graph
 
 
+async def swap_shared_graph(tools: list) -> None:
+    """
+    Rebuild the shared graph for a changed tool catalog and swap it in.
+
+    The new graph is compiled off the request path with the same
+    checkpointer, so conversations carry over.  Requests already streaming
+    hold a reference to the old graph and finish on it; new requests get
+    the new one.  If no graph has been built yet, the next
+    ``get_shared_graph()`` picks up the committed catalog instead.
+    """
+    global _shared_graph
+    old = _shared_graph
+    if old is None:
+        return
+    graph = await create_agent_graph(tools=tools, checkpointer=old.checkpointer)
+    _shared_graph = graph
+    logger.info("Shared agent graph swapped", tools=len(tools))
+
+
 # --- Request / Response Models ---
 
 
@@ -99,163 +326,302 @@ class SessionInfoResponse(BaseModel):
 
 # --- Shared SSE stream helper ---
 
+# Events that never change are encoded once
+_ERROR_EVENT = {"type": "error", "content": "An error occurred processing your request."}
+_ERROR_FRAME = sse_frame(_ERROR_EVENT)
+_BUSY_MESSAGE = "Pear Genius is busy right now. Please try again shortly."
+_BUSY_FRAME = sse_frame({"type": "error", "content": _BUSY_MESSAGE})
+
+
+@lru_cache(maxsize=512)
+def _tool_event_frame(event_type: str, tool: str) -> bytes:
+    """Encoded tool_start/tool_end frame (one per tool name and event type)."""
+    return sse_frame({"type": event_type, "tool": tool})
+
+
+def _encode_event(payload: dict) -> bytes:
+    """Encode an event payload as an SSE frame, reusing pre-encoded frames."""
+    if payload is _ERROR_EVENT:
+        return _ERROR_FRAME
+    if payload["type"] in ("tool_start", "tool_end"):
+        return _tool_event_frame(payload["type"], payload["tool"])
+    return sse_frame(payload)
 
-async def _stream_graph_events(graph, input_data, config, session_id: str):
+
+def _chunk_texts(content) -> list[str]:
+    """Extract the non-empty text parts of a streamed AIMessage chunk."""
+    if isinstance(content, str):
+        return [content] if content else []
+    if isinstance(content, list):
+        return [
+            item["text"]
+            for item in content
+            if isinstance(item, dict) and item.get("type") == "text" and item.get("text")
+        ]
+    return []
+
+
+async def _graph_payloads(
+    graph, input_data, config, session_id: str, session: SessionData | None = None
+):
     """
-    Shared SSE generator for /messages, /approve, and /reject.
+    Run the graph and yield SSE event payloads (not yet encoded).
 
-    Streams token/tool events, then checks for interrupts (approval_required).
+    Yields token/tool payloads, then checks for interrupts (approval_required).
+    The final ``done`` payload carries the run's ``TurnTimer`` summary.
+    LLM tokens used by the run are charged to the session's customer.
     """
     accumulated_text = ""
 
     # --- Tracking ---
-    turn_start = time.monotonic()
+    timer = TurnTimer()
     tool_calls: list[dict] = []
     llm_invocations = 0
-    _active_tools: dict[str, float] = {}
+    llm_tokens = 0
 
     logger.info(
         "Stream started",
         session_id=session_id,
     )
 
+    # The turn's latency is recorded once, by the first timer.observe() reached
     try:
-        async for event in graph.astream_events(
-            input_data, config=config, version="v2"
-        ):
-            kind = event.get("event", "")
-
-            if kind == "on_chat_model_start":
-                llm_invocations += 1
-
-            elif kind == "on_chat_model_stream":
-                chunk = event.get("data", {}).get("chunk")
-                if chunk and isinstance(chunk, AIMessage):
-                    content = chunk.content
-                    if isinstance(content, str) and content:
-                        accumulated_text += content
-                        yield {
-                            "data": json.dumps(
-                                {"type": "token", "content": content}
-                            )
-                        }
-                    elif isinstance(content, list):
-                        for item in content:
-                            if isinstance(item, dict) and item.get("type") == "text":
-                                text = item.get("text", "")
-                                if text:
-                                    accumulated_text += text
-                                    yield {
-                                        "data": json.dumps(
-                                            {"type": "token", "content": text}
-                                        )
-                                    }
-
-            elif kind == "on_tool_start":
-                tool_name = event.get("name", "unknown")
-                run_id = event.get("run_id", "")
-                _active_tools[run_id] = time.monotonic()
-                display_name = (
-                    tool_name.split("_", 1)[-1]
-                    if "_" in tool_name
-                    else tool_name
-                )
-                logger.info(
-                    "Tool call started",
-                    tool=tool_name,
-                    session_id=session_id,
-                )
-                yield {
-                    "data": json.dumps(
-                        {"type": "tool_start", "tool": display_name}
+        try:
+            async for event in graph.astream_events(
+                input_data,
+                config=config,
+                version="v2",
+                durability=settings.checkpoint_durability,
+            ):
+                kind = event.get("event", "")
+
+                if kind == "on_chat_model_start":
+                    timer.llm_start(event.get("run_id", ""))
+                    if INTERNAL_LLM_TAG not in event.get("tags", []):
+                        llm_invocations += 1
+
+                elif kind == "on_chat_model_end":
+                    timer.llm_end(event.get("run_id", ""))
+                    # Summarization calls count too: every token is billed
+                    usage = getattr(event.get("data", {}).get("output"), "usage_metadata", None)
+                    if usage:
+                        llm_tokens += usage.get("total_tokens", 0)
+
+                elif kind == "on_chat_model_stream":
+                    # Internal LLM calls (e.g. history summarization) are not customer-facing
+                    if INTERNAL_LLM_TAG in event.get("tags", []):
+                        continue
+                    chunk = event.get("data", {}).get("chunk")
+                    if chunk and isinstance(chunk, AIMessage):
+                        for text in _chunk_texts(chunk.content):
+                            ttft = timer.token()
+                            if ttft is not None:
+                                TIME_TO_FIRST_TOKEN.observe(ttft)
+                            accumulated_text += text
+                            yield {"type": "token", "content": text}
+
+                elif kind == "on_tool_start":
+                    tool_name = event.get("name", "unknown")
+                    timer.tool_start(event.get("run_id", ""))
+                    display_name = (
+                        tool_name.split("_", 1)[-1]
+                        if "_" in tool_name
+                        else tool_name
                     )
-                }
-
-            elif kind == "on_tool_end":
-                tool_name = event.get("name", "unknown")
-                run_id = event.get("run_id", "")
-                tool_start = _active_tools.pop(run_id, None)
-                duration_ms = (
-                    round((time.monotonic() - tool_start) * 1000)
-                    if tool_start
-                    else None
-                )
-                tool_calls.append(
-                    {"name": tool_name, "duration_ms": duration_ms}
-                )
-                display_name = (
-                    tool_name.split("_", 1)[-1]
-                    if "_" in tool_name
-                    else tool_name
-                )
-                logger.info(
-                    "Tool call completed",
-                    tool=tool_name,
-                    duration_ms=duration_ms,
-                    session_id=session_id,
-                )
-                yield {
-                    "data": json.dumps(
-                        {"type": "tool_end", "tool": display_name}
+                    logger.info(
+                        "Tool call started",
+                        tool=tool_name,
+                        session_id=session_id,
+                    )
+                    yield {"type": "tool_start", "tool": display_name}
+
+                elif kind == "on_tool_end":
+                    tool_name = event.get("name", "unknown")
+                    elapsed = timer.tool_end(event.get("run_id", ""))
+                    service = get_service_prefix(tool_name)
+                    duration_ms = None
+                    if elapsed is not None:
+                        TOOL_DURATION.labels(service).observe(elapsed)
+                        duration_ms = round(elapsed * 1000)
+                    # MCP errors come back as a ToolMessage with status "error"
+                    if getattr(event.get("data", {}).get("output"), "status", None) == "error":
+                        TOOL_ERRORS.labels(service).inc()
+                    tool_calls.append(
+                        {"name": tool_name, "duration_ms": duration_ms}
+                    )
+                    display_name = (
+                        tool_name.split("_", 1)[-1]
+                        if "_" in tool_name
+                        else tool_name
+                    )
+                    logger.info(
+                        "Tool call completed",
+                        tool=tool_name,
+                        duration_ms=duration_ms,
+                        session_id=session_id,
+                    )
+                    yield {"type": "tool_end", "tool": display_name}
+
+                elif kind == "on_tool_error":
+                    tool_name = event.get("name", "unknown")
+                    elapsed = timer.tool_end(event.get("run_id", ""))
+                    service = get_service_prefix(tool_name)
+                    if elapsed is not None:
+                        TOOL_DURATION.labels(service).observe(elapsed)
+                    TOOL_ERRORS.labels(service).inc()
+                    logger.warning(
+                        "Tool call failed",
+                        tool=tool_name,
+                        error=str(event.get("data", {}).get("error")),
+                        session_id=session_id,
                     )
-                }
 
-    except BaseException as e:
-        log_fn = logger.warning if accumulated_text else logger.error
-        log_fn(
-            "Stream error",
-            error=str(e),
+        except GeneratorExit:
+            raise  # closed by the client: nothing more can be yielded
+        except BaseException as e:
+            log_fn = logger.warning if accumulated_text else logger.error
+            log_fn(
+                "Stream error",
+                error=str(e),
+                session_id=session_id,
+                had_partial=bool(accumulated_text),
+            )
+            await _charge_llm_tokens(session, llm_tokens)
+            timer.observe("cancelled" if isinstance(e, asyncio.CancelledError) else "error")
+            yield _ERROR_EVENT
+            # Skip interrupt check after error
+            yield {"type": "done", "timing": timer.summary()}
+            return
+
+        # --- Check for interrupts (approval required) ---
+        try:
+            graph_state = await graph.aget_state(config)
+            if graph_state and graph_state.tasks:
+                for task in graph_state.tasks:
+                    if hasattr(task, "interrupts") and task.interrupts:
+                        for intr in task.interrupts:
+                            interrupt_value = intr.value
+                            if isinstance(interrupt_value, dict) and interrupt_value.get("action") == "approve_tool_calls":
+                                logger.info(
+                                    "Approval required event sent",
+                                    session_id=session_id,
+                                    actions=[a["tool_name"] for a in interrupt_value.get("actions", [])],
+                                )
+                                yield {
+                                    "type": "approval_required",
+                                    "actions": interrupt_value.get("actions", []),
+                                }
+        except Exception as e:
+            logger.warning("Failed to check graph state for interrupts", error=str(e))
+
+        await _charge_llm_tokens(session, llm_tokens)
+
+        # --- Turn summary log ---
+        timer.observe("ok")
+        timing = timer.summary()
+        logger.info(
+            "Stream completed",
             session_id=session_id,
-            had_partial=bool(accumulated_text),
+            duration_ms=timing["total_ms"],
+            timing=timing,
+            llm_invocations=llm_invocations,
+            llm_tokens=llm_tokens,
+            tool_calls_count=len(tool_calls),
+            tool_calls=[
+                {"tool": tc["name"], "ms": tc["duration_ms"]}
+                for tc in tool_calls
+            ],
+            response_length=len(accumulated_text),
+            tool_cache=get_tool_result_cache().stats(),
+            tool_single_flight=get_single_flight().stats(),
+            tool_rendering=get_render_stats().stats(),
+            sessions=await (await get_session_store()).stats(),
+            admission=get_admission_controller().stats(),
+            rate_limits=(await get_rate_limiter()).stats(),
         )
-        yield {
-            "data": json.dumps(
-                {"type": "error", "content": "An error occurred processing your request."}
-            )
-        }
-        # Skip interrupt check and done event after error
-        yield {"data": json.dumps({"type": "done"})}
-        return
 
-    # --- Check for interrupts (approval required) ---
+        yield {"type": "done", "timing": timing}
+    finally:
+        # Runs closed mid-stream (client disconnect) count too
+        timer.observe("cancelled")
+
+
+async def _stream_graph_events(
+    graph, input_data, config, session_id: str, session: SessionData | None = None
+):
+    """
+    Shared SSE generator for /messages, /approve, and /reject.
+
+    Token payloads are coalesced into time-windowed batches unless
+    ``settings.sse_token_flush_ms`` is 0; all other events are sent as-is.
+    The run is traced as one ``pear_genius.turn`` span; graph nodes, LLM
+    calls and tool calls are its children.
+    """
+    payloads = _graph_payloads(graph, input_data, config, session_id, session)
+    if settings.sse_token_flush_ms > 0:
+        payloads = batch_tokens(payloads, TokenBatcher())
+    attributes = {"pear_genius.session_id": session_id}
+    if session is not None:
+        attributes["pear_genius.customer_id"] = session.customer_id
+    with start_span("pear_genius.turn", attributes):
+        async for payload in payloads:
+            yield _encode_event(payload)
+
+
+def _admitted_response(priority: int, run, lock: asyncio.Lock) -> EventSourceResponse:
+    """
+    Admit a graph run, or fail fast with 503 when the wait queue is full.
+
+    The run holds the session's turn lock, which is taken before the
+    admission slot: a request for a session that is busy with another turn
+    gives up its ticket and re-enqueues once the lock is free, so it never
+    holds a global slot while waiting on its own session.  If the queue has
+    filled up by then, the stream carries a busy error instead of a 503.
+
+    While the run waits for a slot, the stream carries ``queued`` events with
+    its position.  The slot is released when the stream ends or the client
+    disconnects (the background task covers streams that never started).
+
+    Args:
+        priority: Admission priority (see ``request_priority``)
+        run: Zero-argument async generator producing the run's SSE frames
+        lock: The session's turn lock
+    """
+    controller = get_admission_controller()
     try:
-        graph_state = await graph.aget_state(config)
-        if graph_state and graph_state.tasks:
-            for task in graph_state.tasks:
-                if hasattr(task, "interrupts") and task.interrupts:
-                    for intr in task.interrupts:
-                        interrupt_value = intr.value
-                        if isinstance(interrupt_value, dict) and interrupt_value.get("action") == "approve_tool_calls":
-                            logger.info(
-                                "Approval required event sent",
-                                session_id=session_id,
-                                actions=[a["tool_name"] for a in interrupt_value.get("actions", [])],
-                            )
-                            yield {
-                                "data": json.dumps({
-                                    "type": "approval_required",
-                                    "actions": interrupt_value.get("actions", []),
-                                })
-                            }
-    except Exception as e:
-        logger.warning("Failed to check graph state for interrupts", error=str(e))
+        ticket = controller.enqueue(priority)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=_BUSY_MESSAGE,
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
-    # --- Turn summary log ---
-    turn_duration_ms = round((time.monotonic() - turn_start) * 1000)
-    logger.info(
-        "Stream completed",
-        session_id=session_id,
-        duration_ms=turn_duration_ms,
-        llm_invocations=llm_invocations,
-        tool_calls_count=len(tool_calls),
-        tool_calls=[
-            {"tool": tc["name"], "ms": tc["duration_ms"]}
-            for tc in tool_calls
-        ],
-        response_length=len(accumulated_text),
-    )
+    def release() -> None:
+        if ticket is not None:
+            controller.release(ticket)
 
-    yield {"data": json.dumps({"type": "done"})}
+    async def event_generator():
+        nonlocal ticket
+        try:
+            if lock.locked():
+                release()
+                ticket = None
+            async with lock:
+                if ticket is None:
+                    try:
+                        ticket = controller.enqueue(priority)
+                    except AdmissionRejectedError:
+                        yield _BUSY_FRAME
+                        return
+                async for position in controller.wait(ticket):
+                    yield _encode_event({"type": "queued", "position": position})
+                async for frame in run():
+                    yield frame
+        finally:
+            release()
+
+    return EventSourceResponse(event_generator(), background=BackgroundTask(release))
 
 
 # --- Endpoints ---
@@ -266,6 +632,41 @@ async def health_check():
     return {"status": "ok", "service": "pear-genius"}
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness: 200 once the graph is built and connections are open."""
+    body = {"status": _startup["status"], "phases": _startup["phases"]}
+    if _startup["status"] != "ready":
+        if _startup["error"]:
+            body["error"] = _startup["error"]
+        return JSONResponse(body, status_code=503)
+    return body
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: hot-path histograms plus component counters."""
+    sessions = await (await get_session_store()).stats()
+    cache = get_tool_result_cache().stats()
+    admission = get_admission_controller().stats()
+    limits = (await get_rate_limiter()).stats()
+    coalesced = get_single_flight().stats()["coalesced"]
+    samples = [
+        ("pear_genius_sessions", "gauge", "Stored sessions", sessions["size"]),
+        ("pear_genius_session_evictions_total", "counter", "LRU evictions", sessions["evictions"]),
+        ("pear_genius_session_expirations_total", "counter", "Expired", sessions["expirations"]),
+        ("pear_genius_tool_cache_hits_total", "counter", "Tool cache hits", cache["hits"]),
+        ("pear_genius_tool_cache_misses_total", "counter", "Tool cache misses", cache["misses"]),
+        ("pear_genius_tool_cache_entries", "gauge", "Cached tool results", cache["entries"]),
+        ("pear_genius_tool_calls_coalesced_total", "counter", "Single-flight joins", coalesced),
+        ("pear_genius_runs_active", "gauge", "Graph runs executing", admission["active"]),
+        ("pear_genius_runs_queued", "gauge", "Graph runs awaiting admission", admission["queued"]),
+        ("pear_genius_runs_rejected_total", "counter", "Rejected (503)", admission["rejected"]),
+        ("pear_genius_rate_limited_total", "counter", "Rejected (429)", limits["limited"]),
+    ]
+    return Response(render_metrics() + render_samples(samples), media_type=CONTENT_TYPE)
+
+
 @app.post("/api/chat/sessions", response_model=SessionResponse)
 async def create_session():
     """Create a new chat session with a test customer."""
@@ -278,6 +679,8 @@ async def create_session():
         tier=CustomerTier.PLUS,
     )
 
+    await _rate_limit(customer.customer_id, customer.tier, SESSIONS)
+
     session_id = str(uuid.uuid4())
 
     welcome_message = (
@@ -286,12 +689,16 @@ async def create_session():
         f"and more. How can I assist you today?"
     )
 
-    _sessions[session_id] = SessionData(
-        welcome_message=welcome_message,
-        customer_id=customer.customer_id,
-        customer=customer,
+    store = await get_session_store()
+    SESSIONS_CREATED.inc()
+    await store.put(
+        session_id,
+        SessionData(
+            welcome_message=welcome_message,
+            customer_id=customer.customer_id,
+            customer=customer,
+        ),
     )
-    _evict_sessions()
 
     logger.info(
         "Session created",
@@ -307,9 +714,7 @@ async def create_session():
 @app.get("/api/chat/sessions/{session_id}", response_model=SessionInfoResponse)
 async def get_session(session_id: str):
     """Get session info."""
-    session = _sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    await _require_session(session_id)
 
     graph = await get_shared_graph()
     config = {"configurable": {"thread_id": session_id}}
@@ -337,83 +742,88 @@ async def get_session(session_id: str):
 @app.post("/api/chat/sessions/{session_id}/messages")
 async def send_message(session_id: str, request: SendMessageRequest):
     """Send a message and stream the response via SSE."""
-    session = _sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = await _require_session(session_id)
+    tier = _session_tier(session)
+    await _rate_limit(session.customer_id, tier, MESSAGES)
+    await _rate_limit(session.customer_id, tier, LLM_TOKENS, cost=0)
 
     graph = await get_shared_graph()
     config = {"configurable": {"thread_id": session_id}}
 
     async def event_generator():
-        async with session.lock:
-            is_first = session.is_first_message
-            if is_first:
-                # First message: seed the checkpointer with full AgentState
-                customer = session.customer
-                input_data = AgentState(
-                    session_id=session_id,
-                    customer=customer,
-                    is_authenticated=customer is not None,
-                    messages=[HumanMessage(content=request.message)],
-                )
-                session.is_first_message = False
-            else:
-                # Subsequent messages: pass only new message
-                input_data = {"messages": [HumanMessage(content=request.message)]}
-
-            logger.info(
-                "Turn started",
+        is_first = session.is_first_message
+        if is_first:
+            # First message: seed the checkpointer with full AgentState
+            customer = session.customer
+            input_data = AgentState(
                 session_id=session_id,
-                user_message=request.message[:120],
-                is_first=is_first,
+                customer=customer,
+                is_authenticated=customer is not None,
+                messages=[HumanMessage(content=request.message)],
             )
+            session.is_first_message = False
+            await (await get_session_store()).put(session_id, session)
+        else:
+            # Subsequent messages: pass only new message
+            input_data = {"messages": [HumanMessage(content=request.message)]}
+
+        logger.info(
+            "Turn started",
+            session_id=session_id,
+            user_message=request.message[:120],
+            is_first=is_first,
+        )
 
-            async for sse_event in _stream_graph_events(graph, input_data, config, session_id):
-                yield sse_event
+        async for sse_event in _stream_graph_events(
+            graph, input_data, config, session_id, session
+        ):
+            yield sse_event
 
-    return EventSourceResponse(event_generator())
+    return _admitted_response(request_priority(tier), event_generator, session.lock)
 
 
 @app.post("/api/chat/sessions/{session_id}/approve")
 async def approve_action(session_id: str):
     """Approve pending tool calls and resume the graph."""
-    session = _sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = await _require_session(session_id)
+    await _rate_limit(session.customer_id, _session_tier(session), LLM_TOKENS, cost=0)
 
     graph = await get_shared_graph()
     config = {"configurable": {"thread_id": session_id}}
 
     async def event_generator():
-        async with session.lock:
-            logger.info("User approved action", session_id=session_id)
-            input_data = Command(resume={"approved": True})
+        logger.info("User approved action", session_id=session_id)
+        await _observe_approval_wait(graph, config)
+        input_data = Command(resume={"approved": True})
 
-            async for sse_event in _stream_graph_events(graph, input_data, config, session_id):
-                yield sse_event
+        async for sse_event in _stream_graph_events(
+            graph, input_data, config, session_id, session
+        ):
+            yield sse_event
 
-    return EventSourceResponse(event_generator())
+    return _admitted_response(request_priority(None, resume=True), event_generator, session.lock)
 
 
 @app.post("/api/chat/sessions/{session_id}/reject")
 async def reject_action(session_id: str):
     """Reject pending tool calls and resume the graph."""
-    session = _sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = await _require_session(session_id)
+    await _rate_limit(session.customer_id, _session_tier(session), LLM_TOKENS, cost=0)
 
     graph = await get_shared_graph()
     config = {"configurable": {"thread_id": session_id}}
 
     async def event_generator():
-        async with session.lock:
-            logger.info("User rejected action", session_id=session_id)
-            input_data = Command(resume={"approved": False})
+        logger.info("User rejected action", session_id=session_id)
+        await _observe_approval_wait(graph, config)
+        input_data = Command(resume={"approved": False})
 
-            async for sse_event in _stream_graph_events(graph, input_data, config, session_id):
-                yield sse_event
+        async for sse_event in _stream_graph_events(
+            graph, input_data, config, session_id, session
+        ):
+            yield sse_event
 
-    return EventSourceResponse(event_generator())
+    return _admitted_response(request_priority(None, resume=True), event_generator, session.lock)
 
 
 # --- Server Entry Point ---
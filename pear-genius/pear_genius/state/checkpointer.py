@@ -0,0 +1,210 @@
+"""Checkpointer backends for the Pear Genius graph.
+
+The checkpointer holds every thread's graph state (messages, interrupts,
+pending writes).  Two backends are available, selected via
+``settings.checkpointer_backend``:
+
+- ``memory``: LangGraph's ``MemorySaver`` — per-process, lost on restart.
+  Threads can be deleted in time proportional to their own size (see
+  ``ThreadIndexedMemorySaver``), which matters once evicted sessions purge
+  their threads.
+- ``sqlite``: an embedded SQLite database in WAL mode, shared by every
+  uvicorn worker on the host and durable across restarts.
+
+Write latency is kept off the streaming path by running the graph with
+``settings.checkpoint_durability`` (``"async"`` by default), which lets
+LangGraph persist a step's checkpoint while the next step is executing.
+"""
+
+from collections import defaultdict
+from typing import Any
+
+import aiosqlite
+import structlog
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+
+class ThreadIndexedMemorySaver(MemorySaver):
+    """MemorySaver whose ``delete_thread`` only touches the thread's own keys.
+
+    ``MemorySaver.delete_thread`` scans the pending writes and channel blobs
+    of every thread in the process, so purging one evicted session costs
+    time proportional to all live conversations.  Writes are keyed by
+    checkpoint, which the thread's storage already lists; blob keys are
+    recorded per thread as checkpoints are put.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._blob_keys: defaultdict[str, set[tuple[str, str, str, str | int | float]]] = (
+            defaultdict(set)
+        )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        self._blob_keys[thread_id].update(
+            (thread_id, checkpoint_ns, channel, version)
+            for channel, version in new_versions.items()
+        )
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints, pending writes and blobs of a thread."""
+        for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for key in self._blob_keys.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+
+
+class BoundedAsyncSqliteSaver(AsyncSqliteSaver):
+    """AsyncSqliteSaver that keeps at most ``max_checkpoints`` per thread.
+
+    Every graph step produces a checkpoint, so an unbounded thread grows by
+    several rows per turn.  Only the latest checkpoint is needed to resume a
+    conversation; older ones are pruned (together with their pending writes)
+    every ``prune_every`` puts for the thread.
+    """
+
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        max_checkpoints: int = 20,
+        prune_every: int = 5,
+    ):
+        super().__init__(conn)
+        self.max_checkpoints = max(1, max_checkpoints)
+        self.prune_every = max(1, prune_every)
+        self._puts_since_prune: dict[tuple[str, str], int] = {}
+
+    async def setup(self) -> None:
+        """Create tables, then tune the connection for concurrent workers."""
+        if self.is_setup:
+            return
+        await super().setup()
+        async with self.lock:
+            # WAL is enabled by the base class; NORMAL sync is durable in WAL
+            # mode and avoids an fsync per commit.
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
+            await self.conn.execute("PRAGMA busy_timeout=5000")
+            await self.conn.commit()
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint, pruning the thread's history periodically."""
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+
+        key = (
+            str(config["configurable"]["thread_id"]),
+            config["configurable"]["checkpoint_ns"],
+        )
+        count = self._puts_since_prune.get(key, 0) + 1
+        if count >= self.prune_every:
+            self._puts_since_prune.pop(key, None)
+            await self.aprune_thread(*key)
+        else:
+            self._puts_since_prune[key] = count
+
+        return next_config
+
+    async def aprune_thread(self, thread_id: str, checkpoint_ns: str = "") -> int:
+        """Delete all but the newest ``max_checkpoints`` checkpoints of a thread.
+
+        Returns:
+            Number of checkpoints removed
+        """
+        keep = (
+            "SELECT checkpoint_id FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT ?"
+        )
+        params = (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.max_checkpoints)
+        async with self.lock, self.conn.cursor() as cur:
+            await cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                f"AND checkpoint_id NOT IN ({keep})",
+                params,
+            )
+            removed = cur.rowcount
+            await cur.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+                f"AND checkpoint_id NOT IN ({keep})",
+                params,
+            )
+            await self.conn.commit()
+
+        if removed:
+            logger.debug("Pruned checkpoints", thread_id=thread_id, removed=removed)
+        return removed
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes associated with a thread ID."""
+        await super().adelete_thread(thread_id)
+        for key in [k for k in self._puts_since_prune if k[0] == str(thread_id)]:
+            self._puts_since_prune.pop(key, None)
+
+
+async def create_checkpointer() -> BaseCheckpointSaver[Any]:
+    """
+    Create the checkpointer selected by ``settings.checkpointer_backend``.
+
+    Returns:
+        A ready-to-use checkpoint saver
+
+    Raises:
+        ValueError: If the configured backend is unknown
+    """
+    backend = settings.checkpointer_backend.lower()
+
+    if backend == "memory":
+        logger.info("Using in-memory checkpointer")
+        return ThreadIndexedMemorySaver()
+
+    if backend == "sqlite":
+        conn = await aiosqlite.connect(settings.checkpoint_db_path)
+        saver = BoundedAsyncSqliteSaver(
+            conn,
+            max_checkpoints=settings.checkpoint_max_per_thread,
+        )
+        await saver.setup()
+        logger.info(
+            "Using SQLite checkpointer",
+            path=settings.checkpoint_db_path,
+            max_checkpoints_per_thread=settings.checkpoint_max_per_thread,
+        )
+        return saver
+
+    raise ValueError(f"Unknown checkpointer backend: {settings.checkpointer_backend!r}")
+
+
+async def close_checkpointer(checkpointer: BaseCheckpointSaver[Any] | None) -> None:
+    """Close the checkpointer's database connection, if it has one."""
+    conn = getattr(checkpointer, "conn", None)
+    if isinstance(conn, aiosqlite.Connection):
+        await conn.close()
+        logger.info("SQLite checkpointer closed")
@@ -67,9 +67,16 @@ class AgentState(BaseModel):
     session_id: str = ""
     turn_count: int = 0
 
+    # Rolling summary of turns folded out of `messages` by history compaction
+    conversation_summary: str = ""
+    summary_tokens_saved: int = 0
+
     # Tool execution results (for passing between nodes)
     tool_results: dict[str, Any] = {}
 
+    # Failed tool calls so far, counted by the tools node as results arrive
+    tool_error_count: int = 0
+
     # Flags
     is_authenticated: bool = False
     conversation_complete: bool = False
@@ -0,0 +1,390 @@
+"""Session metadata stores for the Pear Genius API.
+
+A session maps the ID handed to the frontend to its customer and welcome
+message; the conversation itself lives in the checkpointer under the same
+thread ID.  Two backends are available, selected via
+``settings.session_backend``:
+
+- ``memory``: per-process LRU ordered by last access.  Sessions idle for
+  longer than ``settings.session_idle_ttl`` expire, and the least recently
+  used session is evicted beyond ``settings.session_max_sessions``.
+- ``sqlite``: the same policy on an embedded SQLite database in WAL mode,
+  so every uvicorn worker on the host sees the same sessions.
+
+Per-session locks that serialize turns are process-local in both backends.
+Evicted and expired session IDs are passed to the store's ``on_evict``
+callback, which the server uses to purge the matching checkpointer thread;
+a session evicted mid-turn is passed once its turn releases the lock.
+"""
+
+import asyncio
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import aiosqlite
+import structlog
+
+from ..config import settings
+from .conversation import CustomerContext
+
+logger = structlog.get_logger()
+
+
+class SessionData:
+    """Lightweight session metadata. Graph state lives in the checkpointer."""
+
+    __slots__ = (
+        "welcome_message",
+        "customer_id",
+        "customer",
+        "is_first_message",
+        "created_at",
+        "last_access",
+        "lock",
+    )
+
+    def __init__(
+        self,
+        welcome_message: str,
+        customer_id: str,
+        customer: CustomerContext | None = None,
+        *,
+        is_first_message: bool = True,
+        created_at: float | None = None,
+        last_access: float | None = None,
+        lock: asyncio.Lock | None = None,
+    ):
+        now = time.time()
+        self.welcome_message = welcome_message
+        self.customer_id = customer_id
+        self.customer = customer
+        self.is_first_message = is_first_message
+        self.created_at = now if created_at is None else created_at
+        self.last_access = now if last_access is None else last_access
+        self.lock = lock or asyncio.Lock()
+
+
+class SessionStore(ABC):
+    """Session metadata keyed by session ID, bounded by capacity and idle TTL."""
+
+    def __init__(
+        self,
+        max_sessions: int | None = None,
+        idle_ttl: float | None = None,
+        on_evict: Callable[[list[str]], Awaitable[None]] | None = None,
+    ):
+        self.max_sessions = max(1, max_sessions or settings.session_max_sessions)
+        self.idle_ttl = settings.session_idle_ttl if idle_ttl is None else idle_ttl
+        self.on_evict = on_evict
+        # Turn locks are process-local; keep each alive while a session object uses it
+        self._turn_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._deferred: set[asyncio.Task[None]] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, session: SessionData, now: float) -> bool:
+        return self.idle_ttl > 0 and now - session.last_access > self.idle_ttl
+
+    async def _evicted(self, session_ids: list[str]) -> None:
+        """
+        Hand evicted/expired session IDs to ``on_evict``; failures are logged, not raised.
+
+        A session whose turn is still running is handed over only once the
+        turn releases its lock, so its thread is not purged under the graph.
+        """
+        if not session_ids or self.on_evict is None:
+            return
+        idle = []
+        for session_id in session_ids:
+            lock = self._turn_locks.get(session_id)
+            if lock is not None and lock.locked():
+                task = asyncio.create_task(self._evicted_after_turn(session_id, lock))
+                self._deferred.add(task)
+                task.add_done_callback(self._deferred.discard)
+            else:
+                idle.append(session_id)
+        if idle:
+            await self._notify_evicted(idle)
+
+    async def _evicted_after_turn(self, session_id: str, lock: asyncio.Lock) -> None:
+        logger.info("Session evicted mid-turn, deferring hook", session_id=session_id)
+        async with lock:
+            pass
+        await self._notify_evicted([session_id])
+
+    async def _notify_evicted(self, session_ids: list[str]) -> None:
+        if self.on_evict is None:
+            return
+        try:
+            await self.on_evict(session_ids)
+        except Exception as e:
+            logger.warning("Session eviction hook failed", count=len(session_ids), error=str(e))
+
+    @abstractmethod
+    async def get(self, session_id: str) -> SessionData | None:
+        """Get a live session and mark it as used, or None if unknown/expired."""
+
+    @abstractmethod
+    async def put(self, session_id: str, session: SessionData) -> None:
+        """Create or update a session, evicting the least recently used beyond capacity."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Remove a session."""
+
+    @abstractmethod
+    async def size(self) -> int:
+        """Number of stored sessions."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+    async def stats(self) -> dict[str, int]:
+        """Size, capacity, hit/miss and eviction counters."""
+        return {
+            "size": await self.size(),
+            "capacity": self.max_sessions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class InMemorySessionStore(SessionStore):
+    """Per-process LRU: every ``get`` moves the session to the most recent end."""
+
+    def __init__(
+        self,
+        max_sessions: int | None = None,
+        idle_ttl: float | None = None,
+        on_evict: Callable[[list[str]], Awaitable[None]] | None = None,
+    ):
+        super().__init__(max_sessions, idle_ttl, on_evict)
+        self._sessions: OrderedDict[str, SessionData] = OrderedDict()
+
+    async def get(self, session_id: str) -> SessionData | None:
+        session = self._sessions.get(session_id)
+        now = time.time()
+        if session is None or self._expired(session, now):
+            self.misses += 1
+            if session is not None:
+                del self._sessions[session_id]
+                self.expirations += 1
+                logger.info("Session expired", session_id=session_id)
+                await self._evicted([session_id])
+            return None
+        session.last_access = now
+        self._sessions.move_to_end(session_id)
+        self.hits += 1
+        return session
+
+    async def put(self, session_id: str, session: SessionData) -> None:
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        self._turn_locks[session_id] = session.lock
+        await self._evicted(self._evict(time.time()))
+
+    def _evict(self, now: float) -> list[str]:
+        """Drop expired sessions, then the least recently used beyond capacity."""
+        removed = []
+        # Ordered by last access, so expired sessions are all at the front
+        while self._sessions:
+            session_id, oldest = next(iter(self._sessions.items()))
+            if not self._expired(oldest, now):
+                break
+            del self._sessions[session_id]
+            removed.append(session_id)
+            self.expirations += 1
+            logger.info("Session expired", session_id=session_id)
+        while len(self._sessions) > self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            removed.append(evicted_id)
+            self.evictions += 1
+            logger.info("Session evicted", session_id=evicted_id)
+        return removed
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    async def size(self) -> int:
+        return len(self._sessions)
+
+
+class SqliteSessionStore(SessionStore):
+    """Session metadata shared by all workers on the host through SQLite."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        "session_id TEXT PRIMARY KEY, "
+        "customer_id TEXT NOT NULL, "
+        "customer TEXT, "
+        "welcome_message TEXT NOT NULL, "
+        "is_first_message INTEGER NOT NULL, "
+        "created_at REAL NOT NULL, "
+        "last_access REAL NOT NULL)"
+    )
+
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        max_sessions: int | None = None,
+        idle_ttl: float | None = None,
+        on_evict: Callable[[list[str]], Awaitable[None]] | None = None,
+    ):
+        super().__init__(max_sessions, idle_ttl, on_evict)
+        self.conn = conn
+        self._lock = asyncio.Lock()
+
+    async def setup(self) -> None:
+        async with self._lock:
+            await self.conn.execute("PRAGMA journal_mode=WAL")
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
+            await self.conn.execute("PRAGMA busy_timeout=5000")
+            await self.conn.execute(self._SCHEMA)
+            await self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)"
+            )
+            await self.conn.commit()
+
+    def _turn_lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._turn_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._turn_locks[session_id] = lock
+        return lock
+
+    async def get(self, session_id: str) -> SessionData | None:
+        now = time.time()
+        async with self._lock:
+            async with self.conn.execute(
+                "SELECT customer_id, customer, welcome_message, is_first_message, created_at, "
+                "last_access FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ) as cur:
+                row = await cur.fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            customer_id, customer, welcome, is_first, created_at, last_access = row
+            expired = self.idle_ttl > 0 and now - last_access > self.idle_ttl
+            if expired:
+                await self.conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            else:
+                await self.conn.execute(
+                    "UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id)
+                )
+            await self.conn.commit()
+
+        if expired:
+            self.expirations += 1
+            self.misses += 1
+            logger.info("Session expired", session_id=session_id)
+            await self._evicted([session_id])
+            return None
+
+        self.hits += 1
+        return SessionData(
+            welcome_message=welcome,
+            customer_id=customer_id,
+            customer=CustomerContext.model_validate_json(customer) if customer else None,
+            is_first_message=bool(is_first),
+            created_at=created_at,
+            last_access=now,
+            lock=self._turn_lock(session_id),
+        )
+
+    async def put(self, session_id: str, session: SessionData) -> None:
+        now = time.time()
+        customer = session.customer.model_dump_json() if session.customer else None
+        async with self._lock:
+            await self.conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    session.customer_id,
+                    customer,
+                    session.welcome_message,
+                    int(session.is_first_message),
+                    session.created_at,
+                    now,
+                ),
+            )
+            self._turn_locks.setdefault(session_id, session.lock)
+            expired = []
+            if self.idle_ttl > 0:
+                expired = await self._delete_returning(
+                    "DELETE FROM sessions WHERE last_access < ? RETURNING session_id",
+                    (now - self.idle_ttl,),
+                )
+            evicted = await self._delete_returning(
+                "DELETE FROM sessions WHERE session_id IN ("
+                "SELECT session_id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?) "
+                "RETURNING session_id",
+                (self.max_sessions,),
+            )
+            await self.conn.commit()
+
+        self.expirations += len(expired)
+        self.evictions += len(evicted)
+        if expired or evicted:
+            logger.info("Sessions evicted", evicted=len(evicted), expired=len(expired))
+        await self._evicted(expired + evicted)
+
+    async def _delete_returning(self, sql: str, params: tuple[Any, ...]) -> list[str]:
+        async with self.conn.execute(sql, params) as cur:
+            return [row[0] for row in await cur.fetchall()]
+
+    async def delete(self, session_id: str) -> None:
+        async with self._lock:
+            await self.conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            await self.conn.commit()
+
+    async def size(self) -> int:
+        async with self._lock, self.conn.execute("SELECT COUNT(*) FROM sessions") as cur:
+            row = await cur.fetchone()
+        return int(row[0]) if row else 0
+
+    async def close(self) -> None:
+        await self.conn.close()
+
+
+async def create_session_store(
+    on_evict: Callable[[list[str]], Awaitable[None]] | None = None,
+) -> SessionStore:
+    """
+    Create the session store selected by ``settings.session_backend``.
+
+    Args:
+        on_evict: Called with the IDs of evicted or expired sessions
+
+    Raises:
+        ValueError: If the configured backend is unknown
+    """
+    backend = settings.session_backend.lower()
+
+    if backend == "memory":
+        logger.info("Using in-memory session store", max_sessions=settings.session_max_sessions)
+        return InMemorySessionStore(on_evict=on_evict)
+
+    if backend == "sqlite":
+        store = SqliteSessionStore(
+            await aiosqlite.connect(settings.session_db_path), on_evict=on_evict
+        )
+        await store.setup()
+        logger.info(
+            "Using SQLite session store",
+            path=settings.session_db_path,
+            max_sessions=settings.session_max_sessions,
+        )
+        return store
+
+    raise ValueError(f"Unknown session backend: {settings.session_backend!r}")
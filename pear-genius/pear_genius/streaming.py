@@ -0,0 +1,133 @@
+"""Time-windowed token batching for the SSE response stream.
+
+Streaming every LLM chunk as its own SSE event means one JSON encode, one
+network write and one event-loop wakeup per token.  ``batch_tokens`` merges
+consecutive token payloads and releases them once
+``settings.sse_token_flush_ms`` have passed since the first buffered token
+or ``settings.sse_token_flush_bytes`` have accumulated, whichever comes
+first.
+
+The source stream is consumed by its own task and the time window is a
+loop timer, so buffered tokens go out on schedule even while the model
+pauses (e.g. before a tool call), and the response generator wakes once
+per batch rather than once per token.  Any non-token payload (tool,
+approval, error, done) flushes the buffer and is forwarded immediately.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from .config import settings
+from .serialization import get_serializer
+
+_END: dict[str, Any] = {}  # end-of-stream sentinel, compared by identity
+
+
+def sse_frame(payload: dict[str, Any]) -> bytes:
+    """
+    Encode a payload as a complete SSE ``data:`` frame.
+
+    EventSourceResponse writes bytes as-is, so frames built here skip
+    sse-starlette's per-event encoding.  Compact JSON never contains a raw
+    newline, so one ``data:`` line per event is always valid.
+    """
+    return b"data: " + get_serializer().dumpb(payload) + b"\r\n\r\n"
+
+
+class TokenBatcher:
+    """Buffers streamed token text and decides when to flush it."""
+
+    __slots__ = ("window", "max_bytes", "_parts", "_size", "_first_at")
+
+    def __init__(self, *, window_ms: float | None = None, max_bytes: int | None = None):
+        window_ms = settings.sse_token_flush_ms if window_ms is None else window_ms
+        self.window = window_ms / 1000
+        self.max_bytes = settings.sse_token_flush_bytes if max_bytes is None else max_bytes
+        self._parts: list[str] = []
+        self._size = 0
+        self._first_at = 0.0
+
+    @property
+    def empty(self) -> bool:
+        return not self._parts
+
+    def add(self, text: str) -> str | None:
+        """Buffer ``text``; returns the batch to send if a flush threshold was reached."""
+        if not self._parts:
+            self._first_at = time.monotonic()
+        self._parts.append(text)
+        self._size += len(text.encode())
+        if self._size >= self.max_bytes or time.monotonic() - self._first_at >= self.window:
+            return self.flush()
+        return None
+
+    def flush(self) -> str | None:
+        """Return and clear the buffered text, or None if nothing is buffered."""
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        return text
+
+
+async def batch_tokens(
+    payloads: AsyncIterator[dict[str, Any]], batcher: TokenBatcher
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Merge consecutive ``{"type": "token"}`` payloads into time/size-bounded batches.
+
+    Args:
+        payloads: Event payloads in stream order
+        batcher: Buffer holding the flush thresholds
+
+    Yields:
+        The same payloads, with runs of token payloads merged
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    timer: asyncio.TimerHandle | None = None
+
+    def flush() -> None:
+        nonlocal timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        text = batcher.flush()
+        if text:
+            queue.put_nowait({"type": "token", "content": text})
+
+    async def pump() -> None:
+        nonlocal timer
+        try:
+            async for payload in payloads:
+                if payload.get("type") != "token":
+                    flush()
+                    queue.put_nowait(payload)
+                    continue
+                was_empty = batcher.empty
+                text = batcher.add(payload["content"])
+                if text is not None:
+                    flush()
+                    queue.put_nowait({"type": "token", "content": text})
+                elif was_empty:
+                    timer = loop.call_later(batcher.window, flush)
+            flush()
+        finally:
+            queue.put_nowait(_END)
+
+    task = asyncio.create_task(pump())
+    try:
+        while (item := await queue.get()) is not _END:
+            yield item
+        await task  # surface errors raised by the source
+    finally:
+        if timer is not None:
+            timer.cancel()
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
@@ -0,0 +1,106 @@
+"""Per-turn server timing for the SSE ``done`` event.
+
+``TurnTimer`` follows one graph run's event stream and splits its wall time
+into the phases a customer waits on: time to the first streamed token, each
+LLM call (including history summarization) and MCP tool calls.  Tools that
+run concurrently overlap, so tool time is reported twice: ``tool_ms`` is the
+sum of every call's duration and ``tool_wall_ms`` the time during which at
+least one call was in flight; ``tool_overlap_ms`` is what concurrency saved.
+
+All values are integer milliseconds so the summary stays compact on the wire.
+"""
+
+import time
+from typing import Any
+
+from .metrics import TOOL_OVERLAP, TURN_DURATION, TURN_PHASE_DURATION
+
+
+def _union(intervals: list[tuple[float, float]]) -> float:
+    """Total length covered by possibly overlapping (start, end) intervals."""
+    total = 0.0
+    covered_to = float("-inf")
+    for start, end in sorted(intervals):
+        if end <= covered_to:
+            continue
+        total += end - max(start, covered_to)
+        covered_to = end
+    return total
+
+
+def _ms(seconds: float) -> int:
+    return round(seconds * 1000)
+
+
+class TurnTimer:
+    """Collects first-token, LLM and tool timings for one graph run."""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.first_token: float | None = None
+        self.llm_calls: list[float] = []
+        self.tool_calls: list[tuple[float, float]] = []
+        self._llm_started: dict[str, float] = {}
+        self._tools_started: dict[str, float] = {}
+        self._observed = False
+
+    def token(self) -> float | None:
+        """Mark a streamed token; returns the time to first token on the first call."""
+        if self.first_token is not None:
+            return None
+        self.first_token = time.monotonic() - self.started
+        return self.first_token
+
+    def llm_start(self, run_id: str) -> None:
+        self._llm_started[run_id] = time.monotonic()
+
+    def llm_end(self, run_id: str) -> float | None:
+        """Finish an LLM call; returns its duration if its start was seen."""
+        started = self._llm_started.pop(run_id, None)
+        if started is None:
+            return None
+        duration = time.monotonic() - started
+        self.llm_calls.append(duration)
+        return duration
+
+    def tool_start(self, run_id: str) -> None:
+        self._tools_started[run_id] = time.monotonic()
+
+    def tool_end(self, run_id: str) -> float | None:
+        """Finish a tool call (success or error); returns its duration if its start was seen."""
+        started = self._tools_started.pop(run_id, None)
+        if started is None:
+            return None
+        ended = time.monotonic()
+        self.tool_calls.append((started, ended))
+        return ended - started
+
+    def summary(self) -> dict[str, Any]:
+        """Compact timing object: ``total``, ``ttft``, per-call ``llm`` and tool phases."""
+        tool_time = sum(end - start for start, end in self.tool_calls)
+        tool_wall = _union(self.tool_calls)
+        return {
+            "total_ms": _ms(time.monotonic() - self.started),
+            "ttft_ms": None if self.first_token is None else _ms(self.first_token),
+            "llm_ms": [_ms(d) for d in self.llm_calls],
+            "tool_ms": _ms(tool_time),
+            "tool_wall_ms": _ms(tool_wall),
+            "tool_overlap_ms": _ms(tool_time - tool_wall),
+        }
+
+    def observe(self, outcome: str) -> None:
+        """
+        Record the run's duration and phase totals as metrics (once per run).
+
+        Args:
+            outcome: "ok", "error" or "cancelled"
+        """
+        if self._observed:
+            return
+        self._observed = True
+        TURN_DURATION.labels(outcome).observe(time.monotonic() - self.started)
+        TURN_PHASE_DURATION.labels("llm").observe(sum(self.llm_calls))
+        if self.tool_calls:
+            tool_wall = _union(self.tool_calls)
+            TURN_PHASE_DURATION.labels("tools").observe(tool_wall)
+            TOOL_OVERLAP.observe(sum(end - start for start, end in self.tool_calls) - tool_wall)
@@ -7,8 +7,10 @@ from .mcp_client import (
     load_tools_for_category,
     TOOL_CATEGORIES,
 )
+from .catalog import ToolCatalog
 from .registry import (
     get_all_tools,
+    get_tool_catalog,
     get_tools_for_intent,
     get_tools_for_agent,
     list_available_categories,
@@ -20,7 +22,9 @@ __all__ = [
     "load_tools_by_prefix",
     "load_tools_for_category",
     "TOOL_CATEGORIES",
+    "ToolCatalog",
     "get_all_tools",
+    "get_tool_catalog",
     "get_tools_for_intent",
     "get_tools_for_agent",
     "list_available_categories",
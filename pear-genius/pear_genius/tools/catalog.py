@@ -0,0 +1,48 @@
+"""In-memory index of the loaded MCP tool catalog.
+
+The registry builds one ``ToolCatalog`` per ``tools/list`` result (at
+startup and whenever the background refresh sees a change).  Lookups by
+tool name, service prefix (``order-management``) or ``TOOL_CATEGORIES``
+category are dictionary reads; nothing is re-listed, re-filtered or
+re-wrapped per call.
+"""
+
+from langchain_core.tools import BaseTool
+
+from .mcp_client import TOOL_CATEGORIES, get_service_prefix
+
+
+class ToolCatalog:
+    """Immutable index of a tool list by name, service prefix and category."""
+
+    __slots__ = ("tools", "by_name", "by_prefix", "by_category")
+
+    def __init__(self, tools: list[BaseTool]):
+        self.tools = list(tools)
+        self.by_name: dict[str, BaseTool] = {t.name: t for t in self.tools}
+        self.by_prefix: dict[str, list[BaseTool]] = {}
+        for tool in self.tools:
+            self.by_prefix.setdefault(get_service_prefix(tool.name), []).append(tool)
+        # Tools keep their catalog order within a category
+        self.by_category: dict[str, list[BaseTool]] = {
+            category: [t for t in self.tools if get_service_prefix(t.name) in set(prefixes)]
+            for category, prefixes in TOOL_CATEGORIES.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.by_name
+
+    def get(self, name: str) -> BaseTool | None:
+        """Tool by its full name, e.g. ``order-management_getOrder``."""
+        return self.by_name.get(name)
+
+    def for_prefix(self, prefix: str) -> list[BaseTool]:
+        """Tools of one backend service, e.g. ``shipping``."""
+        return self.by_prefix.get(prefix, [])
+
+    def for_category(self, category: str) -> list[BaseTool]:
+        """Tools of a ``TOOL_CATEGORIES`` category; every tool for unknown categories."""
+        return self.by_category.get(category, self.tools)
@@ -0,0 +1,165 @@
+"""Bounded, per-backend concurrent tool execution for the graph's tools node.
+
+LangGraph's ToolNode runs every tool_call of an AIMessage concurrently with
+no limit.  ``ToolConcurrencyLimiter`` is plugged in as the node's
+``awrap_tool_call`` hook and bounds execution with:
+
+- a process-wide semaphore (``settings.tool_max_concurrency``), shared by all
+  sessions, capping in-flight calls to AgentGateway;
+- one semaphore per backend service, keyed by the tool name's service prefix
+  (the prefixes used in ``TOOL_CATEGORIES``), so a slow backend such as
+  shipping cannot take every gateway slot;
+- a per-session lock for state-changing tools, so writes in one turn run one
+  at a time while the read-only calls around them run concurrently.
+
+One limiter is shared by every graph in the process (``get_tool_limiter``),
+so turns still running on a graph replaced by a catalog refresh and turns on
+its successor count against the same caps and session locks.
+
+Per-call queue and execution time are logged and attached to the resulting
+ToolMessage as ``response_metadata["timing"]``.
+"""
+
+import asyncio
+import functools
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+from ..config import settings
+from .mcp_client import get_service_prefix
+
+logger = structlog.get_logger()
+
+ToolResult = ToolMessage | Command[Any]
+Execute = Callable[[ToolCallRequest], Awaitable[ToolResult]]
+
+
+class ToolConcurrencyLimiter:
+    """Global and per-service concurrency caps for MCP tool calls."""
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int | None = None,
+        service_limits: dict[str, int] | None = None,
+        default_service_limit: int | None = None,
+        serial_tools: set[str] | frozenset[str] = frozenset(),
+    ):
+        self.max_concurrency = max_concurrency or settings.tool_max_concurrency
+        self.service_limits = (
+            service_limits if service_limits is not None else settings.tool_service_concurrency
+        )
+        self.default_service_limit = (
+            default_service_limit or settings.tool_default_service_concurrency
+        )
+        self.serial_tools = frozenset(serial_tools)
+
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._services: dict[str, asyncio.Semaphore] = {}
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def _service_semaphore(self, service: str) -> asyncio.Semaphore:
+        """Get (or lazily create) the semaphore for a backend service."""
+        sem = self._services.get(service)
+        if sem is None:
+            limit = self.service_limits.get(service, self.default_service_limit)
+            sem = self._services[service] = asyncio.Semaphore(limit)
+        return sem
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        """Get the write lock for a session (dropped once no call holds it)."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        execute: Execute,
+        *,
+        serial_tools: frozenset[str] | None = None,
+    ) -> ToolResult:
+        """
+        ToolNode ``awrap_tool_call`` hook: run one tool call under the caps.
+
+        ``serial_tools`` overrides the limiter's own set for one node.
+        """
+        name = request.tool_call["name"]
+        service = get_service_prefix(name)
+        queued_at = time.monotonic()
+        if serial_tools is None:
+            serial_tools = self.serial_tools
+
+        if name in serial_tools:
+            session_id = getattr(request.state, "session_id", "") or ""
+            async with self._session_lock(session_id):
+                result, started_at = await self._run_bounded(request, execute, service)
+        else:
+            result, started_at = await self._run_bounded(request, execute, service)
+
+        finished_at = time.monotonic()
+        timing = {
+            "service": service,
+            "queued_ms": round((started_at - queued_at) * 1000),
+            "duration_ms": round((finished_at - started_at) * 1000),
+        }
+        logger.info("Tool call executed", tool=name, **timing)
+
+        if isinstance(result, ToolMessage):
+            result.response_metadata["timing"] = timing
+        return result
+
+    async def _run_bounded(
+        self, request: ToolCallRequest, execute: Execute, service: str
+    ) -> tuple[ToolResult, float]:
+        """Acquire the service then global slot and execute the call."""
+        async with self._service_semaphore(service), self._global:
+            started_at = time.monotonic()
+            return await execute(request), started_at
+
+
+_limiter: ToolConcurrencyLimiter | None = None
+
+
+def get_tool_limiter() -> ToolConcurrencyLimiter:
+    """Get the process-wide tool concurrency limiter."""
+    global _limiter
+    if _limiter is None:
+        _limiter = ToolConcurrencyLimiter()
+    return _limiter
+
+
+def create_tool_node(
+    tools: list[BaseTool],
+    *,
+    serial_tools: set[str] | frozenset[str] = frozenset(),
+    limiter: ToolConcurrencyLimiter | None = None,
+) -> ToolNode:
+    """
+    Create the graph's tools node with bounded per-backend concurrency.
+
+    Args:
+        tools: Tools the node can execute
+        serial_tools: Names of state-changing tools to run one at a time per session
+        limiter: Limiter to run calls under (defaults to the process-wide one)
+
+    Returns:
+        ToolNode wrapped with the limiter
+    """
+    if limiter is None:
+        limiter = get_tool_limiter()
+    hook = functools.partial(limiter.awrap_tool_call, serial_tools=frozenset(serial_tools))
+    return ToolNode(tools, awrap_tool_call=hook)
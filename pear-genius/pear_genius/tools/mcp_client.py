@@ -7,15 +7,22 @@ Includes workarounds for:
   (raised during tool invocation; caught at tool level so the agent can retry)
 """
 
-import json
 from typing import Any
 
 import structlog
-from langchain_core.tools import BaseTool
+from langchain_core.tools import BaseTool, ToolException
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.sessions import StreamableHttpConnection
 import langchain_mcp_adapters.tools as mcp_tools_module
+from mcp.shared.exceptions import McpError
 
 from ..config import settings
+from ..serialization import get_serializer
+from ..tracing import start_span, trace_carrier
+from .mcp_pool import get_mcp_pool, keepalive_http_client
+from .rendering import render_tool_result
+from .result_cache import READ_ONLY_TOOLS, ToolResultCache, get_tool_result_cache
+from .single_flight import get_single_flight
 
 logger = structlog.get_logger()
 
@@ -34,6 +41,10 @@ def _patched_convert_call_tool_result(result: Any) -> tuple[str, Any]:
     The original function only reads "content", missing the actual data.
 
     Returns a tuple of (content_string, structured_data) for content_and_artifact format.
+
+    Raises:
+        ToolException: If the tool reported an error (``isError``), like the
+            original function, so the ToolMessage gets ``status="error"``
     """
     # First try structuredContent if content is empty
     structured = getattr(result, 'structuredContent', None)
@@ -42,7 +53,10 @@ def _patched_convert_call_tool_result(result: Any) -> tuple[str, Any]:
     # If content is empty/None but structuredContent exists, use it
     if (not content or content == []) and structured:
         logger.debug("Using structuredContent from MCP result")
-        content_str = json.dumps(structured, indent=2) if not isinstance(structured, str) else structured
+        content_str = (
+            get_serializer().dumps(structured) if not isinstance(structured, str) else structured
+        )
+        _raise_if_error(result, content_str)
         return (content_str, structured)
 
     # Otherwise, extract content
@@ -59,10 +73,16 @@ def _patched_convert_call_tool_result(result: Any) -> tuple[str, Any]:
         else:
             content_str = str(content)
 
+    _raise_if_error(result, content_str)
     # Return tuple format for content_and_artifact
     return (content_str, structured or content)
 
 
+def _raise_if_error(result: Any, content_str: str) -> None:
+    if getattr(result, "isError", False) is True:
+        raise ToolException(content_str or "MCP tool returned an error with empty content.")
+
+
 def _apply_structured_content_patch():
     """Apply the monkey patch to fix structuredContent handling."""
     global _original_convert_call_tool_result
@@ -96,36 +116,123 @@ _apply_structured_content_patch()
 # ---------------------------------------------------------------------------
 
 
+def _connection_error_result(name: str) -> tuple[str, None]:
+    """Tool result telling the agent a transport error interrupted the call."""
+    # Returned in content_and_artifact format so LangGraph can continue —
+    # the agent sees the error and can retry.
+    return (
+        f"Error: the call to {name} was interrupted by a "
+        f"connection error. Please retry the tool call.",
+        None,
+    )
+
+
+async def _call_pooled(name: str, arguments: dict, fallback, args: tuple) -> tuple[str, Any]:
+    """Execute a tool call on the shared session pool.
+
+    Falls back to the adapter's per-call session when no pooled session is
+    healthy (e.g. the gateway is still coming up).
+
+    Raises:
+        ToolException: If the tool reported an error (``isError``)
+    """
+    pool = await get_mcp_pool(gateway_connection())
+    tool_args = {k: v for k, v in arguments.items() if k != "runtime"}
+    try:
+        result = await pool.call_tool(name, tool_args, meta=trace_carrier() or None)
+    except ConnectionError:
+        return await fallback(*args, **arguments)
+    except McpError:
+        raise
+    except Exception as e:
+        logger.warning("MCP pooled tool call failed", tool=name, error=str(e))
+        return _connection_error_result(name)
+    return _patched_convert_call_tool_result(result)
+
+
 def _make_resilient_tools(tools: list[BaseTool]) -> list[BaseTool]:
-    """Wrap MCP tools so ExceptionGroup from the transport doesn't kill streaming."""
+    """Wrap MCP tools so ExceptionGroup from the transport doesn't kill streaming.
+
+    When ``settings.mcp_pool_enabled`` is set, calls are routed through the
+    persistent session pool instead of opening a session per invocation.
+    When ``settings.tool_cache_enabled`` is set, read-only results are served
+    from the shared result cache and state-changing calls invalidate it.
+    When ``settings.tool_single_flight_enabled`` is set, identical concurrent
+    read-only calls share a single upstream request.
+    When ``settings.tool_rendering_enabled`` is set, structured results are
+    rendered into the LLM context under the tool's ``RenderPolicy``.
+    """
     for tool in tools:
         if tool.coroutine is None:
             continue
         original = tool.coroutine
 
-        async def _resilient(
-            *args, _orig=original, _name=tool.name, **kwargs
-        ):
+        async def _call_tool(span, _name, args, kwargs, _orig=original):
+            cache = get_tool_result_cache() if settings.tool_cache_enabled else None
+            call_key = ToolResultCache.key(_name, kwargs) if _name in READ_ONLY_TOOLS else None
+
+            cacheable = cache is not None and call_key is not None and cache.is_cacheable(_name)
+            if cacheable:
+                cached = cache.get(call_key)
+                if cached is not None:
+                    logger.debug("Tool cache hit", tool=_name)
+                    span.set_attribute("pear_genius.cache_hit", True)
+                    return cached
+                generation = cache.generation(_name)
+
+            async def _invoke():
+                if settings.mcp_pool_enabled:
+                    result = await _call_pooled(_name, kwargs, _orig, args)
+                else:
+                    result = await _orig(*args, **kwargs)
+                if settings.tool_rendering_enabled:
+                    result = render_tool_result(_name, result)
+                return result
+
             try:
-                return await _orig(*args, **kwargs)
+                if call_key is not None and settings.tool_single_flight_enabled:
+                    result = await get_single_flight().do(call_key, _invoke)
+                else:
+                    result = await _invoke()
             except BaseExceptionGroup as eg:
                 logger.warning(
                     "MCP tool call raised ExceptionGroup (transport error)",
                     tool=_name,
                     error=str(eg),
                 )
-                # Return in content_and_artifact format so LangGraph can
-                # continue — the agent sees the error and can retry.
-                return (
-                    f"Error: the call to {_name} was interrupted by a "
-                    f"connection error. Please retry the tool call.",
-                    None,
-                )
+                return _connection_error_result(_name)
+            finally:
+                if cache is not None:
+                    cache.invalidate_for(_name)
+
+            # Only successful structured (JSON) results are cached
+            if cacheable and isinstance(result, tuple) and isinstance(result[1], dict):
+                cache.put(_name, call_key, result, generation=generation)
+            return result
+
+        async def _resilient(*args, _name=tool.name, _call=_call_tool, **kwargs):
+            attributes = {
+                "gen_ai.tool.name": _name,
+                "pear_genius.service": get_service_prefix(_name),
+            }
+            with start_span(f"execute_tool {_name}", attributes) as span:
+                return await _call(span, _name, args, kwargs)
 
         tool.coroutine = _resilient
+        # isError results (raised as ToolException) become error ToolMessages
+        tool.handle_tool_error = True
     return tools
 
 
+def gateway_connection() -> StreamableHttpConnection:
+    """Connection config for AgentGateway's streamable-HTTP MCP endpoint."""
+    return {
+        "transport": "streamable_http",
+        "url": f"{settings.agent_gateway_url}/mcp",
+        "httpx_client_factory": keepalive_http_client,
+    }
+
+
 def create_mcp_client() -> MultiServerMCPClient:
     """
     Create an MCP client configured to connect to AgentGateway.
@@ -136,22 +243,18 @@ def create_mcp_client() -> MultiServerMCPClient:
     Returns:
         MultiServerMCPClient configured for AgentGateway
     """
-    return MultiServerMCPClient(
-        {
-            "agentgateway": {
-                "transport": "streamable_http",
-                "url": f"{settings.agent_gateway_url}/mcp",
-            }
-        }
-    )
+    return MultiServerMCPClient({"agentgateway": gateway_connection()})
 
 
-async def load_mcp_tools(filter_essential: bool = True) -> list[BaseTool]:
+async def load_mcp_tools(
+    filter_essential: bool = True, *, raise_on_error: bool = False
+) -> list[BaseTool]:
     """
     Load MCP tools from AgentGateway.
 
     Args:
         filter_essential: If True, only load essential tools to reduce token usage
+        raise_on_error: Re-raise gateway errors instead of returning an empty list
 
     Returns:
         List of LangChain-compatible tools from the MCP server
@@ -163,7 +266,8 @@ async def load_mcp_tools(filter_essential: bool = True) -> list[BaseTool]:
 
         if filter_essential:
             # Filter to only essential tools to stay under API rate limits
-            tools = [t for t in all_tools if t.name in ESSENTIAL_TOOLS]
+            allowlist = get_essential_tools()
+            tools = [t for t in all_tools if is_essential(t.name, allowlist)]
             logger.info(
                 "Filtered to essential tools",
                 total=len(all_tools),
@@ -181,23 +285,28 @@ async def load_mcp_tools(filter_essential: bool = True) -> list[BaseTool]:
         return tools
     except Exception as e:
         logger.error("Failed to load MCP tools", error=str(e))
+        if raise_on_error:
+            raise
         return []
 
 
 async def load_tools_by_prefix(prefix: str) -> list[BaseTool]:
     """
-    Load MCP tools filtered by name prefix.
+    Get the loaded MCP tools of one backend service.
+
+    Served from the registry's tool catalog; the gateway is only contacted
+    if the catalog has not been loaded yet.
 
     Args:
-        prefix: Tool name prefix to filter by (e.g., "order-management")
+        prefix: Service prefix (e.g., "order-management")
 
     Returns:
-        List of tools matching the prefix
+        List of tools of that service
     """
-    all_tools = await load_mcp_tools()
-    filtered = [t for t in all_tools if t.name.startswith(prefix)]
-    logger.info("Filtered MCP tools", prefix=prefix, count=len(filtered))
-    return filtered
+    from .registry import get_tool_catalog  # registry imports this module
+
+    catalog = await get_tool_catalog()
+    return catalog.for_prefix(prefix)
 
 
 # Tool category mappings for agent routing
@@ -208,11 +317,19 @@ TOOL_CATEGORIES = {
     "account": ["customer-accounts"],
     "product": ["product-catalog", "online-store"],
     "support": ["customer-support"],
+    "store": ["physical-stores", "inventory"],
 }
 
-# Essential tools whitelist for customer support (to reduce token usage)
-# Only these tools will be loaded to stay under API rate limits
-ESSENTIAL_TOOLS = [
+
+def get_service_prefix(tool_name: str) -> str:
+    """'order-management_getOrder' → 'order-management'"""
+    return tool_name.split("_", 1)[0]
+
+
+# Essential tools allowlist for customer support (to reduce token usage)
+# Only these tools will be loaded to stay under API rate limits.
+# Overridden by settings.essential_tools; see get_essential_tools().
+ESSENTIAL_TOOLS = frozenset({
     # Order management
     "order-management_getOrder",
     "order-management_listOrders",
@@ -245,26 +362,30 @@ ESSENTIAL_TOOLS = [
     "physical-stores_getAllStores",
     "physical-stores_getStore",
     "physical-stores_getStoreInventory",
-]
+})
+
+
+def get_essential_tools() -> frozenset[str]:
+    """The configured tool allowlist (``settings.essential_tools`` or the default)."""
+    return frozenset(settings.essential_tools) if settings.essential_tools else ESSENTIAL_TOOLS
+
+
+def is_essential(tool_name: str, allowlist: frozenset[str]) -> bool:
+    """Allowlist check by exact name or service wildcard (``"shipping_*"``)."""
+    return tool_name in allowlist or f"{get_service_prefix(tool_name)}_*" in allowlist
 
 
 async def load_tools_for_category(category: str) -> list[BaseTool]:
     """
-    Load MCP tools for a specific intent category.
+    Get the loaded MCP tools for a specific intent category.
 
     Args:
         category: Intent category (order, warranty, troubleshoot, account, product, support)
 
     Returns:
-        List of tools relevant to the category
+        List of tools relevant to the category (all tools for unknown categories)
     """
-    prefixes = TOOL_CATEGORIES.get(category, [])
-    if not prefixes:
-        return await load_mcp_tools()  # Return all tools for unknown categories
-
-    all_tools = await load_mcp_tools()
-    filtered = [
-        t for t in all_tools if any(t.name.startswith(p) for p in prefixes)
-    ]
-    logger.info("Loaded tools for category", category=category, count=len(filtered))
-    return filtered
+    from .registry import get_tool_catalog  # registry imports this module
+
+    catalog = await get_tool_catalog()
+    return catalog.for_category(category)
@@ -0,0 +1,264 @@
+"""Persistent pool of initialized MCP sessions to AgentGateway.
+
+Without a pool, every tool invocation opens a fresh streamable-HTTP session:
+a new TCP connection, an ``initialize`` handshake, the call itself, and a
+session-termination request.  The pool keeps ``settings.mcp_pool_size``
+sessions open for the life of the process and dispatches each call to the
+least-busy healthy session.  MCP sessions multiplex concurrent requests, so
+sessions are shared rather than checked out exclusively; concurrency is
+bounded upstream by the tools node (see ``tools/concurrency.py``).
+
+Each session is owned by a dedicated task because the MCP transport's
+anyio task groups must be entered and exited in the same task.  Sessions
+that fail a call, exceed ``settings.mcp_pool_call_timeout`` or fail a
+periodic ping are torn down and reconnected with exponential backoff.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import time
+from typing import Any
+
+import anyio
+import httpx
+import structlog
+from langchain_mcp_adapters.sessions import Connection, create_session
+from mcp import ClientSession
+from mcp.types import CallToolResult
+
+from ..config import settings
+from ..tracing import inject_trace_headers
+
+logger = structlog.get_logger()
+
+# Errors that mean the session itself is unusable.  Anything else (notably
+# McpError) was answered over a healthy session and leaves it in the pool.
+_TRANSPORT_ERRORS = (
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    TimeoutError,  # per-call timeout: the health loop never pings a busy session
+    BaseExceptionGroup,  # raised out of the transport's task group
+)
+
+
+def keepalive_http_client(
+    headers: dict[str, str] | None = None,
+    timeout: httpx.Timeout | None = None,
+    auth: httpx.Auth | None = None,
+) -> httpx.AsyncClient:
+    """httpx client factory that keeps gateway connections alive between calls."""
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout or httpx.Timeout(30.0, read=300.0),
+        auth=auth,
+        event_hooks={"request": [inject_trace_headers]},
+        limits=httpx.Limits(
+            max_keepalive_connections=settings.mcp_pool_max_keepalive,
+            keepalive_expiry=settings.mcp_pool_keepalive_expiry,
+        ),
+    )
+
+
+class PooledSession:
+    """One long-lived MCP session, owned and reconnected by its own task."""
+
+    def __init__(self, index: int, connection: Connection):
+        self.index = index
+        self.connection = connection
+        self.session: ClientSession | None = None
+        self.in_flight = 0
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._reconnect = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.session is not None and not self._reconnect.is_set()
+
+    def start(self) -> None:
+        # Fresh context: the owner task outlives whichever request started the pool
+        self._task = asyncio.create_task(
+            self._run(), name=f"mcp-session-{self.index}", context=contextvars.Context()
+        )
+
+    async def wait_ready(self, timeout: float) -> bool:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        return self.healthy
+
+    def mark_broken(self) -> None:
+        """Drop the current session; the owner task will reconnect."""
+        if self.session is not None:
+            self.session = None
+            self._ready.clear()
+            self._reconnect.set()
+
+    async def close(self) -> None:
+        self._closing.set()
+        self._reconnect.set()
+        if self._task is not None:
+            with contextlib.suppress(BaseException):
+                await asyncio.wait_for(self._task, timeout=5)
+
+    async def _run(self) -> None:
+        """Owner loop: open a session, hold it until broken or closing, repeat."""
+        backoff = settings.mcp_pool_reconnect_backoff
+        while not self._closing.is_set():
+            try:
+                async with create_session(self.connection) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._reconnect.clear()
+                    self._ready.set()
+                    backoff = settings.mcp_pool_reconnect_backoff
+                    logger.debug("MCP pooled session connected", index=self.index)
+                    await self._reconnect.wait()
+            except BaseException as e:  # ExceptionGroup from the transport task group
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                logger.warning("MCP pooled session failed", index=self.index, error=str(e))
+            finally:
+                self.session = None
+                self._ready.clear()
+
+            if self._closing.is_set():
+                break
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.mcp_pool_reconnect_max_backoff)
+
+
+class MCPSessionPool:
+    """Fixed-size pool of long-lived MCP sessions with health checks."""
+
+    def __init__(self, connection: Connection, size: int | None = None):
+        self.connection = connection
+        self.size = max(1, size or settings.mcp_pool_size)
+        self._sessions: list[PooledSession] = []
+        self._health_task: asyncio.Task[None] | None = None
+        self.started = False
+
+    async def start(self) -> None:
+        """Open all sessions and start the health-check loop."""
+        if self.started:
+            return
+        started_at = time.monotonic()
+        self._sessions = [PooledSession(i, self.connection) for i in range(self.size)]
+        for pooled in self._sessions:
+            pooled.start()
+        ready = await asyncio.gather(
+            *(s.wait_ready(settings.mcp_pool_connect_timeout) for s in self._sessions)
+        )
+        self._health_task = asyncio.create_task(self._health_loop(), name="mcp-pool-health")
+        self.started = True
+        logger.info(
+            "MCP session pool started",
+            size=self.size,
+            healthy=sum(ready),
+            duration_ms=round((time.monotonic() - started_at) * 1000),
+        )
+
+    async def close(self) -> None:
+        """Close all sessions (terminating them on the gateway)."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_task
+        await asyncio.gather(*(s.close() for s in self._sessions))
+        self._sessions = []
+        self.started = False
+        logger.info("MCP session pool closed")
+
+    @property
+    def healthy_count(self) -> int:
+        return sum(1 for s in self._sessions if s.healthy)
+
+    def _acquire(self) -> PooledSession | None:
+        """Pick the healthy session with the fewest in-flight calls."""
+        healthy = [s for s in self._sessions if s.healthy]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda s: s.in_flight)
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any], meta: dict[str, Any] | None = None
+    ) -> CallToolResult:
+        """
+        Call an MCP tool on a pooled session.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            meta: MCP request ``_meta`` (e.g. W3C trace context)
+
+        Raises:
+            ConnectionError: If no healthy session is available
+            McpError: If the gateway answered with an error (the session is kept)
+            TimeoutError: If the call exceeds ``settings.mcp_pool_call_timeout``
+                (the session is reconnected)
+            Exception: Transport errors from the call (the session is reconnected)
+        """
+        pooled = self._acquire()
+        if pooled is None or pooled.session is None:
+            raise ConnectionError("No healthy MCP session available")
+
+        pooled.in_flight += 1
+        try:
+            async with asyncio.timeout(settings.mcp_pool_call_timeout):
+                return await pooled.session.call_tool(name, arguments, meta=meta)
+        except _TRANSPORT_ERRORS as e:
+            logger.warning(
+                "MCP pooled call failed — reconnecting session",
+                index=pooled.index,
+                tool=name,
+                error=str(e),
+            )
+            pooled.mark_broken()
+            raise
+        finally:
+            pooled.in_flight -= 1
+
+    async def _health_loop(self) -> None:
+        """Ping idle sessions periodically; reconnect the ones that fail."""
+        while True:
+            await asyncio.sleep(settings.mcp_pool_health_interval)
+            for pooled in self._sessions:
+                session = pooled.session
+                if session is None or pooled.in_flight:
+                    continue
+                try:
+                    await asyncio.wait_for(session.send_ping(), settings.mcp_pool_connect_timeout)
+                except BaseException as e:
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+                    logger.warning(
+                        "MCP session health check failed", index=pooled.index, error=str(e)
+                    )
+                    pooled.mark_broken()
+
+
+_pool: MCPSessionPool | None = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_mcp_pool(connection: Connection) -> MCPSessionPool:
+    """Get (or lazily start) the process-wide MCP session pool."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                pool = MCPSessionPool(connection)
+                await pool.start()
+                _pool = pool
+    return _pool
+
+
+async def close_mcp_pool() -> None:
+    """Close the process-wide MCP session pool, if started."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
@@ -3,41 +3,90 @@
 This module provides functions to load MCP tools from AgentGateway
 for use with LangChain/LangGraph agents. Tools are loaded dynamically
 from the MCP server rather than being defined manually.
+
+The cached catalog is kept current by ``ToolCatalogRefresher``, which
+re-lists the gateway's tools in the background and hands a changed
+catalog to a callback (the server rebuilds its graph) before committing it.
 """
 
 import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 
 import structlog
 from langchain_core.tools import BaseTool
 
-from .mcp_client import load_mcp_tools, load_tools_for_category, TOOL_CATEGORIES
+from ..config import settings
+from ..serialization import get_serializer
+from .catalog import ToolCatalog
+from .mcp_client import load_mcp_tools, TOOL_CATEGORIES
 
 logger = structlog.get_logger()
 
-# Cache for loaded tools
-_tools_cache: list[BaseTool] | None = None
+# Indexed catalog of the loaded tools
+_catalog: ToolCatalog | None = None
 _tools_lock = asyncio.Lock()
 
 
-async def get_all_tools(force_refresh: bool = False) -> list[BaseTool]:
+async def get_tool_catalog(force_refresh: bool = False) -> ToolCatalog:
     """
-    Get all available MCP tools from AgentGateway.
+    Get the indexed catalog of MCP tools, loading it on first use.
 
     Args:
         force_refresh: If True, reload tools from the server
 
     Returns:
-        List of all available LangChain tools
+        ToolCatalog with name, service-prefix and category indexes
     """
-    global _tools_cache
+    global _catalog
 
-    if _tools_cache is None or force_refresh:
+    if _catalog is None or force_refresh:
         async with _tools_lock:
-            if _tools_cache is None or force_refresh:
-                _tools_cache = await load_mcp_tools()
-                logger.info("Tools cache populated", count=len(_tools_cache))
+            if _catalog is None or force_refresh:
+                _catalog = ToolCatalog(await load_mcp_tools())
+                logger.info("Tools cache populated", count=len(_catalog))
+
+    return _catalog
+
+
+async def load_tool_catalog() -> ToolCatalog:
+    """
+    Get the tool catalog, loading it from the gateway if it is empty.
+
+    Unlike ``get_tool_catalog``, gateway errors are raised and an empty tool
+    list is not cached, so startup can retry until the tools are available.
+
+    Returns:
+        A non-empty ToolCatalog
+
+    Raises:
+        ConnectionError: If the gateway listed no tools
+        Exception: Gateway errors
+    """
+    global _catalog
 
-    return _tools_cache
+    async with _tools_lock:
+        if not _catalog:
+            tools = await load_mcp_tools(raise_on_error=True)
+            if not tools:
+                raise ConnectionError("AgentGateway listed no tools")
+            _catalog = ToolCatalog(tools)
+            logger.info("Tools cache populated", count=len(_catalog))
+    return _catalog
+
+
+async def get_all_tools(force_refresh: bool = False) -> list[BaseTool]:
+    """
+    Get all available MCP tools from AgentGateway.
+
+    Args:
+        force_refresh: If True, reload tools from the server
+
+    Returns:
+        List of all available LangChain tools
+    """
+    return (await get_tool_catalog(force_refresh)).tools
 
 
 async def get_tools_for_intent(intent: str) -> list[BaseTool]:
@@ -59,15 +108,17 @@ async def get_tools_for_intent(intent: str) -> list[BaseTool]:
         "account": "account",
         "product": "product",
         "escalate": "support",
+        "store": "store",
         "general": None,  # Use all tools
     }
 
+    catalog = await get_tool_catalog()
     category = intent_to_category.get(intent)
     if category:
-        return await load_tools_for_category(category)
+        return catalog.for_category(category)
 
     # For general intent, return all tools
-    return await get_all_tools()
+    return catalog.tools
 
 
 def get_tools_for_agent(agent_name: str) -> list[BaseTool]:
@@ -117,3 +168,113 @@ def get_service_prefixes_for_category(category: str) -> list[str]:
         List of service prefixes (e.g., ["order-management", "shipping"])
     """
     return TOOL_CATEGORIES.get(category, [])
+
+
+# --- Catalog Refresh ---
+
+
+@dataclass(frozen=True)
+class CatalogDiff:
+    """Tool names added, removed, or with a changed description/schema."""
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    changed: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def _fingerprints(tools: list[BaseTool]) -> dict[str, str]:
+    serializer = get_serializer()
+    return {t.name: serializer.dumps([t.description, t.args], sort_keys=True) for t in tools}
+
+
+def diff_catalogs(old: list[BaseTool], new: list[BaseTool]) -> CatalogDiff:
+    """Compare two tool catalogs by name, description and input schema."""
+    before, after = _fingerprints(old), _fingerprints(new)
+    return CatalogDiff(
+        added=tuple(sorted(after.keys() - before.keys())),
+        removed=tuple(sorted(before.keys() - after.keys())),
+        changed=tuple(sorted(n for n in before.keys() & after.keys() if before[n] != after[n])),
+    )
+
+
+class ToolCatalogRefresher:
+    """
+    Background task that keeps the cached tool catalog in sync with the gateway.
+
+    Every ``settings.tool_refresh_interval`` seconds the tool list is reloaded
+    and diffed against the cache.  A changed catalog is passed to
+    ``on_change`` and committed to the cache only once the callback succeeds,
+    so a failed rebuild is retried on the next refresh.  While the gateway is
+    unreachable (or lists no tools) refreshes are retried with exponential
+    backoff, starting immediately if the process booted without any tools.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[list[BaseTool]], Awaitable[None]],
+        interval: float | None = None,
+    ):
+        self.on_change = on_change
+        self.interval = settings.tool_refresh_interval if interval is None else interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="tool-catalog-refresh")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def refresh_once(self) -> CatalogDiff:
+        """
+        Reload the tool list and apply it if it changed.
+
+        Returns:
+            The catalog diff (falsy when nothing changed)
+
+        Raises:
+            ConnectionError: If the gateway listed no tools
+            Exception: Gateway or ``on_change`` errors
+        """
+        global _catalog
+
+        tools = await load_mcp_tools(raise_on_error=True)
+        if not tools:
+            raise ConnectionError("AgentGateway listed no tools")
+
+        async with _tools_lock:
+            diff = diff_catalogs(_catalog.tools if _catalog else [], tools)
+            if diff:
+                await self.on_change(tools)
+                _catalog = ToolCatalog(tools)
+        if diff:
+            logger.info(
+                "Tool catalog changed",
+                count=len(tools),
+                added=diff.added,
+                removed=diff.removed,
+                changed=diff.changed,
+            )
+        return diff
+
+    async def _run(self) -> None:
+        backoff = settings.tool_refresh_retry_backoff
+        delay = self.interval if _catalog else backoff
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                delay = backoff
+                backoff = min(backoff * 2, settings.tool_refresh_max_backoff)
+                logger.warning("Tool catalog refresh failed", retry_in=delay, error=str(e))
+            else:
+                delay = self.interval
+                backoff = settings.tool_refresh_retry_backoff
@@ -0,0 +1,216 @@
+"""Token-lean rendering of structured tool results for the LLM context.
+
+Tool results stay in the message history for the rest of the conversation
+and are resent to the LLM on every later turn.  List endpoints such as
+``order-management_listOrders`` or ``physical-stores_getAllStores`` return
+far more than the agent needs, so each tool may have a ``RenderPolicy``:
+
+- ``fields``: keys kept on each record; dotted paths select nested keys
+  (``"shipping.trackingNumber"``) and apply to every element of a nested
+  list (``"items.name"``)
+- ``max_rows``: cap on every list of records, followed by an
+  ``"… N more omitted"`` marker
+
+Only the ToolMessage content is reduced; the full payload remains the
+ToolMessage artifact (and is what the approval-description builders read).
+Bytes and estimated tokens saved are tracked per tool in ``RenderStats``.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from ..serialization import get_serializer
+
+logger = structlog.get_logger()
+
+# Same heuristic as langchain's count_tokens_approximately
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class RenderPolicy:
+    """How one tool's structured result is rendered into the LLM context."""
+
+    fields: tuple[str, ...] = ()
+    max_rows: int | None = None
+
+
+_ORDER_SUMMARY_FIELDS = (
+    "id",
+    "orderNumber",
+    "type",
+    "status",
+    "createdAt",
+    "total",
+    "currency",
+    # Item identifiers are the arguments of createReturn and product lookups
+    "items.id",
+    "items.itemId",
+    "items.lineId",
+    "items.productId",
+    "items.sku",
+    "items.name",
+    "items.quantity",
+    "items.status",
+    "shipping.carrier",
+    "shipping.trackingNumber",
+    "shipping.estimatedDelivery",
+)
+
+RENDER_POLICIES: dict[str, RenderPolicy] = {
+    "order-management_listOrders": RenderPolicy(fields=_ORDER_SUMMARY_FIELDS, max_rows=10),
+    "shipping_listShipments": RenderPolicy(
+        fields=("id", "orderId", "status", "carrier", "trackingNumber", "estimatedDelivery"),
+        max_rows=10,
+    ),
+    "physical-stores_getAllStores": RenderPolicy(
+        fields=("id", "name", "type", "status", "address", "phone", "features"),
+        max_rows=25,
+    ),
+    "product-support_searchArticles": RenderPolicy(
+        fields=("id", "title", "summary", "category", "applicableProducts"),
+        max_rows=10,
+    ),
+    "product-support_listFAQs": RenderPolicy(
+        fields=("id", "question", "shortAnswer", "category"),
+        max_rows=15,
+    ),
+    "customer-accounts_listDevices": RenderPolicy(max_rows=20),
+}
+
+
+def project(record: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """
+    Keep only ``fields`` (dotted paths) of a record.
+
+    Args:
+        record: Source record (not modified)
+        fields: Top-level keys or dotted paths into nested dicts/lists
+
+    Returns:
+        New dict with the selected keys, in source order
+    """
+    nested: dict[str, list[str]] = {}
+    whole: set[str] = set()
+    for path in fields:
+        head, _, rest = path.partition(".")
+        if rest:
+            nested.setdefault(head, []).append(rest)
+        else:
+            whole.add(head)
+
+    out = {}
+    for key, value in record.items():
+        if key in whole:
+            out[key] = value
+        elif key in nested:
+            sub = tuple(nested[key])
+            if isinstance(value, dict):
+                out[key] = project(value, sub)
+            elif isinstance(value, list):
+                out[key] = [project(v, sub) if isinstance(v, dict) else v for v in value]
+    return out
+
+
+def _render_rows(rows: list[Any], policy: RenderPolicy) -> list[Any]:
+    """Project and cap a list of records."""
+    shown = rows if policy.max_rows is None else rows[: policy.max_rows]
+    if policy.fields:
+        # A record with none of the fields is kept whole rather than emptied
+        shown = [(project(r, policy.fields) or r) if isinstance(r, dict) else r for r in shown]
+    omitted = len(rows) - len(shown)
+    if omitted > 0:
+        shown = [*shown, f"… {omitted} more omitted"]
+    return shown
+
+
+def apply_policy(data: Any, policy: RenderPolicy) -> Any:
+    """
+    Reduce a structured result according to ``policy``.
+
+    A top-level list, or every list of records directly under a top-level
+    object (e.g. ``{"orders": [...], "pagination": {...}}``), is projected and
+    capped; other top-level values are kept.  A single record is projected.
+    """
+    if isinstance(data, list):
+        return _render_rows(data, policy)
+    if not isinstance(data, dict):
+        return data
+
+    has_rows = False
+    out = {}
+    for key, value in data.items():
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            out[key] = _render_rows(value, policy)
+            has_rows = True
+        else:
+            out[key] = value
+    if not has_rows and policy.fields:
+        return project(data, policy.fields) or data
+    return out
+
+
+@dataclass
+class RenderStats:
+    """Cumulative per-tool rendering savings."""
+
+    calls: dict[str, int] = field(default_factory=dict)
+    bytes_full: dict[str, int] = field(default_factory=dict)
+    bytes_rendered: dict[str, int] = field(default_factory=dict)
+
+    def record(self, tool_name: str, full: int, rendered: int) -> None:
+        self.calls[tool_name] = self.calls.get(tool_name, 0) + 1
+        self.bytes_full[tool_name] = self.bytes_full.get(tool_name, 0) + full
+        self.bytes_rendered[tool_name] = self.bytes_rendered.get(tool_name, 0) + rendered
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Per-tool calls, bytes saved and estimated tokens saved."""
+        report = {}
+        for name, calls in self.calls.items():
+            saved = self.bytes_full[name] - self.bytes_rendered[name]
+            report[name] = {
+                "calls": calls,
+                "bytes_saved": saved,
+                "tokens_saved": saved // _CHARS_PER_TOKEN,
+            }
+        return report
+
+
+_stats = RenderStats()
+
+
+def get_render_stats() -> RenderStats:
+    """Get the process-wide rendering statistics."""
+    return _stats
+
+
+def render_tool_result(tool_name: str, result: Any) -> Any:
+    """
+    Re-render a ``(content, artifact)`` tool result under the tool's policy.
+
+    Results without a policy, or whose artifact is not structured data, are
+    returned unchanged.  The artifact is never modified.
+    """
+    policy = RENDER_POLICIES.get(tool_name)
+    if policy is None or not isinstance(result, tuple) or len(result) != 2:
+        return result
+    content, artifact = result
+    if not isinstance(artifact, (dict, list)) or not isinstance(content, str):
+        return result
+
+    rendered = get_serializer().dumps(apply_policy(artifact, policy))
+    full_bytes, rendered_bytes = len(content.encode()), len(rendered.encode())
+    if rendered_bytes >= full_bytes:
+        return result
+
+    _stats.record(tool_name, full_bytes, rendered_bytes)
+    logger.info(
+        "Tool result rendered",
+        tool=tool_name,
+        bytes_full=full_bytes,
+        bytes_rendered=rendered_bytes,
+        tokens_saved=(full_bytes - rendered_bytes) // _CHARS_PER_TOKEN,
+    )
+    return (rendered, artifact)
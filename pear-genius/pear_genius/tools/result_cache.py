@@ -0,0 +1,181 @@
+"""Shared TTL cache for read-only MCP tool results.
+
+Read tools such as ``order-management_getOrder`` or
+``physical-stores_getAllStores`` are called repeatedly, within and across
+sessions, with identical arguments.  Results are cached process-wide, keyed
+by tool name plus canonicalized arguments (path/query/body flattened, keys
+sorted), with a per-tool TTL and an LRU bound on the number of entries.
+
+Only tools listed in ``CACHE_TTLS`` (or ``settings.tool_cache_ttls``) are
+cached, and only successful structured results are stored.  Executing a
+state-changing tool invalidates every cached entry of the services listed
+for it in ``INVALIDATIONS``.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+import structlog
+
+from ..config import settings
+from ..serialization import get_serializer
+
+logger = structlog.get_logger()
+
+# Default TTLs (seconds) for cacheable read-only tools
+CACHE_TTLS: dict[str, float] = {
+    # Order data changes with fulfilment — keep short
+    "order-management_getOrder": 30,
+    "order-management_listOrders": 30,
+    "order-management_lookupOrder": 30,
+    "order-management_getOrderTracking": 60,
+    "order-management_checkReturnEligibility": 60,
+    "order-management_getReturn": 60,
+    "shipping_getShipment": 60,
+    "shipping_trackShipment": 60,
+    "shipping_listShipments": 60,
+    # Warranty, support content and catalog data are slow-changing
+    "product-support_checkWarranty": 300,
+    "product-support_getArticle": 3600,
+    "product-support_searchArticles": 600,
+    "product-support_listFAQs": 3600,
+    "product-catalog_getProduct": 600,
+    "customer-accounts_getProfile": 120,
+    "customer-accounts_listDevices": 120,
+    "customer-accounts_listAddresses": 120,
+    # Stores rarely change; inventory does
+    "physical-stores_getAllStores": 3600,
+    "physical-stores_getStore": 3600,
+    "physical-stores_getStoreInventory": 30,
+    "inventory_getStockBySku": 30,
+}
+
+# Tools without side effects: safe to cache and to coalesce (see single_flight.py)
+READ_ONLY_TOOLS: frozenset[str] = frozenset(CACHE_TTLS)
+
+# State-changing tools → services whose cached results they make stale
+INVALIDATIONS: dict[str, tuple[str, ...]] = {
+    "order-management_cancelOrder": ("order-management", "shipping"),
+    "order-management_createReturn": ("order-management",),
+    "product-support_scheduleRepair": ("product-support", "customer-accounts"),
+}
+
+
+def canonicalize_args(arguments: dict[str, Any]) -> str:
+    """Flatten path/query/body args and serialize them with sorted keys."""
+    flat: dict[str, Any] = {}
+    for key in ("path", "query", "body"):
+        if isinstance(arguments.get(key), dict):
+            flat.update(arguments[key])
+    for k, v in arguments.items():
+        if k not in ("path", "query", "body", "runtime"):
+            flat[k] = v
+    return get_serializer().dumps(flat, sort_keys=True)
+
+
+class ToolResultCache:
+    """LRU + TTL cache of tool results, shared by all sessions in the process."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        ttls: dict[str, float] | None = None,
+    ):
+        self.max_entries = max_entries or settings.tool_cache_max_entries
+        self.ttls = {**CACHE_TTLS, **(ttls if ttls is not None else settings.tool_cache_ttls)}
+        # key → (expires_at, service, result)
+        self._entries: OrderedDict[str, tuple[float, str, Any]] = OrderedDict()
+        # service → invalidation generation; guards against caching a read that
+        # raced with a write to the same service
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return self.ttls.get(tool_name, 0) > 0
+
+    @staticmethod
+    def key(tool_name: str, arguments: dict[str, Any]) -> str:
+        return f"{tool_name}:{canonicalize_args(arguments)}"
+
+    def generation(self, tool_name: str) -> int:
+        """Current invalidation generation of the tool's service."""
+        return self._generations.get(tool_name.split("_", 1)[0], 0)
+
+    def get(self, key: str) -> Any | None:
+        """Return a fresh cached result (refreshing its LRU position), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, tool_name: str, key: str, result: Any, *, generation: int | None = None) -> None:
+        """Store a result with the tool's TTL, evicting the least recently used.
+
+        If ``generation`` is given and the service was invalidated since it was
+        read, the (possibly stale) result is not stored.
+        """
+        ttl = self.ttls.get(tool_name, 0)
+        if ttl <= 0:
+            return
+        service = tool_name.split("_", 1)[0]
+        if generation is not None and self._generations.get(service, 0) != generation:
+            return
+        self._entries[key] = (time.monotonic() + ttl, service, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_for(self, tool_name: str) -> int:
+        """Drop entries made stale by executing ``tool_name``; returns count removed."""
+        services = INVALIDATIONS.get(tool_name)
+        if not services:
+            return 0
+        for service in services:
+            self._generations[service] = self._generations.get(service, 0) + 1
+        stale = [k for k, (_, service, _) in self._entries.items() if service in services]
+        for k in stale:
+            del self._entries[k]
+        self.invalidations += len(stale)
+        if stale:
+            logger.info(
+                "Tool cache invalidated", tool=tool_name, services=services, removed=len(stale)
+            )
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+_cache: ToolResultCache | None = None
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Get the process-wide tool result cache."""
+    global _cache
+    if _cache is None:
+        _cache = ToolResultCache()
+    return _cache
@@ -0,0 +1,119 @@
+"""Single-flight coalescing of identical in-flight tool calls.
+
+When many sessions ask the same thing at once (e.g. store inventory during a
+launch), each would otherwise fire an identical MCP call at the gateway.
+``SingleFlight`` lets concurrent callers with the same key share one
+upstream call: the first caller starts it, later callers wait on it, and
+every waiter receives the same result or exception.
+
+The upstream call runs in its own task, so cancelling one waiter (e.g. a
+client disconnecting mid-stream) does not cancel the call for the others.
+The task is cancelled only when every waiter has gone away; a caller that
+joined a call cancelled this way runs it again.  Only read-only tools are
+coalesced; freshness is unchanged because nothing outlives the in-flight
+call.
+"""
+
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class _Flight:
+    """One in-flight upstream call and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[Any]):
+        self.task = task
+        self.waiters = 0
+
+
+def _cancelling() -> bool:
+    """Whether the current task itself has a pending cancellation."""
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution."""
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` once for all concurrent callers with the same ``key``.
+
+        Raises:
+            Whatever ``fn`` raised, to every waiter
+            asyncio.CancelledError: If this caller is cancelled
+        """
+        while True:
+            flight = self._flights.get(key)
+            if flight is not None and flight.task.cancelled():
+                flight = None
+            joined = flight is not None
+            if flight is None:
+                flight = _Flight(asyncio.ensure_future(fn()))
+                self._flights[key] = flight
+                flight.task.add_done_callback(functools.partial(self._finish, key))
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+                logger.debug(
+                    "Coalesced in-flight tool call", key=key[:120], waiters=flight.waiters + 1
+                )
+
+            flight.waiters += 1
+            try:
+                return await asyncio.shield(flight.task)
+            except asyncio.CancelledError:
+                if joined and flight.task.cancelled() and not _cancelling():
+                    # The call was abandoned by the waiters before us, not by
+                    # this caller: run it again rather than fail it
+                    continue
+                if flight.waiters == 1 and not flight.task.done():
+                    flight.task.cancel()
+                    # Nobody is waiting; later callers start a fresh call
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+                raise
+            finally:
+                flight.waiters -= 1
+
+    def _finish(self, key: str, task: asyncio.Task[Any]) -> None:
+        """Forget a finished flight and mark its exception as retrieved."""
+        if self._flights.get(key) is not None and self._flights[key].task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+
+_single_flight: SingleFlight | None = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group for tool calls."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
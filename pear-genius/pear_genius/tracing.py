@@ -0,0 +1,198 @@
+"""OpenTelemetry tracing for graph runs, graph nodes, LLM calls and MCP tools.
+
+Spans are created unconditionally through the OpenTelemetry API; until a
+tracer provider is installed they are non-recording and cost almost
+nothing.  ``setup_tracing()`` installs one for ``settings.tracing_exporter``:
+
+- ``none`` (default): no provider, spans are dropped
+- ``console``: spans printed to stdout
+- ``file``: one JSON span per line appended to ``settings.tracing_file_path``
+- ``otlp``: OTLP/HTTP export, configured by the standard ``OTEL_EXPORTER_OTLP_*``
+  variables (needs ``opentelemetry-exporter-otlp-proto-http``)
+
+Trace context reaches AgentGateway as W3C ``traceparent``/``tracestate``
+HTTP headers.  Pooled MCP sessions send requests from their own task, so
+the context travels in the call's MCP ``_meta`` and ``inject_trace_headers``
+(an httpx request hook) copies it into the headers.
+
+Install with ``pip install 'pear-genius[tracing]'``; without the
+OpenTelemetry packages every helper here is a no-op.
+"""
+
+import contextlib
+import functools
+import inspect
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import httpx
+import structlog
+
+from .config import settings
+from .serialization import get_serializer
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # optional dependency
+    trace = None  # type: ignore[assignment]
+
+logger = structlog.get_logger()
+
+TRACER_NAME = "pear_genius"
+_TRACE_KEYS = ("traceparent", "tracestate")
+
+_provider = None
+# Trace file and tracer provider, released in reverse order by shutdown_tracing
+_resources = contextlib.ExitStack()
+
+
+class _NoopSpan:
+    """Stand-in span when OpenTelemetry is not installed."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def setup_tracing() -> bool:
+    """
+    Install a tracer provider for ``settings.tracing_exporter`` (idempotent).
+
+    Returns:
+        True if spans are being exported
+    """
+    global _provider
+    exporter_name = settings.tracing_exporter.lower()
+    if _provider is not None:
+        return True
+    if exporter_name == "none":
+        return False
+    if trace is None:
+        logger.warning("Tracing requested but OpenTelemetry is not installed")
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("Tracing requested but opentelemetry-sdk is not installed")
+        return False
+
+    if exporter_name == "console":
+        exporter = ConsoleSpanExporter()
+    elif exporter_name == "file":
+        trace_file = _resources.enter_context(
+            open(settings.tracing_file_path, "a", encoding="utf-8")
+        )
+        exporter = ConsoleSpanExporter(
+            out=trace_file, formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    elif exporter_name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("OTLP tracing requested but the OTLP exporter is not installed")
+            return False
+        exporter = OTLPSpanExporter()
+    else:
+        raise ValueError(f"Unknown tracing exporter: {settings.tracing_exporter!r}")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name})
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    _resources.callback(provider.shutdown)
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    logger.info("Tracing enabled", exporter=exporter_name)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the tracer provider installed by ``setup_tracing``."""
+    global _provider
+    _provider = None
+    _resources.close()
+
+
+@contextlib.contextmanager
+def start_span(name: str, attributes: dict[str, Any] | None = None) -> Iterator[Any]:
+    """
+    Start a span as the current span.
+
+    Exceptions are recorded and mark the span as failed, except LangGraph's
+    ``GraphInterrupt`` (an approval pause, not an error).
+    """
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(
+        name, attributes=attributes, record_exception=False, set_status_on_exception=False
+    ) as span:
+        try:
+            yield span
+        except BaseException as e:
+            if type(e).__name__ == "GraphInterrupt":
+                span.set_attribute("pear_genius.interrupted", True)
+            else:
+                span.record_exception(e)
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+
+
+def traced_node(name: str, node: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a graph node so each run gets a ``graph.node <name>`` span.
+
+    ``functools.wraps`` keeps the node's signature, so LangGraph still
+    injects ``config``/``runtime`` when the node asks for them.
+    """
+    attributes = {"langgraph.node": name}
+
+    if inspect.iscoroutinefunction(node):
+
+        @functools.wraps(node)
+        async def _traced_async(*args: Any, **kwargs: Any) -> Any:
+            with start_span(f"graph.node {name}", attributes):
+                return await node(*args, **kwargs)
+
+        return _traced_async
+
+    @functools.wraps(node)
+    def _traced(*args: Any, **kwargs: Any) -> Any:
+        with start_span(f"graph.node {name}", attributes):
+            return node(*args, **kwargs)
+
+    return _traced
+
+
+def trace_carrier() -> dict[str, str]:
+    """W3C trace context of the current span (empty when there is none)."""
+    if trace is None:
+        return {}
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+async def inject_trace_headers(request: httpx.Request) -> None:
+    """httpx request hook: send the MCP call's trace context as HTTP headers."""
+    if trace is None or "traceparent" in request.headers:
+        return
+    carrier: dict[str, str] = {}
+    if b'"traceparent"' in request.content:
+        # Pooled session: the caller's context travels in params._meta
+        try:
+            meta = get_serializer().loads(request.content)["params"]["_meta"]
+            carrier = {k: meta[k] for k in _TRACE_KEYS if k in meta}
+        except (ValueError, KeyError, TypeError):
+            pass
+    for key, value in (carrier or trace_carrier()).items():
+        request.headers[key] = value
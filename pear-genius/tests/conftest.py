@@ -10,6 +10,28 @@ from pear_genius.state.conversation import (
 )
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-benchmark-baseline",
+        action="store_true",
+        help="Record benchmark timings as the new baseline instead of checking them",
+    )
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        help="Run the timing micro-benchmarks (skipped by default, they are machine-sensitive)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks") or config.getoption("--update-benchmark-baseline"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def mock_anthropic():
     """Mock the ChatAnthropic client."""
@@ -0,0 +1,247 @@
+"""Tests for admission control of graph runs."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pear_genius import server
+from pear_genius.admission import (
+    PRIORITY_RESUME,
+    AdmissionController,
+    AdmissionRejectedError,
+    request_priority,
+)
+from pear_genius.state.conversation import CustomerTier
+from pear_genius.state.sessions import InMemorySessionStore, SessionData
+
+
+class TestRequestPriority:
+    """Tests for the resume > PREMIER > PLUS > STANDARD ordering."""
+
+    def test_order(self):
+        ordered = [
+            request_priority(CustomerTier.STANDARD, resume=True),
+            request_priority(CustomerTier.PREMIER),
+            request_priority(CustomerTier.PLUS),
+            request_priority(CustomerTier.STANDARD),
+        ]
+        assert ordered == sorted(ordered)
+        assert len(set(ordered)) == 4
+        assert ordered[0] == PRIORITY_RESUME
+
+    def test_unknown_customer_is_standard(self):
+        assert request_priority(None) == request_priority(CustomerTier.STANDARD)
+
+
+class TestAdmissionController:
+    """Tests for the concurrency limit and the bounded priority queue."""
+
+    def test_admits_up_to_the_limit(self):
+        controller = AdmissionController(max_concurrent=2, max_queue=4)
+        first, second, third = (controller.enqueue(3) for _ in range(3))
+        assert first.admitted and second.admitted
+        assert not third.admitted
+        assert controller.stats()["active"] == 2
+        assert controller.stats()["queued"] == 1
+
+    def test_full_queue_is_rejected(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=1, retry_after=7)
+        controller.enqueue(3)
+        controller.enqueue(3)
+        with pytest.raises(AdmissionRejectedError) as exc:
+            controller.enqueue(0)
+        assert exc.value.retry_after == 7
+        assert controller.stats()["rejected"] == 1
+
+    def test_release_admits_highest_priority_first(self):
+        """Test that resumes jump the queue and ties are first come, first served."""
+        controller = AdmissionController(max_concurrent=1, max_queue=8)
+        running = controller.enqueue(3)
+        standard = controller.enqueue(request_priority(CustomerTier.STANDARD))
+        plus_a = controller.enqueue(request_priority(CustomerTier.PLUS))
+        plus_b = controller.enqueue(request_priority(CustomerTier.PLUS))
+        resume = controller.enqueue(request_priority(None, resume=True))
+
+        admitted = []
+        current = running
+        for _ in range(4):
+            controller.release(current)
+            current = next(
+                t for t in (standard, plus_a, plus_b, resume) if t.admitted and t not in admitted
+            )
+            admitted.append(current)
+
+        assert admitted == [resume, plus_a, plus_b, standard]
+
+    def test_release_is_idempotent(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=1)
+        ticket = controller.enqueue(3)
+        controller.release(ticket)
+        controller.release(ticket)
+        assert controller.stats()["active"] == 0
+
+    def test_abandoned_waiter_leaves_the_queue(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=2)
+        running = controller.enqueue(3)
+        gone = controller.enqueue(1)
+        waiting = controller.enqueue(3)
+        controller.release(gone)
+        assert controller.position(waiting) == 1
+
+        controller.release(running)
+        assert waiting.admitted
+        assert controller.stats() == {
+            "active": 1,
+            "queued": 0,
+            "admitted": 2,
+            "queued_total": 2,
+            "rejected": 0,
+        }
+
+    async def test_wait_yields_positions_until_admitted(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=4)
+        running = controller.enqueue(3)
+        ahead = controller.enqueue(3)
+        ticket = controller.enqueue(3)
+
+        positions = []
+
+        async def consume():
+            async for position in controller.wait(ticket):
+                positions.append(position)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        controller.release(running)  # ``ahead`` is admitted, ticket moves up
+        await asyncio.sleep(0)
+        controller.release(ahead)
+        await asyncio.wait_for(task, timeout=1)
+
+        assert positions == [2, 1]
+        assert ticket.admitted
+
+    def test_admitted_ticket_has_position_zero(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=1)
+        ticket = controller.enqueue(3)
+        assert controller.position(ticket) == 0
+
+
+class TestAdmissionEndpoints:
+    """Tests for 503 + Retry-After and the queued SSE event."""
+
+    @pytest.fixture(autouse=True)
+    def store(self):
+        store = InMemorySessionStore()
+        asyncio.run(store.put("sess-1", SessionData("Hi", "cust-1")))
+        with (
+            patch.object(server, "_session_store", store),
+            patch.object(server, "get_shared_graph", _no_graph),
+        ):
+            yield store
+
+    def test_full_queue_returns_503_with_retry_after(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=0, retry_after=9)
+        controller.enqueue(0)
+        with patch.object(server, "get_admission_controller", return_value=controller):
+            response = TestClient(server.app).post("/api/chat/sessions/sess-1/approve")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "9"
+
+    def test_unknown_session_is_404_not_queued(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        controller.enqueue(0)
+        with patch.object(server, "get_admission_controller", return_value=controller):
+            response = TestClient(server.app).post("/api/chat/sessions/missing/reject")
+
+        assert response.status_code == 404
+        assert controller.stats()["rejected"] == 0
+
+    async def test_queued_event_precedes_the_run(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=2)
+        running = controller.enqueue(0)
+
+        async def run():
+            yield "frame"
+
+        with patch.object(server, "get_admission_controller", return_value=controller):
+            response = server._admitted_response(3, run, asyncio.Lock())
+
+        frames = []
+
+        async def consume():
+            async for frame in response.body_iterator:
+                frames.append(frame)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        controller.release(running)
+        await asyncio.wait_for(task, timeout=1)
+
+        assert frames == [server._encode_event({"type": "queued", "position": 1}), "frame"]
+        assert controller.stats()["active"] == 0
+
+    async def test_busy_session_does_not_hold_a_slot(self):
+        """Test that a request waiting on its session's running turn frees its slot."""
+        controller = AdmissionController(max_concurrent=1, max_queue=2)
+        lock = asyncio.Lock()
+
+        async def run():
+            yield "frame"
+
+        await lock.acquire()
+        with patch.object(server, "get_admission_controller", return_value=controller):
+            response = server._admitted_response(3, run, lock)
+        assert controller.stats()["active"] == 1
+
+        frames = []
+
+        async def consume():
+            async for frame in response.body_iterator:
+                frames.append(frame)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        assert controller.stats()["active"] == 0
+
+        lock.release()
+        await asyncio.wait_for(task, timeout=1)
+        assert frames == ["frame"]
+        assert controller.stats() == {
+            "active": 0,
+            "queued": 0,
+            "admitted": 2,
+            "queued_total": 0,
+            "rejected": 0,
+        }
+
+    async def test_busy_session_rejected_after_wait_gets_busy_event(self):
+        controller = AdmissionController(max_concurrent=1, max_queue=0)
+        lock = asyncio.Lock()
+
+        async def run():
+            yield "frame"
+
+        await lock.acquire()
+        with patch.object(server, "get_admission_controller", return_value=controller):
+            response = server._admitted_response(3, run, lock)
+
+        frames = []
+
+        async def consume():
+            async for frame in response.body_iterator:
+                frames.append(frame)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        controller.enqueue(0)  # another session takes the freed slot
+        lock.release()
+        await asyncio.wait_for(task, timeout=1)
+
+        assert frames == [server._BUSY_FRAME]
+
+
+async def _no_graph():
+    return None
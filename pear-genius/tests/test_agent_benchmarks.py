@@ -0,0 +1,263 @@
+"""Micro-benchmarks for the agent's per-turn helpers against a stored baseline.
+
+Each helper runs on synthetic histories of 10, 100 and 1000 messages, as
+does one full ``agent`` node pass with an instant LLM (the node's non-LLM
+overhead).  Timings are divided by a fixed pure-Python reference workload
+measured in the same run, so the baseline in ``agent_benchmark_baseline.json``
+is in machine-independent units.  A benchmark fails when it is more than
+``THRESHOLD`` times its baseline, which catches a helper turning quadratic
+long before it shows up in production latency.
+
+Timings depend on the machine and its load, so the benchmarks only run when
+asked for:
+
+    pytest tests/test_agent_benchmarks.py --run-benchmarks
+
+Refresh the baseline after an intentional change with:
+
+    pytest tests/test_agent_benchmarks.py --update-benchmark-baseline
+"""
+
+import contextlib
+import gc
+import json
+import logging
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import structlog
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from pear_genius.agents import agent as agent_module
+from pear_genius.agents.agent import (
+    PearGeniusAgent,
+    _build_action_description,
+    _find_order_in_history,
+    _flatten_args,
+    _has_error,
+    get_last_ai_response,
+)
+from pear_genius.state.conversation import AgentState, CustomerContext, CustomerTier
+
+pytestmark = pytest.mark.benchmark
+
+BASELINE_PATH = Path(__file__).with_name("agent_benchmark_baseline.json")
+THRESHOLD = 3.0
+# Calls this cheap (in reference units) are dominated by timer noise
+NOISE_FLOOR = 0.2
+SIZES = (10, 100, 1000)
+BATCH_SECONDS = 0.005
+REPEATS = 5
+
+CANCEL_CALL = {
+    "name": "order-management_cancelOrder",
+    "args": {"path": {"orderId": "ORD-0"}, "body": {"reason": "changed_mind"}},
+    "id": "call-cancel",
+}
+
+
+def _order(n: int) -> dict:
+    return {
+        "id": f"ORD-{n}",
+        "status": "delivered",
+        "items": [{"id": f"item-{i}", "name": f"PearBook Pro {i}"} for i in range(3)],
+        "pricing": {"total": {"amount": 2499.0, "currency": "USD"}},
+    }
+
+
+def _history(size: int) -> list:
+    """Customer question, tool call, tool result, answer; repeated to ``size`` messages.
+
+    The order the approval card needs is only in the oldest result, so
+    history searches scan everything.
+    """
+    messages = []
+    for turn in range(size // 4 + 1):
+        order = _order(turn)
+        call_id = f"call-{turn}"
+        messages += [
+            HumanMessage(f"Where is my order ORD-{turn}? It has been a while."),
+            AIMessage(
+                "Let me look that up.",
+                tool_calls=[
+                    {
+                        "name": "order-management_getOrder",
+                        "args": {"path": {"orderId": f"ORD-{turn}"}},
+                        "id": call_id,
+                    }
+                ],
+            ),
+            ToolMessage(json.dumps(order), tool_call_id=call_id, artifact=order),
+            AIMessage(f"Your order ORD-{turn} was delivered on Tuesday."),
+        ]
+    return messages[:size]
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    # Like timeit: a collection landing in one batch would swamp cheap calls
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _per_call(fn) -> float:
+    """Best-of-``REPEATS`` seconds per call, batching calls to ~``BATCH_SECONDS``."""
+    with _gc_paused():
+        return _best_per_call(fn)
+
+
+def _best_per_call(fn) -> float:
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= BATCH_SECONDS:
+            break
+        number *= 2
+    best = elapsed
+    for _ in range(REPEATS - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / number
+
+
+async def _per_call_async(fn) -> float:
+    """``_per_call`` for a coroutine function, awaited on the running loop."""
+    number = 1
+    best = float("inf")
+    with _gc_paused():
+        for _ in range(REPEATS + 10):
+            started = time.perf_counter()
+            for _ in range(number):
+                await fn()
+            elapsed = time.perf_counter() - started
+            if elapsed < BATCH_SECONDS:
+                number *= 2
+                continue
+            best = min(best, elapsed / number)
+    return best
+
+
+def _reference_workload() -> None:
+    # Attribute access, string search and small allocations, like the helpers
+    text = "where is my order? it has been a while."
+    sum(1 for i in range(200) if "order" in text and {"i": i}.get("i") is not None)
+
+
+@pytest.fixture(scope="session")
+def reference_unit() -> float:
+    return _per_call(_reference_workload)
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    data = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    yield data
+    if request.config.getoption("--update-benchmark-baseline"):
+        BASELINE_PATH.write_text(json.dumps(dict(sorted(data.items())), indent=2) + "\n")
+
+
+@pytest.fixture
+def check(request, baseline, reference_unit):
+    """Compare a measured time with the baseline (or record it when updating)."""
+
+    def _check(key: str, seconds: float) -> None:
+        units = round(seconds / reference_unit, 3)
+        if request.config.getoption("--update-benchmark-baseline"):
+            baseline[key] = units
+            return
+        if key not in baseline:
+            pytest.skip(f"no baseline for {key}; run with --update-benchmark-baseline")
+        assert units <= max(baseline[key], NOISE_FLOOR) * THRESHOLD, (
+            f"{key}: {units} units vs. baseline {baseline[key]} "
+            f"({units / baseline[key]:.1f}x, limit {THRESHOLD}x)"
+        )
+
+    return _check
+
+
+@pytest.fixture(scope="module")
+def agent():
+    with patch("pear_genius.agents.agent.ChatAnthropic"):
+        agent = PearGeniusAgent()
+    agent.llm_with_tools = AsyncMock()
+    agent.llm_with_tools.ainvoke.return_value = AIMessage("Your order was delivered.")
+    return agent
+
+
+def _state(size: int) -> AgentState:
+    return AgentState(
+        session_id="bench",
+        messages=_history(size),
+        turn_count=size // 4,
+        customer=CustomerContext(
+            customer_id="CUST-1",
+            email="bench@example.com",
+            name="Bench User",
+            tier=CustomerTier.PLUS,
+        ),
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+class TestAgentHelpers:
+    """Per-turn helper cost by history length."""
+
+    def test_check_escalation(self, agent, check, size):
+        state = _state(size)
+        check(f"check_escalation/{size}", _per_call(lambda: agent._check_escalation(state)))
+
+    def test_has_error(self, check, size):
+        """Text scan of every tool result (the fallback when there is no status or artifact)."""
+        contents = [m.content for m in _history(size) if isinstance(m, ToolMessage)]
+        check(f"has_error/{size}", _per_call(lambda: [_has_error(c) for c in contents]))
+
+    def test_build_system_message(self, agent, check, size):
+        state = _state(size)
+        check(
+            f"build_system_message/{size}",
+            _per_call(lambda: agent._build_system_message(state)),
+        )
+
+    def test_find_order_in_history(self, check, size):
+        messages = _history(size)
+        assert _find_order_in_history("ORD-0", messages) is not None
+        check(
+            f"find_order_in_history/{size}",
+            _per_call(lambda: _find_order_in_history("ORD-0", messages)),
+        )
+
+    def test_flatten_args(self, check, size):
+        check(f"flatten_args/{size}", _per_call(lambda: _flatten_args(CANCEL_CALL)))
+
+    def test_build_action_description(self, check, size):
+        messages = _history(size)
+        check(
+            f"build_action_description/{size}",
+            _per_call(lambda: _build_action_description(CANCEL_CALL, messages)),
+        )
+
+    def test_get_last_ai_response(self, check, size):
+        state = _state(size)
+        check(f"get_last_ai_response/{size}", _per_call(lambda: get_last_ai_response(state)))
+
+    async def test_agent_node_pass(self, agent, check, size):
+        """One ``agent`` node pass with an instant LLM: everything but the model call."""
+        state = _state(size)
+        quiet = structlog.wrap_logger(
+            None, wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL)
+        )
+        with patch.object(agent_module, "logger", quiet):
+            seconds = await _per_call_async(lambda: agent.process(state))
+        check(f"agent_node_pass/{size}", seconds)
@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import StructuredTool, ToolException
 
 from pear_genius.state.conversation import (
     AgentState,
@@ -10,15 +11,25 @@ from pear_genius.state.conversation import (
     CustomerTier,
     EscalationReason,
 )
+from pear_genius.metrics import ESCALATIONS
 from pear_genius.agents.agent import (
     PearGeniusAgent,
     get_last_ai_response,
     approval_gate,
     route_after_approval,
     HIGH_RISK_TOOLS,
+    SYSTEM_PROMPT,
+    _cacheable_tool_schemas,
+    _tool_failed,
+    create_agent_graph,
 )
 
 
+def _system_text(msg) -> str:
+    """Join the text blocks of a system message."""
+    return "\n".join(block["text"] for block in msg.content)
+
+
 class TestPearGeniusAgent:
     """Tests for PearGeniusAgent."""
 
@@ -92,10 +103,7 @@ class TestEscalationLogic:
 
     def test_escalate_on_repeated_failures(self, supervisor):
         """Test escalation after repeated tool failures."""
-        state = AgentState(session_id="test")
-        state.messages.append(ToolMessage(content="Error: Tool failed", tool_call_id="1"))
-        state.messages.append(ToolMessage(content="Error: Tool failed again", tool_call_id="2"))
-        state.messages.append(ToolMessage(content="Error: Third failure", tool_call_id="3"))
+        state = AgentState(session_id="test", tool_error_count=3)
 
         should_escalate, reason = supervisor._check_escalation(state)
 
@@ -104,7 +112,7 @@ class TestEscalationLogic:
 
     def test_no_escalate_on_single_failure(self, supervisor):
         """Test no escalation on single tool failure."""
-        state = AgentState(session_id="test")
+        state = AgentState(session_id="test", tool_error_count=1)
         state.messages.append(ToolMessage(content="Error: Tool failed", tool_call_id="1"))
 
         should_escalate, reason = supervisor._check_escalation(state)
@@ -112,6 +120,15 @@ class TestEscalationLogic:
         assert should_escalate is False
         assert reason == ""
 
+    def test_escalation_phrase_is_case_insensitive(self, supervisor):
+        """Test that the phrase matcher ignores case and only reads the latest message."""
+        state = AgentState(session_id="test")
+        state.messages.append(HumanMessage(content="Let me TALK TO A MANAGER"))
+        assert supervisor._check_escalation(state) == (True, "customer_request")
+
+        state.messages.append(HumanMessage(content="Never mind, where is my order?"))
+        assert supervisor._check_escalation(state) == (False, "")
+
     def test_no_escalate_normal_conversation(self, supervisor):
         """Test no escalation for normal conversations."""
         state = AgentState(session_id="test")
@@ -124,6 +141,112 @@ class TestEscalationLogic:
         assert reason == ""
 
 
+    async def test_escalation_counted_once(self, supervisor):
+        """Test that later agent passes of an escalated conversation do not recount it."""
+        supervisor.llm_with_tools = MagicMock()
+        supervisor.llm_with_tools.ainvoke = AsyncMock(return_value=AIMessage("Transferring."))
+        state = AgentState(session_id="test")
+        state.messages.append(HumanMessage(content="I want to speak to a human"))
+        counter = ESCALATIONS.labels("customer_request")
+        before = counter.value
+
+        updates = await supervisor.process(state)
+        assert updates["needs_escalation"] is True
+        state.needs_escalation = True
+        await supervisor.process(state)
+
+        assert counter.value == before + 1
+
+
+class TestToolErrorCounting:
+    """Tests for incremental tool failure detection."""
+
+    def test_status_error(self):
+        assert _tool_failed(ToolMessage("boom", tool_call_id="1", status="error"))
+
+    def test_structured_result_is_not_text_scanned(self):
+        """Test that a structured success mentioning errors is not a failure."""
+        order = {"id": "ORD-1", "notes": "Customer said the old one could not charge"}
+        message = ToolMessage('{"notes": "could not charge"}', tool_call_id="1", artifact=order)
+        assert not _tool_failed(message)
+        message.artifact = {"error": "not found"}
+        assert _tool_failed(message)
+
+    def test_text_fallback(self):
+        assert _tool_failed(ToolMessage("Error: connection reset", tool_call_id="1"))
+        assert not _tool_failed(ToolMessage("Order shipped", tool_call_id="1"))
+
+    async def test_tools_node_counts_failures(self):
+        """Test that failures are counted once, as the tools node produces them."""
+
+        async def fail(**kwargs):
+            raise ToolException("backend unavailable")
+
+        tool = StructuredTool(
+            name="order-management_getOrder",
+            description="Get an order",
+            args_schema={"type": "object", "properties": {}},
+            coroutine=fail,
+            handle_tool_error=True,
+        )
+        calls = [{"name": tool.name, "args": {}, "id": f"c{i}"} for i in range(2)]
+        llm = MagicMock()
+        llm.bind_tools.return_value = llm
+        llm.ainvoke = AsyncMock(
+            side_effect=[AIMessage("", tool_calls=calls), AIMessage("Sorry, try later.")]
+        )
+        with (
+            patch("pear_genius.agents.agent.ChatAnthropic", return_value=llm),
+            patch("pear_genius.agents.compaction.ChatAnthropic"),
+        ):
+            graph = await create_agent_graph(tools=[tool])
+            config = {"configurable": {"thread_id": "t1"}}
+            result = await graph.ainvoke(
+                {"messages": [HumanMessage("Where is my order?")], "session_id": "t1"}, config
+            )
+
+        assert result["tool_error_count"] == 2
+
+    async def test_pooled_gateway_error_is_a_failure(self):
+        """Test that an isError result on the pooled MCP path is an error ToolMessage."""
+        from mcp.types import CallToolResult
+
+        from pear_genius.tools import mcp_client
+
+        tool = StructuredTool(
+            name="order-management_cancelOrder",
+            description="Cancel an order",
+            args_schema={"type": "object", "properties": {"path": {"type": "object"}}},
+            coroutine=AsyncMock(side_effect=AssertionError("pooled path expected")),
+            response_format="content_and_artifact",
+        )
+        pool = MagicMock()
+        pool.call_tool = AsyncMock(
+            return_value=CallToolResult(
+                content=[],
+                structuredContent={"message": "Unable to cancel order: already shipped"},
+                isError=True,
+            )
+        )
+        call = {
+            "name": tool.name,
+            "args": {"path": {"orderId": "ORD-1"}},
+            "id": "c1",
+            "type": "tool_call",
+        }
+        with (
+            patch.object(mcp_client, "get_mcp_pool", AsyncMock(return_value=pool)),
+            patch.object(mcp_client.settings, "mcp_pool_enabled", True),
+            patch.object(mcp_client.settings, "tool_cache_enabled", False),
+        ):
+            [wrapped] = mcp_client._make_resilient_tools([tool])
+            message = await wrapped.ainvoke(call)
+
+        assert message.status == "error"
+        assert "already shipped" in message.content
+        assert _tool_failed(message)
+
+
 class TestGetLastAIResponse:
     """Tests for get_last_ai_response helper function."""
 
@@ -199,7 +322,7 @@ class TestSystemMessageOptimization:
         state = AgentState(session_id="test", customer=customer, turn_count=0)
 
         msg = agent._build_system_message(state)
-        content = msg.content
+        content = _system_text(msg)
 
         assert "Customer Context:" in content
         assert "CUST-001" in content
@@ -217,7 +340,7 @@ class TestSystemMessageOptimization:
         state = AgentState(session_id="test", customer=customer, turn_count=1)
 
         msg = agent._build_system_message(state)
-        content = msg.content
+        content = _system_text(msg)
 
         # Compact format: no "Customer Context:" header, no email
         assert "Customer Context:" not in content
@@ -231,8 +354,66 @@ class TestSystemMessageOptimization:
         state = AgentState(session_id="test", turn_count=0)
 
         msg = agent._build_system_message(state, escalation_reason="customer request")
-        content = msg.content
+        content = _system_text(msg)
 
         assert "ESCALATION REQUIRED" in content
         assert "customer request" in content
         assert "specialist" in content
+
+    def test_conversation_summary_included(self, agent):
+        """Test that the rolling conversation summary is added to the system message."""
+        state = AgentState(
+            session_id="test",
+            turn_count=5,
+            conversation_summary="Customer returned PearBook Pro from ORD-2024-001.",
+        )
+
+        msg = agent._build_system_message(state)
+
+        assert "Conversation Summary" in _system_text(msg)
+        assert "ORD-2024-001" in _system_text(msg)
+
+    def test_static_prompt_is_cached_prefix(self, agent):
+        """Test that SYSTEM_PROMPT is the first block and carries the cache breakpoint."""
+        customer = CustomerContext(
+            customer_id="CUST-001",
+            email="test@example.com",
+            name="Test User",
+            tier=CustomerTier.PLUS,
+        )
+        state = AgentState(session_id="test", customer=customer, turn_count=0)
+
+        static, context = agent._build_system_message(state).content
+
+        assert static["text"] == SYSTEM_PROMPT
+        assert static["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in context
+        assert "CUST-001" in context["text"]
+
+    def test_static_prefix_identical_across_customers(self, agent, plus_customer, premium_customer):
+        """Test that the cached block does not vary with the customer."""
+        first = agent._build_system_message(AgentState(customer=plus_customer)).content[0]
+        second = agent._build_system_message(AgentState(customer=premium_customer)).content[0]
+        assert first == second
+
+
+class TestCacheableToolSchemas:
+    """Tests for prompt-cache-friendly tool binding."""
+
+    def _tool(self, name):
+        tool = MagicMock()
+        tool.name = name
+        return tool
+
+    def test_breakpoint_on_last_sorted_tool(self):
+        """Test that tools are sorted and only the last carries cache_control."""
+        tools = [self._tool("shipping_getShipment"), self._tool("order-management_getOrder")]
+        with patch(
+            "pear_genius.agents.agent.convert_to_anthropic_tool",
+            side_effect=lambda t: {"name": t.name, "input_schema": {}},
+        ):
+            schemas = _cacheable_tool_schemas(tools)
+
+        assert [s["name"] for s in schemas] == ["order-management_getOrder", "shipping_getShipment"]
+        assert "cache_control" not in schemas[0]
+        assert schemas[-1]["cache_control"] == {"type": "ephemeral"}
@@ -0,0 +1,175 @@
+"""Tests for Keycloak token verification caching."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from pear_genius.auth.keycloak import AuthenticationError, KeycloakAuth
+
+ISSUER = "http://keycloak.test/realms/pear"
+
+
+def _key_pair(kid: str) -> tuple[bytes, dict]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public = jwk.construct(public_pem, "RS256").to_dict()
+    return pem, {**public, "kid": kid, "use": "sig"}
+
+
+KEY_A = _key_pair("key-a")
+KEY_B = _key_pair("key-b")
+
+
+def _token(key=KEY_A, sub="cust-010", exp_in=300) -> str:
+    pem, public = key
+    claims = {"sub": sub, "aud": "pear-genius", "iss": ISSUER, "exp": int(time.time()) + exp_in}
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": public["kid"]})
+
+
+class StubKeycloak:
+    """JWKS endpoint served through httpx.MockTransport."""
+
+    def __init__(self, *keys):
+        self.keys = [k[1] for k in keys]
+        self.requests = 0
+        self.fail = False
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"keys": self.keys})
+
+
+def _auth(stub: StubKeycloak, **kwargs) -> KeycloakAuth:
+    auth = KeycloakAuth("http://keycloak.test", "pear", "pear-genius", **kwargs)
+    auth._http = httpx.AsyncClient(transport=httpx.MockTransport(stub.handler))
+    return auth
+
+
+class TestVerifiedTokenCache:
+    """Tests for the verified-token LRU."""
+
+    async def test_repeat_verification_is_cached(self):
+        stub = StubKeycloak(KEY_A)
+        auth = _auth(stub)
+        token = _token()
+
+        with patch("pear_genius.auth.keycloak.jwt.decode", wraps=jwt.decode) as decode:
+            first = await auth.verify_token(token)
+            second = await auth.verify_token(token)
+
+        assert first == second
+        assert first["sub"] == "cust-010"
+        assert decode.call_count == 1
+        assert auth.stats()["token_cache_hits"] == 1
+
+    async def test_entry_expires_at_token_exp(self):
+        auth = _auth(StubKeycloak(KEY_A))
+        token = _token(exp_in=60)
+        await auth.verify_token(token)
+
+        with patch("pear_genius.auth.keycloak.time.time", return_value=time.time() + 61):
+            digest = next(iter(auth._verified))
+            assert auth._cached_claims(digest) is None
+        assert len(auth._verified) == 0
+
+    async def test_cache_is_bounded(self):
+        auth = _auth(StubKeycloak(KEY_A), token_cache_size=2)
+        for sub in ("a", "b", "c"):
+            await auth.verify_token(_token(sub=sub))
+        assert len(auth._verified) == 2
+
+    async def test_invalid_token_not_cached(self):
+        auth = _auth(StubKeycloak(KEY_A))
+        forged = _token(key=_key_pair("key-a"))  # right kid, wrong private key
+
+        for _ in range(2):
+            with pytest.raises(AuthenticationError):
+                await auth.verify_token(forged)
+        assert auth.stats()["verified_tokens_cached"] == 0
+
+
+class TestJWKSCache:
+    """Tests for kid-indexed JWKS caching and refresh."""
+
+    async def test_concurrent_cold_start_fetches_once(self):
+        stub = StubKeycloak(KEY_A)
+        auth = _auth(stub)
+
+        await asyncio.gather(*(auth.verify_token(_token(sub=str(i))) for i in range(10)))
+
+        assert stub.requests == 1
+
+    async def test_unknown_kid_refreshes_for_rotation(self):
+        stub = StubKeycloak(KEY_A)
+        auth = _auth(stub)
+        await auth.verify_token(_token(KEY_A))
+
+        stub.keys.append(KEY_B[1])
+        with patch("pear_genius.auth.keycloak.settings.keycloak_jwks_min_refresh_interval", 0):
+            claims = await auth.verify_token(_token(KEY_B))
+
+        assert claims["sub"] == "cust-010"
+        assert stub.requests == 2
+
+    async def test_unknown_kid_refresh_is_rate_limited(self):
+        """Test that tokens with made-up kids cannot force a JWKS fetch each."""
+        stub = StubKeycloak(KEY_A)
+        auth = _auth(stub)
+        await auth.verify_token(_token(KEY_A))
+
+        for _ in range(3):
+            with pytest.raises(AuthenticationError, match="Unknown signing key"):
+                await auth.verify_token(_token(KEY_B))
+        assert stub.requests == 1
+
+    async def test_ttl_expiry_refetches_and_survives_outage(self):
+        stub = StubKeycloak(KEY_A)
+        auth = _auth(stub, jwks_ttl=0)
+        await auth.verify_token(_token(sub="a"))
+
+        stub.fail = True
+        claims = await auth.verify_token(_token(sub="b"))
+
+        assert claims["sub"] == "b"
+        assert stub.requests == 2
+
+    async def test_outage_retries_at_most_once_per_interval(self):
+        """Test that requests during an outage do not each wait on a new fetch."""
+        stub = StubKeycloak(KEY_A)
+        auth = _auth(stub, jwks_ttl=0)
+        await auth.verify_token(_token(sub="a"))
+
+        stub.fail = True
+        for i in range(5):
+            claims = await auth.verify_token(_token(sub=f"outage-{i}"))
+            assert claims["sub"] == f"outage-{i}"
+        with pytest.raises(AuthenticationError, match="Unknown signing key"):
+            await auth.verify_token(_token(KEY_B))
+        assert stub.requests == 2
+
+        stub.fail = False
+        auth._jwks_retry_at = 0.0  # the retry interval has passed
+        await auth.verify_token(_token(sub="recovered"))
+        assert stub.requests == 3
+
+    async def test_unreachable_keycloak_without_keys_fails(self):
+        stub = StubKeycloak(KEY_A)
+        stub.fail = True
+        with pytest.raises(AuthenticationError, match="Failed to fetch JWKS"):
+            await _auth(stub).verify_token(_token())
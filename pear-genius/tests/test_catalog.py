@@ -0,0 +1,79 @@
+"""Tests for the indexed tool catalog and the essential-tools allowlist."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pear_genius.tools import registry
+from pear_genius.tools.catalog import ToolCatalog
+from pear_genius.tools.mcp_client import (
+    ESSENTIAL_TOOLS,
+    get_essential_tools,
+    is_essential,
+    load_tools_by_prefix,
+    load_tools_for_category,
+)
+
+
+def _tool(name):
+    tool = MagicMock()
+    tool.name = name
+    return tool
+
+
+TOOLS = [
+    _tool("order-management_getOrder"),
+    _tool("shipping_trackShipment"),
+    _tool("order-management_listOrders"),
+    _tool("physical-stores_getStore"),
+]
+
+
+class TestToolCatalog:
+    """Tests for the name, prefix and category indexes."""
+
+    def test_indexes(self):
+        catalog = ToolCatalog(TOOLS)
+
+        assert catalog.get("shipping_trackShipment") is TOOLS[1]
+        assert catalog.get("missing_tool") is None
+        assert "order-management_getOrder" in catalog
+        assert catalog.for_prefix("order-management") == [TOOLS[0], TOOLS[2]]
+        assert catalog.for_prefix("inventory") == []
+
+    def test_category_keeps_catalog_order(self):
+        catalog = ToolCatalog(TOOLS)
+        assert catalog.for_category("order") == TOOLS[:3]
+        assert catalog.for_category("warranty") == []
+
+    def test_unknown_category_returns_all_tools(self):
+        assert ToolCatalog(TOOLS).for_category("general") == TOOLS
+
+    async def test_lookups_do_not_relist_tools(self):
+        """Test that repeated lookups are served from the one loaded catalog."""
+        load = AsyncMock(return_value=TOOLS)
+        with (
+            patch.object(registry, "_catalog", None),
+            patch.object(registry, "load_mcp_tools", load),
+        ):
+            for _ in range(3):
+                await load_tools_for_category("order")
+                await load_tools_by_prefix("shipping")
+                await registry.get_tools_for_intent("store")
+
+        load.assert_awaited_once()
+
+
+class TestEssentialTools:
+    """Tests for the configurable tool allowlist."""
+
+    def test_default_allowlist(self):
+        with patch("pear_genius.tools.mcp_client.settings.essential_tools", set()):
+            assert get_essential_tools() is ESSENTIAL_TOOLS
+
+    def test_settings_override_with_service_wildcard(self):
+        override = {"shipping_*", "order-management_getOrder"}
+        with patch("pear_genius.tools.mcp_client.settings.essential_tools", override):
+            allowlist = get_essential_tools()
+
+        assert is_essential("shipping_listShipments", allowlist)
+        assert is_essential("order-management_getOrder", allowlist)
+        assert not is_essential("order-management_cancelOrder", allowlist)
@@ -0,0 +1,121 @@
+"""Tests for checkpointer backends."""
+
+from unittest.mock import patch
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph
+
+from pear_genius.state.checkpointer import (
+    BoundedAsyncSqliteSaver,
+    ThreadIndexedMemorySaver,
+    create_checkpointer,
+)
+from pear_genius.state.conversation import AgentState
+
+
+def _build_graph(checkpointer):
+    """Build a minimal graph that bumps turn_count on every invocation."""
+    graph = StateGraph(AgentState)
+    graph.add_node("agent", lambda state: {"turn_count": state.turn_count + 1})
+    graph.set_entry_point("agent")
+    graph.add_edge("agent", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+class TestCreateCheckpointer:
+    """Tests for backend selection."""
+
+    @pytest.mark.asyncio
+    async def test_memory_backend(self):
+        """Test that the memory backend returns a MemorySaver."""
+        with patch("pear_genius.state.checkpointer.settings") as mock_settings:
+            mock_settings.checkpointer_backend = "memory"
+            saver = await create_checkpointer()
+        assert isinstance(saver, MemorySaver)
+
+    @pytest.mark.asyncio
+    async def test_sqlite_backend(self, tmp_path):
+        """Test that the sqlite backend creates a bounded WAL-mode saver."""
+        with patch("pear_genius.state.checkpointer.settings") as mock_settings:
+            mock_settings.checkpointer_backend = "sqlite"
+            mock_settings.checkpoint_db_path = str(tmp_path / "checkpoints.db")
+            mock_settings.checkpoint_max_per_thread = 3
+            saver = await create_checkpointer()
+        try:
+            assert isinstance(saver, BoundedAsyncSqliteSaver)
+            assert saver.max_checkpoints == 3
+            async with saver.conn.execute("PRAGMA journal_mode") as cur:
+                assert (await cur.fetchone())[0] == "wal"
+        finally:
+            await saver.conn.close()
+
+    @pytest.mark.asyncio
+    async def test_unknown_backend(self):
+        """Test that an unknown backend raises ValueError."""
+        with patch("pear_genius.state.checkpointer.settings") as mock_settings:
+            mock_settings.checkpointer_backend = "redis"
+            with pytest.raises(ValueError):
+                await create_checkpointer()
+
+
+class TestBoundedSqliteSaver:
+    """Tests for checkpoint persistence and pruning."""
+
+    @pytest.mark.asyncio
+    async def test_state_survives_new_connection(self, tmp_path):
+        """Test that a thread can be resumed from a fresh saver (restart)."""
+        import aiosqlite
+
+        path = str(tmp_path / "checkpoints.db")
+        config = {"configurable": {"thread_id": "thread-1"}}
+
+        async with aiosqlite.connect(path) as conn:
+            graph = _build_graph(BoundedAsyncSqliteSaver(conn))
+            await graph.ainvoke(AgentState(session_id="s1"), config)
+
+        async with aiosqlite.connect(path) as conn:
+            graph = _build_graph(BoundedAsyncSqliteSaver(conn))
+            state = await graph.aget_state(config)
+            assert state.values["turn_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_prunes_old_checkpoints(self, tmp_path):
+        """Test that only max_checkpoints remain per thread after pruning."""
+        import aiosqlite
+
+        config = {"configurable": {"thread_id": "thread-1"}}
+        async with aiosqlite.connect(str(tmp_path / "checkpoints.db")) as conn:
+            saver = BoundedAsyncSqliteSaver(conn, max_checkpoints=2, prune_every=1)
+            graph = _build_graph(saver)
+            for _ in range(4):
+                await graph.ainvoke({"turn_count": 0}, config)
+
+            checkpoints = [c async for c in saver.alist(config)]
+            assert len(checkpoints) == 2
+
+            state = await graph.aget_state(config)
+            assert state.values["turn_count"] == 1
+
+
+class TestThreadIndexedMemorySaver:
+    """Tests for per-thread deletion in the memory backend."""
+
+    @pytest.mark.asyncio
+    async def test_delete_thread_removes_only_that_thread(self):
+        """Test that checkpoints, writes and blobs of one thread are purged."""
+        saver = ThreadIndexedMemorySaver()
+        graph = _build_graph(saver)
+        for thread in ("keep", "drop"):
+            for _ in range(3):
+                await graph.ainvoke({}, {"configurable": {"thread_id": thread}})
+
+        await saver.adelete_thread("drop")
+
+        assert "drop" not in saver.storage
+        assert not [k for k in saver.writes if k[0] == "drop"]
+        assert not [k for k in saver.blobs if k[0] == "drop"]
+        assert "drop" not in saver._blob_keys
+        state = await graph.aget_state({"configurable": {"thread_id": "keep"}})
+        assert state.values["turn_count"] == 3
+        assert [k for k in saver.blobs if k[0] == "keep"]
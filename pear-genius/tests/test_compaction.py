@@ -0,0 +1,120 @@
+"""Tests for rolling conversation summarization."""
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+
+from pear_genius.agents.compaction import (
+    HistoryCompactor,
+    find_compaction_cut,
+    render_transcript,
+)
+from pear_genius.state.conversation import AgentState
+
+
+def _tool_turn(n: int) -> list:
+    """Build one customer turn with a tool call and its result."""
+    return [
+        HumanMessage(content=f"Where is order ORD-{n}?", id=f"h{n}"),
+        AIMessage(
+            content="",
+            id=f"a{n}",
+            tool_calls=[
+                {
+                    "name": "order-management_getOrder",
+                    "args": {"path": {"orderId": f"ORD-{n}"}},
+                    "id": f"tc{n}",
+                }
+            ],
+        ),
+        ToolMessage(
+            content=f'{{"id": "ORD-{n}", "status": "shipped"}}', tool_call_id=f"tc{n}", id=f"t{n}"
+        ),
+        AIMessage(content=f"Order ORD-{n} has shipped.", id=f"r{n}"),
+    ]
+
+
+@pytest.fixture
+def long_history():
+    messages = []
+    for n in range(6):
+        messages.extend(_tool_turn(n))
+    return messages
+
+
+class TestFindCompactionCut:
+    """Tests for choosing a safe cut point."""
+
+    def test_cut_lands_on_human_message(self, long_history):
+        """Test that the kept portion always starts with a HumanMessage."""
+        for keep in range(1, len(long_history)):
+            cut = find_compaction_cut(long_history, keep)
+            if cut:
+                assert isinstance(long_history[cut], HumanMessage)
+
+    def test_cut_never_splits_tool_pairs(self, long_history):
+        """Test that no kept ToolMessage loses its AIMessage tool_call."""
+        cut = find_compaction_cut(long_history, 6)
+        kept = long_history[cut:]
+        call_ids = {tc["id"] for m in kept if isinstance(m, AIMessage) for tc in m.tool_calls}
+        for m in kept:
+            if isinstance(m, ToolMessage):
+                assert m.tool_call_id in call_ids
+
+    def test_no_cut_without_earlier_human_message(self):
+        """Test that a single turn cannot be compacted."""
+        assert find_compaction_cut(_tool_turn(0), 2) == 0
+
+
+class TestHistoryCompactor:
+    """Tests for the compaction graph node."""
+
+    @pytest.fixture
+    def compactor(self):
+        compactor = HistoryCompactor(
+            llm=FakeListChatModel(responses=["Customer asked about orders 0-4."])
+        )
+        compactor.max_messages = 10
+        compactor.max_tokens = 100_000
+        compactor.keep_recent = 4
+        return compactor
+
+    @pytest.mark.asyncio
+    async def test_no_compaction_under_budget(self, compactor):
+        """Test that short histories are left untouched."""
+        state = AgentState(session_id="test", messages=_tool_turn(0))
+        assert await compactor.compact(state) == {}
+
+    @pytest.mark.asyncio
+    async def test_compaction_folds_older_turns(self, compactor, long_history):
+        """Test that older turns are removed and summarized."""
+        state = AgentState(session_id="test", messages=long_history)
+
+        updates = await compactor.compact(state)
+
+        removed = [m.id for m in updates["messages"] if isinstance(m, RemoveMessage)]
+        assert removed == [m.id for m in long_history[:20]]
+        assert updates["conversation_summary"] == "Customer asked about orders 0-4."
+        assert updates["summary_tokens_saved"] > 0
+
+    @pytest.mark.asyncio
+    async def test_compaction_failure_keeps_history(self, long_history):
+        """Test that a summarizer error leaves the history unchanged."""
+
+        class FailingLLM(FakeListChatModel):
+            async def _agenerate(self, *args, **kwargs):
+                raise RuntimeError("overloaded")
+
+        compactor = HistoryCompactor(llm=FailingLLM(responses=[""]))
+        compactor.max_messages = 10
+        state = AgentState(session_id="test", messages=long_history)
+
+        assert await compactor.compact(state) == {}
+
+
+def test_render_transcript_truncates_tool_output():
+    """Test that long tool outputs are clipped in the transcript."""
+    messages = [ToolMessage(content="x" * 5000, tool_call_id="1")]
+    transcript = render_transcript(messages)
+    assert len(transcript) < 2100
+    assert transcript.endswith("[truncated]")
@@ -0,0 +1,166 @@
+"""Tests for local intent classification and per-category tool binding."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from pear_genius.agents.agent import PearGeniusAgent
+from pear_genius.agents.intent import IntentClassifier, covering_category
+from pear_genius.state.conversation import AgentState
+
+TOOL_NAMES = [
+    "order-management_getOrder",
+    "order-management_listOrders",
+    "shipping_trackShipment",
+    "product-support_checkWarranty",
+    "product-catalog_getProduct",
+    "customer-accounts_getProfile",
+    "physical-stores_getStore",
+    "inventory_getStockBySku",
+]
+
+
+def _tool(name):
+    tool = MagicMock()
+    tool.name = name
+    return tool
+
+
+class TestIntentClassifier:
+    """Tests for keyword/IDF intent scoring."""
+
+    @pytest.fixture
+    def classifier(self):
+        return IntentClassifier(min_confidence=0.6)
+
+    @pytest.mark.parametrize(
+        "text, category",
+        [
+            ("Where is my order ORD-2024-0001547?", "order"),
+            ("I want to return my pPhone", "order"),
+            ("Is my PearBook still under warranty?", "warranty"),
+            ("My pPhone battery drains fast and it keeps crashing", "troubleshoot"),
+            ("Is the pPhone 16 in stock at the SF store?", "store"),
+        ],
+    )
+    def test_classifies_clear_requests(self, classifier, text, category):
+        """Test that unambiguous requests map to their category."""
+        intent = classifier.classify([HumanMessage(content=text)])
+        assert intent is not None
+        assert intent.categories[0] == category
+
+    def test_no_keywords_is_low_confidence(self, classifier):
+        """Test that messages without signal fall back (None)."""
+        assert classifier.classify([HumanMessage(content="hi there")]) is None
+
+    def test_follow_up_inherits_previous_topic(self, classifier):
+        """Test that a short follow-up is scored with the previous customer message."""
+        messages = [
+            HumanMessage(content="Can you track my package?"),
+            AIMessage(content="Sure — which order?"),
+            HumanMessage(content="The second one please"),
+        ]
+        assert classifier.classify(messages).categories == ("order",)
+
+    def test_scattered_request_is_low_confidence(self):
+        """Test that a leader with too small a share of the score falls back."""
+        classifier = IntentClassifier(
+            {"a": ("x", "v", "w"), "b": ("y",), "c": ("z",)}, min_confidence=0.7
+        )
+        assert classifier.classify([HumanMessage(content="x v w y z")]) is None
+        assert classifier.classify([HumanMessage(content="x v w")]).categories == ("a",)
+
+
+class TestCoveringCategory:
+    """Tests for choosing the bound tool subset."""
+
+    CANDIDATES = {"order": 3, "warranty": 1, "troubleshoot": 2, "account": 1, "store": 2}
+
+    def test_single_category(self):
+        assert covering_category(("order",), self.CANDIDATES) == "order"
+
+    def test_superset_category_covers_both(self):
+        """Test that warranty+troubleshoot is served by the troubleshoot tools."""
+        assert covering_category(("warranty", "troubleshoot"), self.CANDIDATES) == "troubleshoot"
+
+    def test_unrelated_categories_need_full_set(self):
+        assert covering_category(("order", "account"), self.CANDIDATES) is None
+
+
+class TestAgentToolRouting:
+    """Tests for per-category bound models in PearGeniusAgent."""
+
+    @pytest.fixture
+    def agent(self):
+        with (
+            patch("pear_genius.agents.agent.settings.intent_routing_enabled", True),
+            patch("pear_genius.agents.agent.ChatAnthropic") as chat,
+            patch(
+                "pear_genius.agents.agent.convert_to_anthropic_tool",
+                side_effect=lambda t: {"name": t.name, "input_schema": {}},
+            ),
+        ):
+            chat.return_value.bind_tools.side_effect = lambda schemas: MagicMock(
+                tool_names=[s["name"] for s in schemas]
+            )
+            return PearGeniusAgent(tools=[_tool(n) for n in TOOL_NAMES])
+
+    def test_bound_models_precomputed_per_category(self, agent):
+        """Test that each category's model is bound once, with only its tools."""
+        assert agent.category_llms["order"].tool_names == [
+            "order-management_getOrder",
+            "order-management_listOrders",
+            "shipping_trackShipment",
+        ]
+        assert agent.category_tool_counts["store"] == 2
+        assert len(agent.llm_with_tools.tool_names) == len(TOOL_NAMES)
+
+    def test_confident_intent_selects_subset(self, agent):
+        """Test that a clear request binds only the category's tools."""
+        state = AgentState(messages=[HumanMessage(content="Where is my order?")])
+        llm, intent, count = agent._select_llm(state)
+
+        assert intent == "order"
+        assert count == 3
+        assert llm is agent.category_llms["order"]
+
+    def test_unclear_intent_uses_full_tool_set(self, agent):
+        """Test the fallback to every tool when the classifier is not confident."""
+        state = AgentState(messages=[HumanMessage(content="hello")])
+        llm, intent, count = agent._select_llm(state)
+
+        assert (llm, intent, count) == (agent.llm_with_tools, "all", len(TOOL_NAMES))
+
+    def test_routing_disabled_by_default(self):
+        """Test that routing is opt-in per deployment."""
+        with (
+            patch("pear_genius.agents.agent.ChatAnthropic"),
+            patch("pear_genius.agents.agent.convert_to_anthropic_tool", return_value={}),
+        ):
+            agent = PearGeniusAgent(tools=[_tool(n) for n in TOOL_NAMES])
+
+        assert agent.category_llms == {}
+        state = AgentState(messages=[HumanMessage(content="Where is my order?")])
+        assert agent._select_llm(state)[1] == "all"
+
+    def test_cache_prefix_unchanged_across_categories(self):
+        """Test that by default every intent sends the same cached tool prefix."""
+        with (
+            patch("pear_genius.agents.agent.ChatAnthropic") as chat,
+            patch(
+                "pear_genius.agents.agent.convert_to_anthropic_tool",
+                side_effect=lambda t: {"name": t.name, "input_schema": {}},
+            ),
+        ):
+            chat.return_value.bind_tools.side_effect = lambda schemas: MagicMock(schemas=schemas)
+            agent = PearGeniusAgent(tools=[_tool(n) for n in TOOL_NAMES])
+
+        prefixes = []
+        for text in ["Where is my order?", "What are the store hours?", "hello"]:
+            llm, _, _ = agent._select_llm(AgentState(messages=[HumanMessage(content=text)]))
+            prefixes.append(llm.schemas)
+
+        assert prefixes[0] == prefixes[1] == prefixes[2]
+        assert [s["name"] for s in prefixes[0]] == sorted(TOOL_NAMES)
+        assert prefixes[0][-1]["cache_control"] == {"type": "ephemeral"}
@@ -0,0 +1,86 @@
+"""Tests for the offline load-test harness."""
+
+from unittest.mock import patch
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from pear_genius import loadtest
+from pear_genius.loadtest import (
+    CANCEL_TOOL,
+    LOOKUP_TOOLS,
+    LoadProfile,
+    ScriptedChatModel,
+    percentile,
+    run_load,
+)
+from pear_genius.tools.mcp_pool import MCPSessionPool
+
+INSTANT = LoadProfile(first_token_ms=0, token_ms=0, tool_ms=0, answer_tokens=5)
+
+
+class TestScriptedChatModel:
+    """Tests for the fake streaming LLM."""
+
+    async def test_streams_text_then_tool_calls(self):
+        model = ScriptedChatModel(latency=INSTANT)
+        chunks = [c async for c in model.astream([HumanMessage("Where is my order?")])]
+
+        message = sum(chunks[1:], chunks[0])
+        assert message.content == "Let me look that up."
+        assert [tc["name"] for tc in message.tool_calls] == list(LOOKUP_TOOLS)
+        assert message.usage_metadata["output_tokens"] == 3
+
+    async def test_cancel_and_answer(self):
+        model = ScriptedChatModel(latency=INSTANT)
+
+        cancel = await model.ainvoke([HumanMessage("Please cancel my order")])
+        answer = await model.ainvoke([ToolMessage("{}", tool_call_id="1")])
+
+        assert [tc["name"] for tc in cancel.tool_calls] == [CANCEL_TOOL]
+        assert not answer.tool_calls
+        assert len(answer.content.split()) == INSTANT.answer_tokens
+
+
+class TestRunLoad:
+    """Tests for driving the API end to end."""
+
+    async def test_all_flows_complete(self):
+        report = await run_load(sessions=6, concurrency=3, approval_rate=1.0, profile=INSTANT)
+
+        kinds = sorted(t.kind for t in report.ok_turns())
+        assert kinds == ["approve"] * 3 + ["message"] * 6 + ["reject"] * 3
+        assert len(report.ok_turns()) == len(report.turns)
+        assert all(t.ttft is not None for t in report.ok_turns())
+        assert "turn (approve)" in report.format()
+
+    async def test_tool_calls_go_through_the_mcp_client_layers(self):
+        with patch.object(
+            MCPSessionPool, "call_tool", autospec=True, side_effect=MCPSessionPool.call_tool
+        ) as pooled:
+            report = await run_load(sessions=6, concurrency=3, approval_rate=0.0, profile=INSTANT)
+
+        assert pooled.await_count > 0
+        cache, flights = report.tools["cache"], report.tools["single_flight"]
+        assert cache["hits"] + cache["misses"] == 12
+        assert flights["leaders"] > 0
+        assert report.tools["rendering"]["order-management_listOrders"]["tokens_saved"] > 0
+        assert "Tool cache:" in report.format()
+
+    def test_main_exit_status(self, capsys):
+        argv = ["--sessions", "2", "--first-token-ms", "0", "--token-ms", "0", "--tool-ms", "0"]
+        with (
+            patch.object(loadtest.logging, "basicConfig"),
+            patch.object(loadtest.structlog, "configure"),
+        ):
+            assert loadtest.main(argv) == 0
+        assert "turns/s" in capsys.readouterr().out
+
+
+class TestPercentile:
+    """Tests for nearest-rank percentiles."""
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 95) == 7.0
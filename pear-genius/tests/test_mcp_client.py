@@ -53,7 +53,10 @@ class TestMCPClient:
         mock_tool3 = MagicMock()
         mock_tool3.name = "order-management_list_orders"
 
-        with patch("pear_genius.tools.mcp_client.load_mcp_tools") as mock_load:
+        with (
+            patch("pear_genius.tools.registry.load_mcp_tools") as mock_load,
+            patch("pear_genius.tools.registry._catalog", None),
+        ):
             mock_load.return_value = [mock_tool1, mock_tool2, mock_tool3]
 
             tools = await load_tools_by_prefix("order-management")
@@ -73,7 +76,10 @@ class TestMCPClient:
         mock_tool3 = MagicMock()
         mock_tool3.name = "product-catalog_get_product"
 
-        with patch("pear_genius.tools.mcp_client.load_mcp_tools") as mock_load:
+        with (
+            patch("pear_genius.tools.registry.load_mcp_tools") as mock_load,
+            patch("pear_genius.tools.registry._catalog", None),
+        ):
             mock_load.return_value = [mock_tool1, mock_tool2, mock_tool3]
 
             # Order category includes order-management and shipping
@@ -110,3 +116,131 @@ class TestToolCategories:
 
         prefixes = TOOL_CATEGORIES["account"]
         assert "customer-accounts" in prefixes
+
+    def test_error_result_raises_tool_exception(self):
+        """Test that an isError result is raised, not returned as a successful artifact."""
+        from langchain_core.tools import ToolException
+        from mcp.types import CallToolResult
+
+        from pear_genius.tools.mcp_client import _patched_convert_call_tool_result
+
+        result = CallToolResult(
+            content=[], structuredContent={"message": "Order not found"}, isError=True
+        )
+        with pytest.raises(ToolException, match="Order not found"):
+            _patched_convert_call_tool_result(result)
+
+
+class TestToolResultCache:
+    """Tests for the shared read-only tool result cache."""
+
+    @pytest.fixture
+    def cache(self):
+        from pear_genius.tools.result_cache import ToolResultCache
+
+        return ToolResultCache(max_entries=3, ttls={})
+
+    def test_key_canonicalizes_args(self, cache):
+        """Test that arg nesting and key order don't change the cache key."""
+        a = cache.key("order-management_getOrder", {"path": {"orderId": "ORD-1"}})
+        b = cache.key("order-management_getOrder", {"orderId": "ORD-1"})
+        c = cache.key("order-management_getOrder", {"query": {"b": 1, "a": 2}})
+        d = cache.key("order-management_getOrder", {"query": {"a": 2, "b": 1}})
+        assert a == b
+        assert c == d
+
+    def test_hit_and_miss_counters(self, cache):
+        """Test cache hits and misses are counted."""
+        key = cache.key("order-management_getOrder", {"orderId": "ORD-1"})
+        assert cache.get(key) is None
+        cache.put("order-management_getOrder", key, ("{}", {"id": "ORD-1"}))
+        assert cache.get(key) == ("{}", {"id": "ORD-1"})
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_uncached_tools(self, cache):
+        """Test that write tools are never cacheable."""
+        assert cache.is_cacheable("order-management_getOrder")
+        assert not cache.is_cacheable("order-management_cancelOrder")
+
+    def test_ttl_expiry(self, cache):
+        """Test that entries expire after the tool's TTL."""
+        cache.ttls["order-management_getOrder"] = 0.01
+        key = cache.key("order-management_getOrder", {"orderId": "ORD-1"})
+        cache.put("order-management_getOrder", key, ("{}", {}))
+
+        import time
+
+        time.sleep(0.02)
+        assert cache.get(key) is None
+
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted at capacity."""
+        keys = [cache.key("product-catalog_getProduct", {"productId": str(i)}) for i in range(4)]
+        for key in keys[:3]:
+            cache.put("product-catalog_getProduct", key, ("{}", {}))
+        cache.get(keys[0])  # touch → most recently used
+        cache.put("product-catalog_getProduct", keys[3], ("{}", {}))
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_write_invalidates_related_services(self, cache):
+        """Test that cancelOrder drops order and shipping entries only."""
+        order = cache.key("order-management_getOrder", {"orderId": "ORD-1"})
+        shipment = cache.key("shipping_getShipment", {"shipmentId": "SH-1"})
+        store = cache.key("physical-stores_getAllStores", {})
+        cache.put("order-management_getOrder", order, ("{}", {}))
+        cache.put("shipping_getShipment", shipment, ("{}", {}))
+        cache.put("physical-stores_getAllStores", store, ("{}", {}))
+
+        assert cache.invalidate_for("order-management_cancelOrder") == 2
+        assert cache.get(order) is None
+        assert cache.get(shipment) is None
+        assert cache.get(store) is not None
+
+    def test_read_racing_write_not_cached(self, cache):
+        """Test that a read started before an invalidation is not stored."""
+        generation = cache.generation("order-management_getOrder")
+        cache.invalidate_for("order-management_createReturn")
+        key = cache.key("order-management_getOrder", {"orderId": "ORD-1"})
+        cache.put("order-management_getOrder", key, ("{}", {}), generation=generation)
+        assert cache.get(key) is None
+
+    @pytest.mark.asyncio
+    async def test_wrapped_tool_serves_from_cache(self):
+        """Test that a wrapped MCP tool only hits the backend once for identical args."""
+        from langchain_core.tools import StructuredTool
+
+        from pear_genius.tools import mcp_client
+        from pear_genius.tools.result_cache import ToolResultCache
+
+        calls = []
+
+        async def _backend(**kwargs):
+            calls.append(kwargs)
+            return ('{"id": "ORD-1"}', {"id": "ORD-1"})
+
+        tool = StructuredTool(
+            name="order-management_getOrder",
+            description="Get order",
+            args_schema={"type": "object", "properties": {"path": {"type": "object"}}},
+            coroutine=_backend,
+            response_format="content_and_artifact",
+        )
+        with (
+            patch.object(
+                mcp_client, "get_tool_result_cache", return_value=ToolResultCache(ttls={})
+            ),
+            patch.object(mcp_client.settings, "mcp_pool_enabled", False),
+            patch.object(mcp_client.settings, "tool_cache_enabled", True),
+        ):
+            [wrapped] = mcp_client._make_resilient_tools([tool])
+            first = await wrapped.coroutine(path={"orderId": "ORD-1"})
+            second = await wrapped.coroutine(path={"orderId": "ORD-1"})
+
+        assert first == second
+        assert len(calls) == 1
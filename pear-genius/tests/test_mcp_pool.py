@@ -0,0 +1,168 @@
+"""Tests for the persistent MCP session pool."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import httpx
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import INVALID_PARAMS, CallToolResult, ErrorData, TextContent
+
+from pear_genius.tools.mcp_pool import MCPSessionPool
+
+
+class FakeSession:
+    """Stands in for an initialized mcp.ClientSession."""
+
+    instances: list["FakeSession"] = []
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.metas: list[dict | None] = []
+        self.fail_next: Exception | None = None
+        self.hang_next = False
+        FakeSession.instances.append(self)
+
+    async def initialize(self):
+        return None
+
+    async def send_ping(self):
+        return None
+
+    async def call_tool(self, name, arguments, meta=None):
+        await asyncio.sleep(0)
+        if self.hang_next:
+            self.hang_next = False
+            await asyncio.Event().wait()
+        if self.fail_next is not None:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        self.calls.append(name)
+        self.metas.append(meta)
+        return CallToolResult(content=[TextContent(type="text", text=f"{name} ok")])
+
+
+@asynccontextmanager
+async def fake_create_session(connection):
+    yield FakeSession()
+
+
+@pytest.fixture
+def fake_sessions():
+    FakeSession.instances = []
+    with patch("pear_genius.tools.mcp_pool.create_session", fake_create_session):
+        yield FakeSession.instances
+
+
+@pytest.mark.asyncio
+async def test_pool_opens_sessions_once(fake_sessions):
+    """Test that repeated calls reuse the pooled sessions."""
+    pool = MCPSessionPool({"transport": "streamable_http", "url": "http://gw/mcp"}, size=2)
+    await pool.start()
+    try:
+        for _ in range(10):
+            result = await pool.call_tool("shipping_getShipment", {})
+            assert result.content[0].text == "shipping_getShipment ok"
+
+        assert len(fake_sessions) == 2
+        assert sum(len(s.calls) for s in fake_sessions) == 10
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_spreads_concurrent_calls(fake_sessions):
+    """Test that concurrent calls go to the least-busy session."""
+    pool = MCPSessionPool({"transport": "streamable_http", "url": "http://gw/mcp"}, size=2)
+    await pool.start()
+    try:
+        await asyncio.gather(*(pool.call_tool("order-management_getOrder", {}) for _ in range(4)))
+        assert [len(s.calls) for s in fake_sessions] == [2, 2]
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_failure(fake_sessions):
+    """Test that a failed call drops the session and a new one is opened."""
+    with patch("pear_genius.tools.mcp_pool.settings") as mock_settings:
+        mock_settings.mcp_pool_connect_timeout = 1.0
+        mock_settings.mcp_pool_health_interval = 60.0
+        mock_settings.mcp_pool_call_timeout = 5.0
+        mock_settings.mcp_pool_reconnect_backoff = 0.01
+        mock_settings.mcp_pool_reconnect_max_backoff = 0.01
+
+        pool = MCPSessionPool({"transport": "streamable_http", "url": "http://gw/mcp"}, size=1)
+        await pool.start()
+        try:
+            fake_sessions[0].fail_next = httpx.ReadError("connection reset")
+            with pytest.raises(httpx.ReadError):
+                await pool.call_tool("shipping_getShipment", {})
+            assert pool.healthy_count == 0
+
+            for _ in range(50):
+                if pool.healthy_count:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert len(fake_sessions) == 2
+            result = await pool.call_tool("shipping_getShipment", {})
+            assert not result.isError
+        finally:
+            await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_session_on_mcp_error(fake_sessions):
+    """Test that an error answered by the gateway does not reconnect the session."""
+    pool = MCPSessionPool({"transport": "streamable_http", "url": "http://gw/mcp"}, size=1)
+    await pool.start()
+    try:
+        fake_sessions[0].fail_next = McpError(ErrorData(code=INVALID_PARAMS, message="bad args"))
+        with pytest.raises(McpError):
+            await pool.call_tool("shipping_getShipment", {})
+
+        assert pool.healthy_count == 1
+        await pool.call_tool("shipping_getShipment", {})
+        assert len(fake_sessions) == 1
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_hung_call(fake_sessions):
+    """Test that a call past the timeout frees the session and reconnects it."""
+    with patch("pear_genius.tools.mcp_pool.settings") as mock_settings:
+        mock_settings.mcp_pool_connect_timeout = 1.0
+        mock_settings.mcp_pool_health_interval = 60.0
+        mock_settings.mcp_pool_call_timeout = 0.05
+        mock_settings.mcp_pool_reconnect_backoff = 0.01
+        mock_settings.mcp_pool_reconnect_max_backoff = 0.01
+
+        pool = MCPSessionPool({"transport": "streamable_http", "url": "http://gw/mcp"}, size=1)
+        await pool.start()
+        try:
+            fake_sessions[0].hang_next = True
+            with pytest.raises(TimeoutError):
+                await pool.call_tool("shipping_getShipment", {})
+            assert pool.healthy_count == 0
+
+            for _ in range(50):
+                if pool.healthy_count:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert len(fake_sessions) == 2
+            result = await pool.call_tool("shipping_getShipment", {})
+            assert not result.isError
+        finally:
+            await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_call_without_healthy_session_raises(fake_sessions):
+    """Test that an empty pool raises ConnectionError so callers can fall back."""
+    pool = MCPSessionPool({"transport": "streamable_http", "url": "http://gw/mcp"}, size=1)
+    with pytest.raises(ConnectionError):
+        await pool.call_tool("shipping_getShipment", {})
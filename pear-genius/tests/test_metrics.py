@@ -0,0 +1,165 @@
+"""Tests for the Prometheus metrics registry and /metrics endpoint."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+from pear_genius import metrics, rate_limit, server
+from pear_genius.metrics import Counter, Histogram, render_samples
+from pear_genius.rate_limit import InMemoryRateLimiter
+from pear_genius.state.sessions import InMemorySessionStore
+
+
+def _value(histogram: Histogram, *labels: str) -> tuple[int, float]:
+    child = histogram.labels(*labels)
+    return sum(child.counts), child.sum
+
+
+class TestInstruments:
+    """Tests for counters, histograms and the text exposition."""
+
+    def setup_method(self):
+        self._registry = list(metrics.REGISTRY)
+
+    def teardown_method(self):
+        metrics.REGISTRY[:] = self._registry
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = Histogram("test_latency_seconds", "Test latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value)
+
+        text = hist.render()
+        assert 'test_latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'test_latency_seconds_bucket{le="1.0"} 3' in text
+        assert 'test_latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "test_latency_seconds_count 4" in text
+        assert "test_latency_seconds_sum 3.65" in text
+
+    def test_labeled_counter(self):
+        counter = Counter("test_errors_total", "Test errors", ("service",))
+        counter.labels("shipping").inc()
+        counter.labels("shipping").inc()
+        counter.labels('we"ird').inc()
+
+        text = counter.render()
+        assert "# TYPE test_errors_total counter" in text
+        assert 'test_errors_total{service="shipping"} 2' in text
+        assert 'test_errors_total{service="we\\"ird"} 1' in text
+
+    def test_unlabeled_metrics_start_at_zero(self):
+        assert "test_started_total 0" in Counter("test_started_total", "Started").render()
+
+    def test_render_samples(self):
+        text = render_samples([("test_queue", "gauge", "Queue depth", 3)])
+        assert text == "# HELP test_queue Queue depth\n# TYPE test_queue gauge\ntest_queue 3\n"
+
+
+class TestRecording:
+    """Tests for hot-path recording during a graph run."""
+
+    async def test_graph_run_records_latencies_and_errors(self):
+        events = [
+            {"event": "on_tool_start", "name": "shipping_track", "run_id": "t1"},
+            {
+                "event": "on_tool_end",
+                "name": "shipping_track",
+                "run_id": "t1",
+                "data": {"output": ToolMessage("boom", tool_call_id="1", status="error")},
+            },
+            {"event": "on_tool_start", "name": "shipping_rates", "run_id": "t2"},
+            {"event": "on_tool_error", "name": "shipping_rates", "run_id": "t2", "data": {}},
+            {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content="Hi")}},
+            {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content="!")}},
+        ]
+
+        async def astream_events(*args, **kwargs):
+            for event in events:
+                yield event
+
+        graph = MagicMock()
+        graph.astream_events = astream_events
+        graph.aget_state = AsyncMock(return_value=None)
+
+        tools_before = _value(metrics.TOOL_DURATION, "shipping")[0]
+        errors_before = metrics.TOOL_ERRORS.labels("shipping").value
+        ttft_before = _value(metrics.TIME_TO_FIRST_TOKEN)[0]
+        turns_before = _value(metrics.TURN_DURATION, "ok")[0]
+
+        with (
+            patch.object(server, "_session_store", InMemorySessionStore()),
+            patch.object(rate_limit, "_limiter", InMemoryRateLimiter()),
+        ):
+            async for _ in server._graph_payloads(graph, {}, {}, "sess-1"):
+                pass
+
+        assert _value(metrics.TOOL_DURATION, "shipping")[0] == tools_before + 2
+        assert metrics.TOOL_ERRORS.labels("shipping").value == errors_before + 2
+        assert _value(metrics.TIME_TO_FIRST_TOKEN)[0] == ttft_before + 1
+        assert _value(metrics.TURN_DURATION, "ok")[0] == turns_before + 1
+
+    async def test_failed_and_abandoned_turns_are_recorded(self):
+        async def astream_events(*args, **kwargs):
+            yield {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content="Hi")}}
+            if fail:
+                raise RuntimeError("model overloaded")
+            yield {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content="!")}}
+
+        graph = MagicMock()
+        graph.astream_events = astream_events
+        graph.aget_state = AsyncMock(return_value=None)
+        errors = _value(metrics.TURN_DURATION, "error")[0]
+        cancelled = _value(metrics.TURN_DURATION, "cancelled")[0]
+
+        with (
+            patch.object(server, "_session_store", InMemorySessionStore()),
+            patch.object(rate_limit, "_limiter", InMemoryRateLimiter()),
+        ):
+            fail = True
+            async for _ in server._graph_payloads(graph, {}, {}, "sess-1"):
+                pass
+            fail = False
+            payloads = server._graph_payloads(graph, {}, {}, "sess-2")
+            await anext(payloads)  # the client disconnects after the first token
+            await payloads.aclose()
+
+        assert _value(metrics.TURN_DURATION, "error")[0] == errors + 1
+        assert _value(metrics.TURN_DURATION, "cancelled")[0] == cancelled + 1
+
+    async def test_approval_wait_is_interrupt_checkpoint_age(self):
+        requested = datetime.now(UTC) - timedelta(seconds=30)
+        graph = MagicMock()
+        graph.aget_state = AsyncMock(
+            return_value=MagicMock(interrupts=("approve",), created_at=requested.isoformat())
+        )
+        count, total = _value(metrics.APPROVAL_WAIT)
+
+        await server._observe_approval_wait(graph, {})
+
+        new_count, new_total = _value(metrics.APPROVAL_WAIT)
+        assert new_count == count + 1
+        assert 30 <= new_total - total < 35
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_exposition(self):
+        with (
+            patch.object(server, "_session_store", InMemorySessionStore()),
+            patch.object(rate_limit, "_limiter", InMemoryRateLimiter()),
+        ):
+            response = TestClient(server.app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        for name in (
+            "pear_genius_turn_duration_seconds_count",
+            "pear_genius_sessions_created_total",
+            "pear_genius_sessions 0",
+            "pear_genius_tool_cache_hits_total",
+            "pear_genius_runs_queued",
+        ):
+            assert name in response.text
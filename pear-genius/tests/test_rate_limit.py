@@ -0,0 +1,192 @@
+"""Tests for per-customer token-bucket rate limits."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosqlite
+import pytest
+from fastapi.testclient import TestClient
+
+from pear_genius import rate_limit, server
+from pear_genius.rate_limit import (
+    LLM_TOKENS,
+    MESSAGES,
+    SESSIONS,
+    InMemoryRateLimiter,
+    Limit,
+    RateLimitExceededError,
+    SqliteRateLimiter,
+    resolve_limits,
+)
+from pear_genius.state.conversation import CustomerTier
+from pear_genius.state.sessions import InMemorySessionStore
+
+LIMITS = {
+    tier: {SESSIONS: Limit(2, 60), MESSAGES: Limit(2, 60), LLM_TOKENS: Limit(100, 60)}
+    for tier in CustomerTier
+}
+
+
+@pytest.fixture(autouse=True)
+def rate_limit_enabled():
+    """Limits are off by default; every test here exercises them."""
+    with patch.object(rate_limit.settings, "rate_limit_enabled", True):
+        yield
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def make_limiter(request, tmp_path):
+    """Factory for either backend, closing SQLite connections afterwards."""
+    limiters = []
+
+    async def make(limits=LIMITS):
+        if request.param == "memory":
+            limiter = InMemoryRateLimiter(limits)
+        else:
+            limiter = SqliteRateLimiter(await aiosqlite.connect(tmp_path / "limits.db"), limits)
+            await limiter.setup()
+        limiters.append(limiter)
+        return limiter
+
+    yield make
+    for limiter in limiters:
+        await limiter.close()
+
+
+class TestRateLimiters:
+    """Behavior shared by both backends."""
+
+    async def test_burst_then_limited(self, make_limiter):
+        limiter = await make_limiter()
+        await limiter.acquire("cust-1", None, MESSAGES)
+        await limiter.acquire("cust-1", None, MESSAGES)
+        with pytest.raises(RateLimitExceededError) as exc:
+            await limiter.acquire("cust-1", None, MESSAGES)
+
+        assert exc.value.bucket == MESSAGES
+        assert exc.value.retry_after == 1  # one token per second
+        assert limiter.stats()["limited"] == 1
+
+    async def test_buckets_are_per_customer_and_kind(self, make_limiter):
+        limiter = await make_limiter()
+        for _ in range(2):
+            await limiter.acquire("cust-1", None, MESSAGES)
+        await limiter.acquire("cust-2", None, MESSAGES)
+        await limiter.acquire("cust-1", None, SESSIONS)
+
+    async def test_refills_over_time(self, make_limiter):
+        limiter = await make_limiter()
+        with patch.object(rate_limit.time, "time", return_value=1000.0):
+            for _ in range(2):
+                await limiter.acquire("cust-1", None, MESSAGES)
+        with patch.object(rate_limit.time, "time", return_value=1001.0):
+            await limiter.acquire("cust-1", None, MESSAGES)
+            with pytest.raises(RateLimitExceededError):
+                await limiter.acquire("cust-1", None, MESSAGES)
+
+    async def test_llm_usage_overdraws_until_refilled(self, make_limiter):
+        """Test that usage charged after a run blocks the next run until repaid."""
+        limiter = await make_limiter()
+        with patch.object(rate_limit.time, "time", return_value=1000.0):
+            await limiter.acquire("cust-1", None, LLM_TOKENS, cost=0)
+            await limiter.charge("cust-1", None, LLM_TOKENS, 130)
+            with pytest.raises(RateLimitExceededError) as exc:
+                await limiter.acquire("cust-1", None, LLM_TOKENS, cost=0)
+        assert exc.value.retry_after == 30
+
+        with patch.object(rate_limit.time, "time", return_value=1030.0):
+            await limiter.acquire("cust-1", None, LLM_TOKENS, cost=0)
+
+    async def test_tiers_have_their_own_limits(self, make_limiter):
+        limits = {**LIMITS, CustomerTier.PREMIER: {MESSAGES: Limit(5, 60)}}
+        limiter = await make_limiter(limits)
+        for _ in range(5):
+            await limiter.acquire("cust-1", CustomerTier.PREMIER, MESSAGES)
+        with pytest.raises(RateLimitExceededError):
+            await limiter.acquire("cust-2", CustomerTier.STANDARD, MESSAGES, cost=3)
+
+    async def test_disabled(self, make_limiter):
+        limiter = await make_limiter()
+        limiter.enabled = False
+        for _ in range(5):
+            await limiter.acquire("cust-1", None, MESSAGES)
+
+
+class TestSqliteRateLimiter:
+    """Tests specific to the SQLite backend."""
+
+    async def test_buckets_shared_between_workers(self, tmp_path):
+        a = SqliteRateLimiter(await aiosqlite.connect(tmp_path / "limits.db"), LIMITS)
+        b = SqliteRateLimiter(await aiosqlite.connect(tmp_path / "limits.db"), LIMITS)
+        await a.setup()
+        await b.setup()
+        try:
+            await a.acquire("cust-1", None, MESSAGES)
+            await b.acquire("cust-1", None, MESSAGES)
+            with pytest.raises(RateLimitExceededError):
+                await a.acquire("cust-1", None, MESSAGES)
+        finally:
+            await a.close()
+            await b.close()
+
+
+class TestResolveLimits:
+    """Tests for tier defaults and overrides."""
+
+    def test_premier_gets_more_than_standard(self):
+        limits = resolve_limits({})
+        for bucket in (SESSIONS, MESSAGES, LLM_TOKENS):
+            assert limits[CustomerTier.PREMIER][bucket] > limits[CustomerTier.STANDARD][bucket]
+
+    def test_override(self):
+        limits = resolve_limits({"plus": {"messages": (3, 6)}})
+        assert limits[CustomerTier.PLUS][MESSAGES] == Limit(3, 6)
+        assert (
+            limits[CustomerTier.STANDARD][MESSAGES]
+            == rate_limit.DEFAULT_LIMITS[CustomerTier.STANDARD][MESSAGES]
+        )
+
+
+class TestRateLimitEndpoints:
+    """Tests for 429 + Retry-After on the chat API."""
+
+    def test_session_creation_is_limited(self):
+        graph = MagicMock()
+        with (
+            patch.object(server, "_session_store", InMemorySessionStore()),
+            patch.object(server, "get_shared_graph", AsyncMock(return_value=graph)),
+            patch.object(rate_limit, "_limiter", InMemoryRateLimiter(LIMITS)),
+        ):
+            client = TestClient(server.app)
+            assert client.post("/api/chat/sessions").status_code == 200
+            assert client.post("/api/chat/sessions").status_code == 200
+            response = client.post("/api/chat/sessions")
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    async def test_run_usage_is_charged(self):
+        """Test that LLM usage reported by a run is charged to the customer."""
+        events = [
+            {"event": "on_chat_model_end", "data": {"output": MagicMock(usage_metadata=usage)}}
+            for usage in ({"total_tokens": 70}, {"total_tokens": 50})
+        ]
+
+        async def astream_events(*args, **kwargs):
+            for event in events:
+                yield event
+
+        graph = MagicMock()
+        graph.astream_events = astream_events
+        graph.aget_state = AsyncMock(return_value=None)
+        limiter = InMemoryRateLimiter(LIMITS)
+        session = server.SessionData("Hi", "cust-1")
+
+        with (
+            patch.object(server, "_session_store", InMemorySessionStore()),
+            patch.object(rate_limit, "_limiter", limiter),
+        ):
+            async for _ in server._graph_payloads(graph, {}, {}, "sess-1", session):
+                pass
+
+        with pytest.raises(RateLimitExceededError):
+            await limiter.acquire("cust-1", None, LLM_TOKENS, cost=0)
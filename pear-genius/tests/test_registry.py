@@ -0,0 +1,154 @@
+"""Tests for tool catalog diffing and background refresh."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from pear_genius import server
+from pear_genius.tools import registry
+from pear_genius.tools.catalog import ToolCatalog
+from pear_genius.tools.registry import ToolCatalogRefresher, diff_catalogs
+
+
+async def _noop(**kwargs):
+    return ""
+
+
+def _tool(name: str, description: str = "A tool") -> StructuredTool:
+    return StructuredTool(
+        name=name,
+        description=description,
+        args_schema={"type": "object", "properties": {"path": {"type": "object"}}},
+        coroutine=_noop,
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    with patch.object(registry, "_catalog", None):
+        yield
+
+
+class TestDiffCatalogs:
+    """Tests for catalog change detection."""
+
+    def test_added_removed_changed(self):
+        old = [_tool("a_get"), _tool("b_get"), _tool("c_get")]
+        new = [_tool("a_get"), _tool("b_get", "New description"), _tool("d_get")]
+
+        diff = diff_catalogs(old, new)
+
+        assert diff.added == ("d_get",)
+        assert diff.removed == ("c_get",)
+        assert diff.changed == ("b_get",)
+
+    def test_identical_catalogs_are_falsy(self):
+        assert not diff_catalogs([_tool("a_get")], [_tool("a_get")])
+
+
+class TestToolCatalogRefresher:
+    """Tests for refresh, commit and backoff behavior."""
+
+    async def test_changed_catalog_applied_then_committed(self):
+        registry._catalog = ToolCatalog([_tool("a_get")])
+        new = [_tool("a_get"), _tool("b_get")]
+        on_change = AsyncMock()
+
+        with patch.object(registry, "load_mcp_tools", AsyncMock(return_value=new)):
+            diff = await ToolCatalogRefresher(on_change).refresh_once()
+
+        assert diff.added == ("b_get",)
+        on_change.assert_awaited_once_with(new)
+        assert registry._catalog.tools == new
+
+    async def test_unchanged_catalog_does_not_rebuild(self):
+        registry._catalog = ToolCatalog([_tool("a_get")])
+        on_change = AsyncMock()
+
+        with patch.object(registry, "load_mcp_tools", AsyncMock(return_value=[_tool("a_get")])):
+            assert not await ToolCatalogRefresher(on_change).refresh_once()
+
+        on_change.assert_not_awaited()
+
+    async def test_failed_rebuild_keeps_old_catalog(self):
+        """Test that the cache is only committed once the callback succeeds."""
+        old = ToolCatalog([_tool("a_get")])
+        registry._catalog = old
+        on_change = AsyncMock(side_effect=RuntimeError("compile failed"))
+
+        with patch.object(registry, "load_mcp_tools", AsyncMock(return_value=[_tool("b_get")])):
+            with pytest.raises(RuntimeError):
+                await ToolCatalogRefresher(on_change).refresh_once()
+
+        assert registry._catalog is old
+
+    async def test_empty_listing_is_treated_as_gateway_down(self):
+        registry._catalog = ToolCatalog([_tool("a_get")])
+        with patch.object(registry, "load_mcp_tools", AsyncMock(return_value=[])):
+            with pytest.raises(ConnectionError):
+                await ToolCatalogRefresher(AsyncMock()).refresh_once()
+
+    async def test_backs_off_exponentially_while_gateway_down(self):
+        """Test retry delays double up to the cap, then reset on success."""
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+            if len(delays) == 6:
+                raise StopAsyncIteration
+
+        outcomes = [ConnectionError("down")] * 4 + [[_tool("a_get")]]
+        refresher = ToolCatalogRefresher(AsyncMock(), interval=300.0)
+        with (
+            patch.object(registry, "load_mcp_tools", AsyncMock(side_effect=outcomes)),
+            patch.object(registry.asyncio, "sleep", fake_sleep),
+            patch.object(registry.settings, "tool_refresh_retry_backoff", 5.0),
+            patch.object(registry.settings, "tool_refresh_max_backoff", 30.0),
+        ):
+            with pytest.raises(StopAsyncIteration):
+                await refresher._run()
+
+        # Booted without tools: first refresh after the retry backoff
+        assert delays == [5.0, 5.0, 10.0, 20.0, 30.0, 300.0]
+
+
+class TestGraphSwap:
+    """Tests for hot-swapping the shared graph."""
+
+    async def test_swap_reuses_checkpointer(self):
+        old_graph = MagicMock()
+        new_graph = MagicMock()
+        tools = [_tool("a_get")]
+        build = AsyncMock(return_value=new_graph)
+
+        with (
+            patch.object(server, "_shared_graph", old_graph),
+            patch.object(server, "create_agent_graph", build),
+        ):
+            await server.swap_shared_graph(tools)
+            assert server._shared_graph is new_graph
+
+        build.assert_awaited_once_with(tools=tools, checkpointer=old_graph.checkpointer)
+
+    async def test_in_flight_request_keeps_old_graph(self):
+        """Test that a stream that already fetched the graph is unaffected by a swap."""
+        old_graph = MagicMock()
+        with (
+            patch.object(server, "_shared_graph", old_graph),
+            patch.object(server, "create_agent_graph", AsyncMock(return_value=MagicMock())),
+        ):
+            in_flight = await server.get_shared_graph()
+            await server.swap_shared_graph([_tool("a_get")])
+
+            assert in_flight is old_graph
+            assert await server.get_shared_graph() is not old_graph
+
+    async def test_swap_before_first_build_is_deferred(self):
+        build = AsyncMock()
+        with (
+            patch.object(server, "_shared_graph", None),
+            patch.object(server, "create_agent_graph", build),
+        ):
+            await server.swap_shared_graph([_tool("a_get")])
+        build.assert_not_awaited()
@@ -0,0 +1,128 @@
+"""Tests for per-tool rendering of structured tool results."""
+
+import copy
+import json
+
+from langchain_core.messages import ToolMessage
+
+from pear_genius.agents.agent import _describe_create_return, _find_order_in_history
+from pear_genius.tools.rendering import (
+    RenderPolicy,
+    RenderStats,
+    apply_policy,
+    project,
+    render_tool_result,
+)
+
+
+def _order(i: int) -> dict:
+    return {
+        "id": f"ORD-{i}",
+        "orderNumber": f"W{i}",
+        "status": "delivered",
+        "customer": {"name": "Jennifer Martinez", "email": "jennifer.martinez@email.com"},
+        "items": [
+            {
+                "id": f"ITEM-{i}",
+                "lineId": 1,
+                "productId": "PPH16PM",
+                "name": "pPhone 16 Pro Max",
+                "sku": "PPH16PM-256",
+                "quantity": 1,
+                "unitPrice": {"amount": 1199.0, "currency": "USD"},
+            },
+        ],
+        "shipping": {"carrier": "UPS", "trackingNumber": "1Z999", "signedBy": "J. Martinez"},
+        "payment": {"method": "pear_card", "cardLast4": "4532"},
+        "total": 1356.06,
+    }
+
+
+ORDER_LIST = {"orders": [_order(i) for i in range(15)], "pagination": {"page": 1, "totalItems": 15}}
+
+
+class TestProjection:
+    """Tests for field projection and row caps."""
+
+    def test_project_dotted_paths(self):
+        """Test nested dict and list projection with dotted paths."""
+        out = project(_order(1), ("id", "items.name", "shipping.trackingNumber"))
+        assert out == {
+            "id": "ORD-1",
+            "items": [{"name": "pPhone 16 Pro Max"}],
+            "shipping": {"trackingNumber": "1Z999"},
+        }
+
+    def test_rows_capped_with_marker(self):
+        """Test that lists are capped and the remainder is announced."""
+        out = apply_policy(ORDER_LIST, RenderPolicy(fields=("id",), max_rows=10))
+
+        assert out["orders"][:2] == [{"id": "ORD-0"}, {"id": "ORD-1"}]
+        assert len(out["orders"]) == 11
+        assert out["orders"][-1] == "… 5 more omitted"
+        assert out["pagination"] == ORDER_LIST["pagination"]
+
+    def test_record_without_fields_kept_whole(self):
+        """Test that a record matching none of the fields is not emptied."""
+        out = apply_policy([{"foo": 1}], RenderPolicy(fields=("id",)))
+        assert out == [{"foo": 1}]
+
+
+class TestRenderToolResult:
+    """Tests for re-rendering (content, artifact) results."""
+
+    def test_content_reduced_artifact_untouched(self):
+        """Test that only the content shrinks and the artifact is the full payload."""
+        original = copy.deepcopy(ORDER_LIST)
+        full = json.dumps(ORDER_LIST, separators=(",", ":"))
+
+        content, artifact = render_tool_result("order-management_listOrders", (full, ORDER_LIST))
+
+        assert artifact is ORDER_LIST
+        assert ORDER_LIST == original
+        assert len(content) < len(full) / 2
+        assert "cardLast4" not in content
+        assert "more omitted" in content
+
+    def test_tools_without_policy_unchanged(self):
+        """Test that tools without a policy pass through as-is."""
+        result = ('{"id":"ORD-1"}', {"id": "ORD-1"})
+        assert render_tool_result("order-management_getOrder", result) is result
+
+    def test_error_results_unchanged(self):
+        """Test that results without structured data are not re-rendered."""
+        result = ("Error: connection failed", None)
+        assert render_tool_result("order-management_listOrders", result) is result
+
+    def test_stats_report_savings(self):
+        """Test per-tool byte and token savings."""
+        stats = RenderStats()
+        stats.record("order-management_listOrders", 4000, 1000)
+        stats.record("order-management_listOrders", 2000, 1000)
+
+        assert stats.stats() == {
+            "order-management_listOrders": {"calls": 2, "bytes_saved": 4000, "tokens_saved": 1000}
+        }
+
+    def test_find_order_uses_full_artifact(self):
+        """Test that approval descriptions can still find orders cut from the content."""
+        full = json.dumps(ORDER_LIST)
+        content, artifact = render_tool_result("order-management_listOrders", (full, ORDER_LIST))
+        msg = ToolMessage(content=content, artifact=artifact, tool_call_id="call-1")
+
+        assert "ORD-14" not in content
+        assert _find_order_in_history("ORD-14", [msg])["payment"]["cardLast4"] == "4532"
+
+    def test_item_ids_survive_for_create_return(self):
+        """Test that a return can be built from a rendered listOrders result."""
+        full = json.dumps(ORDER_LIST)
+        content, artifact = render_tool_result("order-management_listOrders", (full, ORDER_LIST))
+        msg = ToolMessage(content=content, artifact=artifact, tool_call_id="call-1")
+
+        item = json.loads(content)["orders"][3]["items"][0]
+        assert item["productId"] == "PPH16PM"
+        assert item["sku"] == "PPH16PM-256"
+        assert "unitPrice" not in item
+
+        args = {"orderId": "ORD-3", "items": [{"itemId": item["id"], "quantity": 1}]}
+        assert _describe_create_return(args, [msg])[0] == "pPhone 16 Pro Max — $1,199.00"
@@ -0,0 +1,94 @@
+"""Tests for the pluggable JSON serializer and its call sites."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import ToolMessage
+
+from pear_genius import serialization
+from pear_genius.agents.agent import _find_order_in_history
+from pear_genius.serialization import OrjsonSerializer, StdlibSerializer, create_serializer
+from pear_genius.streaming import sse_frame
+from pear_genius.tools.mcp_client import _patched_convert_call_tool_result
+
+ORDER = {
+    "id": "ORD-1001",
+    "status": "delivered",
+    "total": 2499.0,
+    "items": [{"id": "ITEM-1", "name": "PearBook Pro 16″", "price": 2499.0}],
+}
+
+BACKENDS = [StdlibSerializer()]
+if serialization.orjson is not None:
+    BACKENDS.append(OrjsonSerializer())
+
+
+class TestSerializers:
+    """Tests that every backend produces the same compact JSON."""
+
+    @pytest.mark.parametrize("serializer", BACKENDS, ids=lambda s: s.name)
+    def test_round_trip_is_compact(self, serializer):
+        """Test compact output and a lossless round trip."""
+        text = serializer.dumps(ORDER)
+        assert "\n" not in text and ", " not in text
+        assert serializer.loads(text) == ORDER
+        assert serializer.dumpb(ORDER) == text.encode()
+
+    @pytest.mark.parametrize("serializer", BACKENDS, ids=lambda s: s.name)
+    def test_backends_agree(self, serializer):
+        """Test that output matches the stdlib byte for byte, including key sorting."""
+        reference = StdlibSerializer()
+        assert serializer.dumps(ORDER) == reference.dumps(ORDER)
+        assert serializer.dumps(ORDER, sort_keys=True) == reference.dumps(ORDER, sort_keys=True)
+
+    @pytest.mark.skipif(serialization.orjson is None, reason="orjson not installed")
+    def test_orjson_falls_back_for_unsupported_values(self):
+        """Test that values orjson rejects are still serialized."""
+        assert OrjsonSerializer().dumps({"n": 2**70}) == '{"n":1180591620717411303424}'
+
+    def test_auto_without_orjson_uses_stdlib(self):
+        """Test the stdlib fallback when the optional dependency is missing."""
+        with patch.object(serialization, "orjson", None):
+            assert create_serializer("auto").name == "stdlib"
+            assert create_serializer("orjson").name == "stdlib"
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            create_serializer("pickle")
+
+
+class TestCallSites:
+    """Tests for the serializer's use on the SSE and MCP paths."""
+
+    def test_sse_frame(self):
+        """Test that frames are a single data line terminated by a blank line."""
+        frame = sse_frame({"type": "token", "content": "line one\nline two"})
+        assert frame.startswith(b"data: ") and frame.endswith(b"\r\n\r\n")
+        assert frame.count(b"\n") == 2
+        assert json.loads(frame[6:]) == {"type": "token", "content": "line one\nline two"}
+
+    def test_structured_content_is_compact(self):
+        """Test that structuredContent reaches the LLM as compact JSON."""
+        result = SimpleNamespace(content=[], structuredContent=ORDER)
+        content, artifact = _patched_convert_call_tool_result(result)
+
+        assert artifact is ORDER
+        assert "\n" not in content
+        assert json.loads(content) == ORDER
+
+    def test_find_order_prefers_artifact(self):
+        """Test that order lookup uses the artifact instead of re-parsing the text."""
+        msg = ToolMessage(
+            content='{"id": "ORD-1001", "truncated": true',
+            artifact=ORDER,
+            tool_call_id="call-1",
+        )
+        assert _find_order_in_history("ORD-1001", [msg]) is ORDER
+
+    def test_find_order_parses_content_without_artifact(self):
+        """Test the text fallback, including orders nested in list results."""
+        msg = ToolMessage(content=json.dumps({"orders": [ORDER]}), tool_call_id="call-1")
+        assert _find_order_in_history("ORD-1001", [msg]) == ORDER
@@ -0,0 +1,161 @@
+"""Tests for startup warm-up and the health/readiness endpoints."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pear_genius import server
+from pear_genius.tools import registry
+
+
+def _pool(healthy: int = 1) -> AsyncMock:
+    return AsyncMock(return_value=MagicMock(healthy_count=healthy))
+
+
+def _tools() -> AsyncMock:
+    tool = MagicMock()
+    tool.name = "order-management_getOrder"
+    return AsyncMock(return_value=[tool])
+
+
+@pytest.fixture(autouse=True)
+def fresh_startup():
+    """Reset the module-level startup state around each test."""
+    with (
+        patch.dict(server._startup, {"status": "starting", "phases": {}, "error": None}),
+        patch.object(server, "_shared_graph", None),
+        patch.object(server, "_pending_checkpointer", None),
+        patch.object(registry, "_catalog", None),
+    ):
+        server._startup["phases"] = {}
+        yield
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager: the lifespan hook does not run
+    return TestClient(server.app)
+
+
+class TestReadiness:
+    """Tests for /api/health vs /api/ready."""
+
+    def test_health_is_live_before_warm_up(self, client):
+        assert client.get("/api/health").status_code == 200
+
+    def test_not_ready_until_warm_up_completes(self, client):
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    async def test_ready_after_warm_up(self, client):
+        """Test that every phase is timed and readiness flips to 200."""
+        with (
+            patch.object(registry, "load_mcp_tools", _tools()),
+            patch.object(server, "create_agent_graph", AsyncMock(return_value=MagicMock())),
+            patch.object(server, "get_mcp_pool", _pool()) as pool,
+            patch.object(server, "warm_up_llm", AsyncMock()) as llm,
+            patch.object(server.settings, "anthropic_api_key", "test-key"),
+        ):
+            await server.warm_up()
+
+        pool.assert_awaited_once()
+        llm.assert_awaited_once()
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        assert set(response.json()["phases"]) == {"tools", "graph", "mcp_pool", "llm"}
+
+    async def test_warm_up_retries_with_backoff(self):
+        """Test that a gateway that is not up yet is retried, not fatal."""
+        load = _tools()
+        load.side_effect = [ConnectionError("gateway down"), load.return_value]
+        graph = AsyncMock(return_value=MagicMock())
+        with (
+            patch.object(registry, "load_mcp_tools", load),
+            patch.object(server, "create_agent_graph", graph),
+            patch.object(server, "get_mcp_pool", _pool()),
+            patch.object(server.settings, "warmup_llm_request", False),
+            patch.object(server.asyncio, "sleep", AsyncMock()) as sleep,
+        ):
+            await server.warm_up()
+
+        sleep.assert_awaited_once_with(server.WARMUP_RETRY_BACKOFF)
+        assert load.await_count == 2
+        graph.assert_awaited_once()
+        assert server._startup["status"] == "ready"
+
+    async def test_empty_tool_catalog_is_not_ready(self):
+        """Test that a gateway listing no tools fails warm-up instead of caching a bare graph."""
+        load = _tools()
+        load.side_effect = [[], load.return_value]
+        graph = AsyncMock(return_value=MagicMock())
+        with (
+            patch.object(registry, "load_mcp_tools", load),
+            patch.object(server, "create_agent_graph", graph),
+            patch.object(server, "get_mcp_pool", _pool()),
+            patch.object(server.settings, "warmup_llm_request", False),
+            patch.object(server.asyncio, "sleep", AsyncMock()) as sleep,
+        ):
+            await server.warm_up()
+
+        sleep.assert_awaited_once()
+        assert len(graph.await_args.kwargs["tools"]) == 1
+        assert server._startup["status"] == "ready"
+
+    async def test_pool_without_healthy_sessions_is_not_ready(self):
+        pool = MagicMock(healthy_count=0)
+        get_pool = AsyncMock(return_value=pool)
+
+        async def sleep(delay):
+            pool.healthy_count = 1
+
+        with (
+            patch.object(registry, "load_mcp_tools", _tools()),
+            patch.object(server, "create_agent_graph", AsyncMock(return_value=MagicMock())),
+            patch.object(server, "get_mcp_pool", get_pool),
+            patch.object(server.settings, "warmup_llm_request", False),
+            patch.object(server.asyncio, "sleep", sleep),
+        ):
+            await server.warm_up()
+
+        assert get_pool.await_count == 2
+        assert server._startup["status"] == "ready"
+
+    async def test_graph_without_tools_is_not_cached(self):
+        """Test that a lazily built graph on an empty catalog is rebuilt once tools load."""
+        checkpointer = MagicMock()
+        graph = AsyncMock(return_value=MagicMock(checkpointer=checkpointer))
+        with (
+            patch.object(registry, "load_mcp_tools", AsyncMock(return_value=[])),
+            patch.object(server, "create_agent_graph", graph),
+        ):
+            await server.get_shared_graph()
+            assert server._shared_graph is None
+            await server.get_shared_graph()
+
+        assert graph.await_count == 2
+        assert graph.await_args.kwargs["checkpointer"] is checkpointer
+
+    async def test_llm_warm_up_failure_is_not_fatal(self):
+        with (
+            patch.object(registry, "load_mcp_tools", _tools()),
+            patch.object(server, "create_agent_graph", AsyncMock(return_value=MagicMock())),
+            patch.object(server, "get_mcp_pool", _pool()),
+            patch.object(server, "warm_up_llm", AsyncMock(side_effect=RuntimeError("401"))),
+            patch.object(server.settings, "anthropic_api_key", "test-key"),
+        ):
+            await server.warm_up()
+
+        assert server._startup["status"] == "ready"
+        assert "llm" not in server._startup["phases"]
+
+    def test_lazy_mode_is_ready_immediately(self):
+        """Test that with warm-up disabled the lifespan marks the app ready."""
+        with (
+            patch.object(server.settings, "warmup_on_startup", False),
+            patch.object(server.settings, "tool_refresh_interval", 0),
+            patch.object(server, "close_mcp_pool", AsyncMock()),
+            TestClient(server.app) as client,
+        ):
+            assert client.get("/api/ready").status_code == 200
@@ -0,0 +1,216 @@
+"""Tests for the session metadata stores."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosqlite
+import pytest
+from fastapi.testclient import TestClient
+
+from pear_genius import server
+from pear_genius.auth.keycloak import create_test_customer_context
+from pear_genius.state.sessions import InMemorySessionStore, SessionData, SqliteSessionStore
+
+
+def _session(customer_id: str = "cust-010") -> SessionData:
+    return SessionData(
+        welcome_message="Hello!",
+        customer_id=customer_id,
+        customer=create_test_customer_context(customer_id=customer_id),
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def make_store(request, tmp_path):
+    """Factory for either backend, closing SQLite connections afterwards."""
+    stores = []
+
+    async def make(**kwargs):
+        if request.param == "memory":
+            store = InMemorySessionStore(**kwargs)
+        else:
+            store = SqliteSessionStore(await aiosqlite.connect(tmp_path / "sessions.db"), **kwargs)
+            await store.setup()
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        await store.close()
+
+
+class TestSessionStores:
+    """Behavior shared by both backends."""
+
+    async def test_round_trip(self, make_store):
+        store = await make_store()
+        await store.put("s-1", _session())
+
+        session = await store.get("s-1")
+
+        assert session.customer_id == "cust-010"
+        assert session.customer.name == "Test Customer"
+        assert session.is_first_message
+        assert await store.get("missing") is None
+
+    async def test_evicts_least_recently_used(self, make_store):
+        """Test that a recently used session outlives an idle newer one."""
+        store = await make_store(max_sessions=2)
+        await store.put("busy", _session())
+        time.sleep(0.001)
+        await store.put("idle", _session())
+        time.sleep(0.001)
+        await store.get("busy")
+        time.sleep(0.001)
+        await store.put("new", _session())
+
+        assert await store.get("busy") is not None
+        assert await store.get("idle") is None
+        assert (await store.stats())["evictions"] == 1
+
+    async def test_idle_sessions_expire(self, make_store):
+        store = await make_store(idle_ttl=60)
+        await store.put("s-1", _session())
+
+        later = time.time() + 61
+        with patch("pear_genius.state.sessions.time.time", return_value=later):
+            assert await store.get("s-1") is None
+
+        stats = await store.stats()
+        assert stats["expirations"] == 1
+        assert stats["size"] == 0
+
+    async def test_evicted_and_expired_ids_reported(self, make_store):
+        """Test that the on_evict hook receives every removed session."""
+        removed = []
+
+        async def on_evict(session_ids):
+            removed.extend(session_ids)
+
+        store = await make_store(max_sessions=1, idle_ttl=60, on_evict=on_evict)
+        await store.put("s-1", _session())
+        time.sleep(0.001)
+        await store.put("s-2", _session())
+        assert removed == ["s-1"]
+
+        with patch("pear_genius.state.sessions.time.time", return_value=time.time() + 61):
+            assert await store.get("s-2") is None
+        assert removed == ["s-1", "s-2"]
+
+    async def test_session_evicted_mid_turn_is_reported_after_the_turn(self, make_store):
+        """Test that a streaming session's thread is not purged until its turn ends."""
+        removed = []
+
+        async def on_evict(session_ids):
+            removed.extend(session_ids)
+
+        store = await make_store(max_sessions=1, on_evict=on_evict)
+        session = _session()
+        await store.put("s-1", session)
+        time.sleep(0.001)
+
+        async with session.lock:
+            await store.put("s-2", _session())
+            await asyncio.sleep(0)
+            assert removed == []
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert removed == ["s-1"]
+
+    async def test_stats(self, make_store):
+        store = await make_store(max_sessions=5)
+        await store.put("s-1", _session())
+        await store.get("s-1")
+        await store.get("s-2")
+
+        assert await store.stats() == {
+            "size": 1,
+            "capacity": 5,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+
+class TestSqliteSessionStore:
+    """Tests specific to the shared SQLite backend."""
+
+    async def test_sessions_shared_between_workers(self, tmp_path):
+        """Test that a session created by one worker is visible to another."""
+        path = tmp_path / "sessions.db"
+        worker_a = SqliteSessionStore(await aiosqlite.connect(path))
+        worker_b = SqliteSessionStore(await aiosqlite.connect(path))
+        await worker_a.setup()
+        await worker_b.setup()
+        try:
+            session = _session()
+            session.is_first_message = False
+            await worker_a.put("s-1", session)
+
+            loaded = await worker_b.get("s-1")
+            assert loaded.customer.customer_id == "cust-010"
+            assert loaded.is_first_message is False
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+
+    async def test_turn_lock_is_stable_within_process(self, tmp_path):
+        store = SqliteSessionStore(await aiosqlite.connect(tmp_path / "sessions.db"))
+        await store.setup()
+        try:
+            await store.put("s-1", _session())
+            first = await store.get("s-1")
+            second = await store.get("s-1")
+            assert first.lock is second.lock
+        finally:
+            await store.close()
+
+
+def test_session_data_uses_slots():
+    assert not hasattr(_session(), "__dict__")
+
+
+class TestThreadPurge:
+    """Tests for purging checkpointer threads of evicted sessions."""
+
+    async def test_eviction_purges_checkpoints(self):
+        graph = MagicMock()
+        graph.checkpointer.adelete_thread = AsyncMock()
+        store = InMemorySessionStore(max_sessions=1, on_evict=server.purge_threads)
+
+        with patch.object(server, "_shared_graph", graph):
+            await store.put("old", _session())
+            await store.put("new", _session())
+
+        graph.checkpointer.adelete_thread.assert_awaited_once_with("old")
+
+    async def test_purge_failure_does_not_break_session_creation(self):
+        graph = MagicMock()
+        graph.checkpointer.adelete_thread = AsyncMock(side_effect=RuntimeError("db locked"))
+        store = InMemorySessionStore(max_sessions=1, on_evict=server.purge_threads)
+
+        with patch.object(server, "_shared_graph", graph):
+            await store.put("old", _session())
+            await store.put("new", _session())
+
+        assert await store.get("new") is not None
+
+
+class TestSessionEndpoints:
+    """Tests for the API's use of the session store."""
+
+    def test_create_and_get_session(self):
+        graph = MagicMock()
+        graph.aget_state = AsyncMock(return_value=None)
+        with (
+            patch.object(server, "_session_store", InMemorySessionStore()),
+            patch.object(server, "get_shared_graph", AsyncMock(return_value=graph)),
+        ):
+            client = TestClient(server.app)
+            session_id = client.post("/api/chat/sessions").json()["session_id"]
+
+            assert client.get(f"/api/chat/sessions/{session_id}").status_code == 200
+            assert client.get("/api/chat/sessions/unknown").status_code == 404
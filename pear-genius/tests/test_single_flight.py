@@ -0,0 +1,197 @@
+"""Tests for single-flight coalescing of identical tool calls."""
+
+import asyncio
+
+import pytest
+
+from pear_genius.tools.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test that identical concurrent calls run the upstream call once."""
+    group = SingleFlight()
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ("stock: 12", {"sku": "PPH-16"})
+
+    results = await asyncio.gather(*(group.do("inventory:PPH-16", upstream) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == ("stock: 12", {"sku": "PPH-16"}) for r in results)
+    assert group.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    """Test that calls with different keys run independently."""
+    group = SingleFlight()
+    calls = []
+
+    async def upstream(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    results = await asyncio.gather(
+        group.do("a", lambda: upstream("a")), group.do("b", lambda: upstream("b"))
+    )
+
+    assert sorted(results) == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_coalesced():
+    """Test that a finished call is not reused (freshness unchanged)."""
+    group = SingleFlight()
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await group.do("k", upstream) == 1
+    assert await group.do("k", upstream) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_waiters():
+    """Test that every waiter receives the upstream exception."""
+    group = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("gateway down")
+
+    results = await asyncio.gather(
+        *(group.do("k", upstream) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert group.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_others():
+    """Test that cancelling the first caller leaves other waiters unaffected."""
+    group = SingleFlight()
+    started = asyncio.Event()
+
+    async def upstream():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    leader = asyncio.create_task(group.do("k", upstream))
+    await started.wait()
+    follower = asyncio.create_task(group.do("k", upstream))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "ok"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_last_waiter_cancel_cancels_upstream():
+    """Test that the upstream call is cancelled once nobody is waiting."""
+    group = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def upstream():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    caller = asyncio.create_task(group.do("k", upstream))
+    await asyncio.sleep(0.01)
+    caller.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert group.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_after_owner_cancel_gets_a_fresh_call():
+    """Test that a call abandoned by its owner is re-run, not cancelled, for a new caller."""
+    group = SingleFlight()
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        try:
+            await asyncio.sleep(0.02)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)  # slow cleanup keeps the call in flight
+            raise
+        return "ok"
+
+    owner = asyncio.create_task(group.do("k", upstream))
+    await asyncio.sleep(0)
+    owner.cancel()
+    await asyncio.sleep(0)
+
+    assert await group.do("k", upstream) == "ok"
+    assert calls == 2
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+
+
+def _tool(name, backend):
+    from langchain_core.tools import StructuredTool
+
+    return StructuredTool(
+        name=name,
+        description=name,
+        args_schema={"type": "object", "properties": {"path": {"type": "object"}}},
+        coroutine=backend,
+        response_format="content_and_artifact",
+    )
+
+
+@pytest.mark.parametrize(
+    "tool_name, expected_calls",
+    [
+        ("physical-stores_getStoreInventory", 1),
+        ("order-management_cancelOrder", 3),
+    ],
+)
+@pytest.mark.asyncio
+async def test_wrapper_coalesces_reads_but_not_writes(tool_name, expected_calls):
+    """Test that only read-only tools are coalesced by the MCP tool wrapper."""
+    from unittest.mock import patch
+
+    from pear_genius.tools import mcp_client
+
+    calls = 0
+
+    async def backend(**kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ('{"ok": true}', {"ok": True})
+
+    with (
+        patch.object(mcp_client, "get_single_flight", return_value=SingleFlight()),
+        patch.object(mcp_client.settings, "mcp_pool_enabled", False),
+        patch.object(mcp_client.settings, "tool_cache_enabled", False),
+        patch.object(mcp_client.settings, "tool_single_flight_enabled", True),
+    ):
+        [wrapped] = mcp_client._make_resilient_tools([_tool(tool_name, backend)])
+        results = await asyncio.gather(
+            *(wrapped.coroutine(path={"storeId": "S1"}) for _ in range(3))
+        )
+
+    assert calls == expected_calls
+    assert all(r == ('{"ok": true}', {"ok": True}) for r in results)
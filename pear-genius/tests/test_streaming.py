@@ -0,0 +1,142 @@
+"""Tests for SSE token batching."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from pear_genius import server
+from pear_genius.streaming import TokenBatcher, batch_tokens
+
+
+def _token(text: str) -> dict:
+    return {
+        "event": "on_chat_model_stream",
+        "tags": [],
+        "data": {"chunk": AIMessageChunk(content=text)},
+    }
+
+
+class FakeGraph:
+    """Replays a scripted astream_events sequence; floats are pauses in seconds."""
+
+    def __init__(self, script):
+        self.script = script
+
+    async def astream_events(self, *args, **kwargs):
+        for item in self.script:
+            if isinstance(item, float):
+                await asyncio.sleep(item)
+            else:
+                yield item
+
+    async def aget_state(self, config):
+        return SimpleNamespace(tasks=[])
+
+
+async def _collect(script, flush_ms: float, flush_bytes: int = 512) -> list[dict]:
+    with (
+        patch.object(server.settings, "sse_token_flush_ms", flush_ms),
+        patch.object(server.settings, "sse_token_flush_bytes", flush_bytes),
+    ):
+        return [
+            json.loads(frame.removeprefix(b"data: "))
+            async for frame in server._stream_graph_events(FakeGraph(script), {}, {}, "s-1")
+        ]
+
+
+class TestTokenBatcher:
+    """Tests for the flush thresholds."""
+
+    def test_buffers_until_size_threshold(self):
+        """Test that tokens are held until max_bytes is reached."""
+        batcher = TokenBatcher(window_ms=10_000, max_bytes=10)
+        assert batcher.add("Hello") is None
+        assert batcher.add(" world") == "Hello world"
+        assert batcher.flush() is None
+
+    def test_zero_window_flushes_every_token(self):
+        """Test that a zero window degenerates to per-token events."""
+        batcher = TokenBatcher(window_ms=0, max_bytes=1024)
+        assert batcher.add("a") == "a"
+        assert batcher.add("b") == "b"
+
+
+class TestBatchTokens:
+    """Tests for the payload-level batching generator."""
+
+    @pytest.mark.asyncio
+    async def test_source_errors_propagate(self):
+        """Test that an error raised by the source reaches the consumer."""
+
+        async def source():
+            yield {"type": "token", "content": "a"}
+            raise RuntimeError("boom")
+
+        batcher = TokenBatcher(window_ms=1000, max_bytes=1024)
+        with pytest.raises(RuntimeError):
+            async for _ in batch_tokens(source(), batcher):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_closing_consumer_stops_source(self):
+        """Test that abandoning the stream cancels the source task."""
+        cancelled = asyncio.Event()
+
+        async def source():
+            yield {"type": "tool_start", "tool": "getOrder"}
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            yield {"type": "done"}
+
+        stream = batch_tokens(source(), TokenBatcher(window_ms=10, max_bytes=1024))
+        assert await anext(stream) == {"type": "tool_start", "tool": "getOrder"}
+        await stream.aclose()
+
+        assert cancelled.is_set()
+
+
+class TestStreamBatching:
+    """Tests for batching in the server's SSE generator."""
+
+    @pytest.mark.asyncio
+    async def test_tokens_are_coalesced(self):
+        """Test that a fast burst of tokens becomes a single event."""
+        events = await _collect([_token("Hel"), _token("lo"), _token("!")], flush_ms=1000)
+
+        assert events[0] == {"type": "token", "content": "Hello!"}
+        assert [e["type"] for e in events] == ["token", "done"]
+
+    @pytest.mark.asyncio
+    async def test_window_flushes_during_pause(self):
+        """Test that buffered tokens are sent when the model pauses."""
+        events = await _collect([_token("Hi"), 0.1, _token(" there")], flush_ms=20)
+
+        assert [e.get("content") for e in events] == ["Hi", " there", None]
+
+    @pytest.mark.asyncio
+    async def test_tool_events_flush_immediately(self):
+        """Test that tool events are preceded by pending tokens and never delayed."""
+        script = [
+            _token("Checking"),
+            {"event": "on_tool_start", "name": "order-management_getOrder", "run_id": "r1"},
+            {"event": "on_tool_end", "name": "order-management_getOrder", "run_id": "r1"},
+            _token("Done"),
+        ]
+        events = await _collect(script, flush_ms=1000)
+
+        assert [e["type"] for e in events] == ["token", "tool_start", "tool_end", "token", "done"]
+        assert events[0]["content"] == "Checking"
+
+    @pytest.mark.asyncio
+    async def test_disabled_sends_one_event_per_chunk(self):
+        """Test that a zero window keeps the per-token behaviour."""
+        events = await _collect([_token("a"), _token("b")], flush_ms=0)
+
+        assert [e.get("content") for e in events] == ["a", "b", None]
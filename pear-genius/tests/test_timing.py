@@ -0,0 +1,135 @@
+"""Tests for per-turn server timing and the timing object on the done event."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from pear_genius import metrics, rate_limit, server, timing
+from pear_genius.rate_limit import InMemoryRateLimiter
+from pear_genius.state.sessions import InMemorySessionStore
+from pear_genius.timing import TurnTimer, _union
+
+
+class _Clock:
+    """Settable stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestUnion:
+    """Tests for overlapping interval coverage."""
+
+    def test_disjoint(self):
+        assert _union([(0.0, 1.0), (2.0, 3.0)]) == 2.0
+
+    def test_overlapping_and_nested(self):
+        assert _union([(1.0, 4.0), (0.0, 2.0), (2.5, 3.0), (5.0, 6.0)]) == 5.0
+
+    def test_empty(self):
+        assert _union([]) == 0.0
+
+
+class TestTurnTimer:
+    """Tests for phase accounting."""
+
+    def test_summary(self):
+        clock = _Clock()
+        with patch.object(timing.time, "monotonic", clock):
+            timer = TurnTimer()
+            timer.llm_start("llm-1")
+            clock.now += 0.4
+            assert timer.token() == pytest.approx(0.4)
+            clock.now += 0.2
+            timer.llm_end("llm-1")
+            # Two tools in parallel: 0.3s and 0.5s, overlapping for 0.3s
+            timer.tool_start("t1")
+            timer.tool_start("t2")
+            clock.now += 0.3
+            timer.tool_end("t1")
+            clock.now += 0.2
+            timer.tool_end("t2")
+            timer.llm_start("llm-2")
+            clock.now += 0.1
+            assert timer.token() is None
+            timer.llm_end("llm-2")
+
+            summary = timer.summary()
+
+        assert summary == {
+            "total_ms": 1200,
+            "ttft_ms": 400,
+            "llm_ms": [600, 100],
+            "tool_ms": 800,
+            "tool_wall_ms": 500,
+            "tool_overlap_ms": 300,
+        }
+
+    def test_unmatched_end_is_ignored(self):
+        timer = TurnTimer()
+        assert timer.tool_end("missing") is None
+        assert timer.llm_end("missing") is None
+        assert timer.summary()["ttft_ms"] is None
+
+    def test_observe_records_phases(self):
+        timer = TurnTimer()
+        timer.tool_calls = [(0.0, 1.0), (0.5, 1.0)]
+        timer.llm_calls = [0.25]
+        tools = metrics.TURN_PHASE_DURATION.labels("tools")
+        llm = metrics.TURN_PHASE_DURATION.labels("llm")
+        tools_sum, llm_sum = tools.sum, llm.sum
+        overlap_sum = metrics.TOOL_OVERLAP.labels().sum
+
+        timer.observe("ok")
+        timer.observe("cancelled")  # only the first outcome is recorded
+
+        assert tools.sum - tools_sum == 1.0
+        assert llm.sum - llm_sum == 0.25
+        assert metrics.TOOL_OVERLAP.labels().sum - overlap_sum == 0.5
+
+
+class TestDoneEvent:
+    """Tests for the timing object sent to the client."""
+
+    async def _payloads(self, events, fail=False):
+        async def astream_events(*args, **kwargs):
+            for event in events:
+                yield event
+            if fail:
+                raise RuntimeError("model overloaded")
+
+        graph = MagicMock()
+        graph.astream_events = astream_events
+        graph.aget_state = AsyncMock(return_value=None)
+        with (
+            patch.object(server, "_session_store", InMemorySessionStore()),
+            patch.object(rate_limit, "_limiter", InMemoryRateLimiter()),
+        ):
+            return [p async for p in server._graph_payloads(graph, {}, {}, "sess-1")]
+
+    async def test_done_carries_timing(self):
+        payloads = await self._payloads(
+            [
+                {"event": "on_chat_model_start", "run_id": "m1"},
+                {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content="Hi")}},
+                {"event": "on_chat_model_end", "run_id": "m1", "data": {}},
+                {"event": "on_tool_start", "name": "shipping_track", "run_id": "t1"},
+                {"event": "on_tool_end", "name": "shipping_track", "run_id": "t1", "data": {}},
+            ]
+        )
+
+        done = payloads[-1]
+        assert done["type"] == "done"
+        assert done["timing"]["ttft_ms"] is not None
+        assert len(done["timing"]["llm_ms"]) == 1
+        assert done["timing"]["tool_wall_ms"] <= done["timing"]["total_ms"]
+
+    async def test_done_after_error_carries_timing(self):
+        payloads = await self._payloads([], fail=True)
+
+        assert [p["type"] for p in payloads] == ["error", "done"]
+        assert payloads[-1]["timing"]["ttft_ms"] is None
@@ -0,0 +1,155 @@
+"""Tests for bounded per-backend tool execution."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+from langgraph.graph import END, StateGraph
+from langgraph.prebuilt import ToolNode
+
+from pear_genius.state.conversation import AgentState
+from pear_genius.tools import concurrency
+from pear_genius.tools.concurrency import ToolConcurrencyLimiter, create_tool_node
+from pear_genius.tools.mcp_client import get_service_prefix
+
+
+class _Tracker:
+    """Records peak concurrency per service."""
+
+    def __init__(self):
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.peak_total = 0
+
+    def make_tool(self, name: str, delay: float = 0.02) -> StructuredTool:
+        service = get_service_prefix(name)
+
+        async def _run(order_id: str = "") -> str:
+            self.active[service] = self.active.get(service, 0) + 1
+            self.peak[service] = max(self.peak.get(service, 0), self.active[service])
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+            await asyncio.sleep(delay)
+            self.active[service] -= 1
+            return f"{name} ok"
+
+        return StructuredTool.from_function(coroutine=_run, name=name, description=name)
+
+
+def _calls(names: list[str]) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": n, "args": {}, "id": f"tc{i}"} for i, n in enumerate(names)],
+    )
+
+
+async def _run(node: ToolNode, names: list[str]) -> list:
+    """Run the tools node inside a one-node graph and return the ToolMessages."""
+    graph = StateGraph(AgentState)
+    graph.add_node("tools", node)
+    graph.set_entry_point("tools")
+    graph.add_edge("tools", END)
+    result = await graph.compile().ainvoke(AgentState(session_id="test", messages=[_calls(names)]))
+    return result["messages"][1:]
+
+
+def test_get_service_prefix():
+    """Test extracting the backend service from a tool name."""
+    assert get_service_prefix("order-management_getOrder") == "order-management"
+    assert get_service_prefix("shipping_trackShipment") == "shipping"
+
+
+@pytest.mark.asyncio
+async def test_per_service_cap():
+    """Test that one backend never exceeds its cap while others proceed."""
+    tracker = _Tracker()
+    tools = [
+        tracker.make_tool("shipping_trackShipment"),
+        tracker.make_tool("order-management_getOrder"),
+    ]
+    limiter = ToolConcurrencyLimiter(
+        max_concurrency=10, service_limits={"shipping": 2}, default_service_limit=5
+    )
+    node = ToolNode(tools, awrap_tool_call=limiter.awrap_tool_call)
+
+    names = ["shipping_trackShipment"] * 6 + ["order-management_getOrder"] * 4
+    messages = await _run(node, names)
+
+    assert len(messages) == 10
+    assert tracker.peak["shipping"] == 2
+    assert tracker.peak["order-management"] == 4
+
+
+@pytest.mark.asyncio
+async def test_global_cap():
+    """Test that the global cap bounds calls across services."""
+    tracker = _Tracker()
+    tools = [
+        tracker.make_tool("shipping_trackShipment"),
+        tracker.make_tool("order-management_getOrder"),
+    ]
+    limiter = ToolConcurrencyLimiter(max_concurrency=3, service_limits={}, default_service_limit=10)
+    node = ToolNode(tools, awrap_tool_call=limiter.awrap_tool_call)
+
+    names = ["shipping_trackShipment", "order-management_getOrder"] * 4
+    await _run(node, names)
+
+    assert tracker.peak_total == 3
+
+
+@pytest.mark.asyncio
+async def test_serial_tools_run_one_at_a_time():
+    """Test that state-changing tools in one turn do not overlap."""
+    tracker = _Tracker()
+    tools = [tracker.make_tool("order-management_cancelOrder")]
+    limiter = ToolConcurrencyLimiter(
+        max_concurrency=10,
+        service_limits={},
+        default_service_limit=10,
+        serial_tools={"order-management_cancelOrder"},
+    )
+    node = ToolNode(tools, awrap_tool_call=limiter.awrap_tool_call)
+
+    await _run(node, ["order-management_cancelOrder"] * 3)
+
+    assert tracker.peak["order-management"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timing_attached_to_tool_message():
+    """Test that per-call timing is exposed on the ToolMessage."""
+    tracker = _Tracker()
+    limiter = ToolConcurrencyLimiter(max_concurrency=1, service_limits={}, default_service_limit=1)
+    node = ToolNode(
+        [tracker.make_tool("shipping_getShipment")], awrap_tool_call=limiter.awrap_tool_call
+    )
+
+    messages = await _run(node, ["shipping_getShipment"] * 2)
+
+    timings = [m.response_metadata["timing"] for m in messages]
+    assert all(t["service"] == "shipping" for t in timings)
+    assert all(t["duration_ms"] >= 15 for t in timings)
+    assert max(t["queued_ms"] for t in timings) >= 15
+
+
+@pytest.mark.asyncio
+async def test_nodes_share_one_limiter():
+    """Test that graphs built before and after a catalog swap share the caps."""
+    tracker = _Tracker()
+    limiter = ToolConcurrencyLimiter(max_concurrency=2, service_limits={}, default_service_limit=10)
+    old = create_tool_node([tracker.make_tool("shipping_trackShipment")], limiter=limiter)
+    new = create_tool_node([tracker.make_tool("shipping_trackShipment")], limiter=limiter)
+
+    names = ["shipping_trackShipment"] * 3
+    await asyncio.gather(_run(old, names), _run(new, names))
+
+    assert tracker.peak_total == 2
+
+
+def test_create_tool_node_uses_process_wide_limiter():
+    """Test that the default limiter is the process-wide one."""
+    with patch.object(concurrency, "_limiter", None):
+        assert concurrency.get_tool_limiter() is concurrency.get_tool_limiter()
+        node = create_tool_node([])
+        assert node._awrap_tool_call.func.__self__ is concurrency.get_tool_limiter()
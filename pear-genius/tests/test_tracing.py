@@ -0,0 +1,155 @@
+"""Tests for OpenTelemetry tracing and trace-context propagation to the gateway."""
+
+import inspect
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from langgraph.errors import GraphInterrupt
+
+from pear_genius import tracing
+from pear_genius.tools import mcp_client
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def _module_exporter():
+    # The global provider can only be set once per process
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider()
+        trace.set_tracer_provider(provider)
+    exporter = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return exporter
+
+
+@pytest.fixture
+def spans(_module_exporter):
+    _module_exporter.clear()
+    yield _module_exporter.get_finished_spans
+    _module_exporter.clear()
+
+
+class TestSpans:
+    """Tests for span helpers."""
+
+    def test_nested_spans_share_a_trace(self, spans):
+        with tracing.start_span("pear_genius.turn"):
+            with tracing.start_span("graph.node agent"):
+                pass
+
+        child, parent = spans()
+        assert child.parent.span_id == parent.context.span_id
+        assert child.context.trace_id == parent.context.trace_id
+
+    def test_errors_are_recorded(self, spans):
+        with pytest.raises(RuntimeError):
+            with tracing.start_span("graph.node tools"):
+                raise RuntimeError("gateway down")
+
+        (span,) = spans()
+        assert span.status.status_code == StatusCode.ERROR
+        assert span.events[0].name == "exception"
+
+    def test_graph_interrupt_is_not_an_error(self, spans):
+        with pytest.raises(GraphInterrupt):
+            with tracing.start_span("graph.node approval_gate"):
+                raise GraphInterrupt(())
+
+        (span,) = spans()
+        assert span.status.status_code == StatusCode.UNSET
+        assert span.attributes["pear_genius.interrupted"] is True
+
+
+class TestTracedNode:
+    """Tests for graph node wrapping."""
+
+    async def test_async_node_keeps_signature(self, spans):
+        async def node(state, config):
+            return {"seen": config["k"]}
+
+        traced = tracing.traced_node("agent", node)
+
+        assert list(inspect.signature(traced).parameters) == ["state", "config"]
+        assert await traced({}, {"k": 1}) == {"seen": 1}
+        assert [s.name for s in spans()] == ["graph.node agent"]
+
+    def test_sync_node(self, spans):
+        traced = tracing.traced_node("approval_gate", lambda state: {"ok": True})
+
+        assert not inspect.iscoroutinefunction(traced)
+        assert traced({}) == {"ok": True}
+        assert spans()[0].attributes["langgraph.node"] == "approval_gate"
+
+
+class TestPropagation:
+    """Tests for W3C trace context on MCP requests."""
+
+    async def test_header_from_current_span(self, spans):
+        request = httpx.Request("POST", "http://gateway/mcp", content=b"{}")
+        with tracing.start_span("execute_tool shipping_track") as span:
+            await tracing.inject_trace_headers(request)
+            trace_id = format(span.get_span_context().trace_id, "032x")
+
+        assert trace_id in request.headers["traceparent"]
+
+    async def test_header_from_pooled_call_meta(self):
+        """Test that a pooled session's request carries the caller's context."""
+        traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+        body = {"method": "tools/call", "params": {"_meta": {"traceparent": traceparent}}}
+        request = httpx.Request("POST", "http://gateway/mcp", content=json.dumps(body).encode())
+
+        await tracing.inject_trace_headers(request)
+
+        assert request.headers["traceparent"] == traceparent
+
+    async def test_no_span_no_header(self):
+        request = httpx.Request("POST", "http://gateway/mcp", content=b"{}")
+        await tracing.inject_trace_headers(request)
+        assert "traceparent" not in request.headers
+
+    async def test_pooled_call_sends_trace_meta(self, spans):
+        pool = MagicMock()
+        pool.call_tool = AsyncMock(return_value=MagicMock(content=[], structuredContent={"a": 1}))
+        with (
+            patch.object(mcp_client, "get_mcp_pool", AsyncMock(return_value=pool)),
+            tracing.start_span("execute_tool shipping_track"),
+        ):
+            await mcp_client._call_pooled("shipping_track", {"path": {}}, None, ())
+
+        meta = pool.call_tool.await_args.kwargs["meta"]
+        assert meta["traceparent"].startswith("00-")
+
+
+class TestSetup:
+    """Tests for exporter selection."""
+
+    def test_file_exporter_writes_json_lines(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        with (
+            patch.object(tracing.settings, "tracing_exporter", "file"),
+            patch.object(tracing.settings, "tracing_file_path", str(path)),
+            patch.object(tracing.trace, "set_tracer_provider"),
+            patch.object(tracing, "_provider", None),
+        ):
+            assert tracing.setup_tracing()
+            tracing._provider.get_tracer("test").start_span("graph.node tools").end()
+            tracing.shutdown_tracing()
+
+        (line,) = path.read_text().splitlines()
+        assert json.loads(line)["name"] == "graph.node tools"
+
+    def test_disabled_by_default(self):
+        with patch.object(tracing, "_provider", None):
+            assert tracing.setup_tracing() is False